@@ -112,7 +112,7 @@ def simEngine(APIdata, strat_select, grid):
             "track_length_miles": 2.074, "number_of_laps": 78},
         {"circuit_key": 23, "track_name": "Circuit Gilles Villeneuve",
             "track_length_miles": 2.710, "number_of_laps": 70},
-        {"circuit_key": 23, "track_name": "Circuit de Barcelona-Catalunya",
+        {"circuit_key": 24, "track_name": "Circuit de Barcelona-Catalunya",
             "track_length_miles": 2.892, "number_of_laps": 66},
         {"circuit_key": 19, "track_name": "Red Bull Ring",
             "track_length_miles": 2.683, "number_of_laps": 71},
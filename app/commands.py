@@ -0,0 +1,130 @@
+# app/commands.py
+# Flask CLI commands, e.g. `flask prefetch`.
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import click
+
+from .services import prefetch as prefetch_service
+from .services import sim_parallel
+from .services import jobs as jobs_service
+from .services import openf1_service
+
+
+def register_commands(app):
+    app.cli.add_command(prefetch_command)
+    app.cli.add_command(sim_sweep_command)
+    app.cli.add_command(jobs_worker_command)
+    app.cli.add_command(warm_races_command)
+    app.cli.add_command(ingest_races_command)
+    app.cli.add_command(rebuild_stats_command)
+
+
+@click.command('prefetch')
+@click.option('--lookback', 'lookback_days', type=int, default=None, help='Days of past sessions to warm.')
+@click.option('--lookahead', 'lookahead_days', type=int, default=None, help='Days of upcoming sessions to warm.')
+@click.option('--workers', 'max_workers', type=int, default=None, help='Sessions warmed concurrently.')
+@click.option('--interval', type=int, default=None,
+              help='Seconds between runs; with --once, how often cron runs it.')
+@click.option('--once', is_flag=True, help='Warm the cache once and exit.')
+def prefetch_command(lookback_days, lookahead_days, max_workers, interval, once):
+    """Pre-warm the OpenF1 cache for recent and upcoming sessions."""
+    from flask import current_app
+    config = current_app.config
+    lookback_days = config['PREFETCH_LOOKBACK_DAYS'] if lookback_days is None else lookback_days
+    lookahead_days = config['PREFETCH_LOOKAHEAD_DAYS'] if lookahead_days is None else lookahead_days
+    max_workers = config['PREFETCH_MAX_WORKERS'] if max_workers is None else max_workers
+    interval = config['PREFETCH_INTERVAL'] if interval is None else interval
+
+    if once:
+        # Run from cron every --interval seconds, so keep what may still change until the next run
+        result = prefetch_service.prefetch(lookback_days, lookahead_days, max_workers,
+                                           interval + prefetch_service.TTL_MARGIN)
+        click.echo(f"Prefetched {result['warmed']} of {result['sessions']} sessions "
+                   f"and {result['days']} race days")
+        return
+
+    scheduler = prefetch_service.PrefetchScheduler(interval, lookback_days, lookahead_days, max_workers)
+    scheduler.start()
+    try:
+        scheduler.join()
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+
+@click.command('sim-sweep')
+@click.option('--replicas', type=int, default=10000, help='Simulated races per strategy per circuit.')
+@click.option('--workers', type=int, default=None, help='Worker processes (defaults to SIM_WORKERS).')
+@click.option('--seed', type=int, default=None, help='Root seed for reproducible results.')
+def sim_sweep_command(replicas, workers, seed):
+    """Evaluate every strategy on every circuit and print the best one per circuit."""
+    from .services.sim import TRACKS, STRATEGIES, TIRE_TYPES
+    results = sim_parallel.sweep(TRACKS, STRATEGIES, TIRE_TYPES, replicas, seed=seed, workers=workers)
+    for track in TRACKS:
+        best = min(results[track['circuit_key']], key=lambda stats: stats['mean'])
+        click.echo(f"{track['track_name']:<40}{best['name']:<20}{best['mean']:.3f}s")
+
+
+@click.command('jobs-worker')
+@click.option('--workers', type=int, default=None,
+              help='Worker threads in this process (defaults to JOBS_MAX_WORKERS, or 4 if that is 0).')
+def jobs_worker_command(workers):
+    """Run background jobs from the shared queue (JOBS_BACKEND=sqlite)."""
+    queue = jobs_service.get_jobs()
+    if not isinstance(queue, jobs_service.SQLiteJobQueue):
+        raise click.ClickException('jobs-worker needs JOBS_BACKEND=sqlite')
+    if workers is None:
+        workers = queue.max_workers or jobs_service.DEFAULT_MAX_WORKERS
+    queue.start_workers(workers)
+    click.echo(f"Running jobs from {queue.path} with {workers} workers")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        queue.shutdown()
+
+
+@click.command('warm-races')
+@click.option('--year', 'years', type=int, multiple=True, help='Warm every race date of this season.')
+@click.option('--date', 'dates', multiple=True, help='Warm this YYYY-MM-DD date (repeatable).')
+@click.option('--workers', type=int, default=4, help='Dates searched concurrently.')
+def warm_races_command(years, dates, workers):
+    """Pre-compute racefinder results so every user's search is served from the shared cache."""
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    dates = set(dates)
+    for year in years:
+        try:
+            sessions = openf1_service.fetch_json(f'/sessions?year={year}&session_name=Race')
+        except Exception as e:
+            raise click.ClickException(f"Could not list the {year} races: {e}")
+        dates.update(session['date_start'][:10] for session in sessions
+                     if session.get('date_start') and session['date_start'][:10] <= today)
+    if not dates:
+        raise click.UsageError('Give at least one --year or --date')
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warm-races') as pool:
+        for date, races in zip(sorted(dates), pool.map(openf1_service.racefinder, sorted(dates))):
+            click.echo(f"{date}: {len(races)} race(s)")
+
+
+@click.command('ingest-races')
+@click.option('--year', 'years', type=int, multiple=True, required=True, help='Season to load (repeatable).')
+def ingest_races_command(years):
+    """Bulk-load race sessions into the races table so date lookups are answered locally."""
+    from .services.race_calendar import ingest_season
+    for year in years:
+        try:
+            counts = ingest_season(year)
+        except Exception as e:
+            raise click.ClickException(f"Could not load the {year} races: {e}")
+        click.echo(f"{year}: {counts['inserted']} inserted, {counts['updated']} updated")
+
+
+@click.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the per-user and per-race simulation totals from the saved results."""
+    from .services.sim_results import rebuild_stats
+    counts = rebuild_stats()
+    click.echo(f"Totals rebuilt for {counts['users']} user(s) and {counts['races']} race(s)")
@@ -38,6 +38,11 @@ class Role(db.Model):
 # SimulationResult model to store user guesses and simulation outcomes
 class SimulationResult(db.Model):
     __tablename__ = 'simulation_results'
+    __table_args__ = (
+        # A user's history in (timestamp, id) order for keyset paging, and a race's best guesses
+        db.Index('ix_simulation_results_user_id_timestamp_id', 'user_id', 'timestamp', 'id'),
+        db.Index('ix_simulation_results_race_id_strategy_accuracy', 'race_id', 'strategy_accuracy'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -46,10 +51,12 @@ class SimulationResult(db.Model):
     selected_time = db.Column(db.String(50), nullable=False)
     selected_driver = db.Column(db.String(50), nullable=False)
     strategy_accuracy = db.Column(db.Float, nullable=False)
+    strategy = db.Column(db.String(50))
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
-    user = db.relationship('User', backref=db.backref('simulations', lazy=True))
-    race = db.relationship('Race', backref=db.backref('simulations', lazy=True))
+    # Histories can be long: the backrefs are queries to filter and page, never loaded whole
+    user = db.relationship('User', backref=db.backref('simulations', lazy='dynamic'))
+    race = db.relationship('Race', backref=db.backref('simulations', lazy='dynamic'))
 
     def __repr__(self):
         return f"<SimulationResult User:{self.user.username} Race:{self.race.location} Driver:{self.selected_driver}>"
@@ -59,10 +66,53 @@ class Race(db.Model):
     __tablename__ = 'races'
 
     id = db.Column(db.Integer, primary_key=True)
-    circuit_key = db.Column(db.Integer, nullable=False)
+    session_key = db.Column(db.Integer, unique=True, nullable=False)
+    circuit_key = db.Column(db.Integer, nullable=False, index=True)
+    circuit_short_name = db.Column(db.String(100))
     location = db.Column(db.String(100), nullable=False)
-    race_date = db.Column(db.Date, nullable=False)
+    race_date = db.Column(db.Date, nullable=False, index=True)
+    date_start = db.Column(db.DateTime, nullable=False)  # UTC
+    date_end = db.Column(db.DateTime, nullable=False)  # UTC
 
 
     def __repr__(self):
-        return f"<Race {self.location} on {self.race_date}>"
\ No newline at end of file
+        return f"<Race {self.location} on {self.race_date}>"
+
+
+# Running totals per user, updated with every batch of saved simulation results
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    simulations = db.Column(db.Integer, nullable=False, default=0)
+    accuracy_sum = db.Column(db.Float, nullable=False, default=0.0)
+    best_accuracy = db.Column(db.Float, nullable=False, default=0.0)
+    last_simulation_at = db.Column(db.DateTime)
+
+    user = db.relationship('User', backref=db.backref('stats', uselist=False))
+
+    @property
+    def mean_accuracy(self):
+        return self.accuracy_sum / self.simulations if self.simulations else 0.0
+
+    def __repr__(self):
+        return f"<UserStats User:{self.user_id} Simulations:{self.simulations}>"
+
+
+# Running totals per race, updated with every batch of saved simulation results
+class RaceStats(db.Model):
+    __tablename__ = 'race_stats'
+
+    race_id = db.Column(db.Integer, db.ForeignKey('races.id'), primary_key=True)
+    simulations = db.Column(db.Integer, nullable=False, default=0)
+    accuracy_sum = db.Column(db.Float, nullable=False, default=0.0)
+    best_accuracy = db.Column(db.Float, nullable=False, default=0.0)
+
+    race = db.relationship('Race', backref=db.backref('stats', uselist=False))
+
+    @property
+    def mean_accuracy(self):
+        return self.accuracy_sum / self.simulations if self.simulations else 0.0
+
+    def __repr__(self):
+        return f"<RaceStats Race:{self.race_id} Simulations:{self.simulations}>"
@@ -1,23 +1,64 @@
 # routes.py
 #This file will contain the html routes using flask
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, session
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session, Response, abort, \
+    stream_with_context, jsonify, current_app
 from flask_login import login_user, logout_user, login_required, current_user
 from .models import User
 from .forms import RegistrationForm, LoginForm
 from . import db, bcrypt
 import re
 from .forms import RaceForm, GuessForm
-from .services.openf1_service import racefinder
-from .services.openf1_service import driver_dict
-from .services.sim import simEngine
+from .services.catalog import CATALOG
+from .services.sim import simulate_race_laps, validate_race_request, MAX_GRID_SIZE
+from .services.jobs import get_jobs, QUEUED, RUNNING, FAILED
+from .services.race_store import get_race_store
+from .services.sim_results import top_users, top_races, recent_results
+from .services.sim_history import history_page, iter_history_csv
+from .models import UserStats
+import json
 import random
 
 
+driver_dict = CATALOG.drivers
 
 
 main_bp = Blueprint('main_bp', __name__)
 
+
+def _stored_races():
+    """
+    Races from the user's last search, looked up through the handle kept in the session.
+    """
+    handle = session.get('race_search')
+    if not handle:
+        return []
+    races = get_race_store().load(handle)
+    if races is None:
+        # Evicted or expired: search again in the background, mostly from the OpenF1 response cache
+        session.pop('race_search', None)
+        _start_race_search(handle['date'])
+        return []
+    return races
+
+
+def _start_race_search(date):
+    job_id = get_jobs().submit('racefinder', {'date': date}, owner=current_user.id)
+    session['race_job'] = {'id': job_id, 'date': date}
+
+
+def _pending(job_id, label):
+    return {'label': label, 'result_url': url_for('main_bp.job_result', job_id=job_id)}
+
+
+def _driver_choices(races_found):
+    participating_drivers = races_found[0].get('participating_drivers', []) if races_found else []
+    if participating_drivers:
+        return [(num, driver_dict.get(num, "Unknown Driver")) for num in participating_drivers]
+    # If no races or no participating drivers, fall back to all known drivers
+    return [(num, name) for num, name in driver_dict.items()]
+
+
 @main_bp.route('/account', methods=['GET', 'POST'])
 @login_required
 def account():
@@ -26,79 +67,103 @@ def account():
     guess_form = GuessForm()
 
     # Define available strategies
-    strategies = [
-        'Aggressive', 'Defensive', 'Balanced',
-        'Medium Aggressive', 'Medium Balanced', 'Conservative'
-    ]
+    strategies = [strategy['name'] for strategy in CATALOG.strategies]
     # Populate strategy choices
     guess_form.strategy.choices = [(s.lower(), s) for s in strategies]
 
-    # Retrieve any previously found races from session
-    races_found = session.get('races_found', [])
     simulation_results = {}
     strategy_accuracy = None
     driver_selected = None
     timing_board = []
+    strategy_stats = []
+    optimal_strategy = None
+    simulation_seed = None
+    lap_stream_url = None
     real_race_results = []
     participating_drivers = []
+    pending_job = None
+
+    # Race searches and simulations run as background jobs; the page polls for them and
+    # picks up their results here once they are done
+    race_job = session.get('race_job')
+    if race_job and request.method == 'GET':
+        job = _own_job(race_job['id'])
+        if job is None or job['status'] == FAILED:
+            session.pop('race_job', None)
+            flash('The race search failed. Please try again.', 'danger')
+        elif job['status'] in (QUEUED, RUNNING):
+            pending_job = _pending(job['id'], 'Searching for races...')
+        else:
+            session.pop('race_job', None)
+            races = job['result']
+            if races:
+                session['race_search'] = get_race_store().put(race_job['date'], races)  # Store a handle in session
+                flash('Races found on the selected date.', 'success')
+                flash(f"Selected Race: {races[0]['circuit_details']['circuit_name']}", 'info')
+            else:
+                session.pop('race_search', None)
+                flash('No races found on the selected date or no participating drivers available.', 'warning')
 
-    # Determine driver choices before handling POST, so validation can pass
+    # Retrieve any previously found races; the session only holds a handle to them
+    races_found = _stored_races()
     if races_found:
         selected_race = races_found[0]
         participating_drivers = selected_race.get('participating_drivers', [])
-        # If no simulation is done yet, populate drivers from participating drivers
-        if participating_drivers:
-            guess_form.driver.choices = [(num, driver_dict.get(num, "Unknown Driver")) for num in participating_drivers]
+        real_race_results = selected_race.get('real_results', [])
+    # Determine driver choices before handling POST, so validation can pass
+    guess_form.driver.choices = _driver_choices(races_found)
+
+    sim_job = session.get('sim_job')
+    if sim_job and request.method == 'GET':
+        job = _own_job(sim_job['id'])
+        if job is None or job['status'] == FAILED:
+            session.pop('sim_job', None)
+            flash('The simulation failed. Please try again.', 'danger')
+        elif job['status'] in (QUEUED, RUNNING):
+            pending_job = _pending(job['id'], 'Simulating the race...')
         else:
-            # If no participating drivers, fallback to all known drivers
-            guess_form.driver.choices = [(num, name) for num, name in driver_dict.items()]
-    else:
-        # If no races found, default to all drivers
-        guess_form.driver.choices = [(num, name) for num, name in driver_dict.items()]
+            session.pop('sim_job', None)
+            simulation_results = job['result']
+            timing_board = simulation_results.get('timing_board', [])
+            strategy_accuracy = simulation_results.get('strategy_accuracy', 0)
+            strategy_stats = simulation_results.get('strategy_stats', [])
+            optimal_strategy = simulation_results.get('optimal_strategy')
+            simulation_seed = simulation_results.get('seed')
+            # Same inputs and seed, so the lap-by-lap replay ends with the board shown above
+            lap_stream_url = url_for('main_bp.simulation_stream',
+                                     circuit_key=sim_job['circuit_key'],
+                                     driver=sim_job['driver'],
+                                     strategy=sim_job['strategy'],
+                                     grid=','.join(str(num) for num in sim_job['grid']),
+                                     seed=simulation_seed)
+            driver_selected = driver_dict.get(sim_job['driver'], "Unknown Driver")
+            real_race_results = simulation_results.get('real_results', [])
+
+            flash(f'Simulation completed. Closeness: {strategy_accuracy:.2f}%', 'info')
+
+            # Optionally clear races_found from session after simulation
+            session.pop('race_search', None)
 
     if request.method == 'POST':
         submit_type = request.form.get('submit', '')
 
         if submit_type == 'Find Races' and race_form.validate_on_submit():
             # Handle RaceForm submission
-            date_input = race_form.race_date.data.strftime('%Y-%m-%d')
-            races_found = racefinder(date_input)
-            session['races_found'] = races_found  # Store in session
-
-            if races_found:
-                flash('Races found on the selected date.', 'success')
-                selected_race = races_found[0]
-                circuit_name = selected_race['circuit_details']['circuit_name']
-                participating_drivers = selected_race.get('participating_drivers', [])
-                real_race_results = selected_race.get('real_results', [])
-                flash(f"Selected Race: {circuit_name}", 'info')
-
-                # Update driver choices now that we have a selected race
-                if participating_drivers:
-                    guess_form.driver.choices = [(num, driver_dict.get(num, "Unknown Driver")) for num in participating_drivers]
-                else:
-                    guess_form.driver.choices = [(num, name) for num, name in driver_dict.items()]
-
-            else:
-                flash('No races found on the selected date or no participating drivers available.', 'warning')
-                session.pop('races_found', None)
-                guess_form.driver.choices = [(num, name) for num, name in driver_dict.items()]
+            _start_race_search(race_form.race_date.data.strftime('%Y-%m-%d'))
+            session.pop('sim_job', None)
+            return redirect(url_for('main_bp.account'))
 
         elif submit_type == 'Submit Guess' and guess_form.validate_on_submit():
             # Handle GuessForm submission
-            races_found = session.get('races_found', [])
             if not races_found:
                 flash('No race selected for simulation.', 'danger')
                 return redirect(url_for('main_bp.account'))
 
             selected_strategy_name = guess_form.strategy.data.capitalize()
             selected_driver_number = int(guess_form.driver.data)
-            selected_driver = driver_dict.get(selected_driver_number, "Unknown Driver")
 
             # Get participating drivers from race data
             selected_race = races_found[0]
-            participating_drivers = selected_race.get('participating_drivers', [])
-            real_race_results = selected_race.get('real_results', [])
             if not participating_drivers:
                 flash('No participating drivers found for the selected race.', 'danger')
                 return redirect(url_for('main_bp.account'))
@@ -107,23 +172,25 @@ def account():
                 flash('Selected driver is not participating in the selected race.', 'danger')
                 return redirect(url_for('main_bp.account'))
 
-            APIdata = {
+            grid = participating_drivers.copy()
+            params = {
+                'circuit_key': selected_race['circuit_details']['circuit_key'],
                 'driver_number': selected_driver_number,
-                'circuit_key': selected_race['circuit_details']['circuit_key']
+                'strategy': selected_strategy_name,
+                'grid': grid,
+                'real_results': real_race_results,
+                # The job saves the result for the stats pages once the simulation is done
+                'record': {
+                    'user_id': current_user.id,
+                    'race': {field: selected_race.get(field) for field in
+                             ('session_key', 'location', 'date_start', 'date_end', 'circuit_details')},
+                    'search_date': session['race_search']['date'],
+                },
             }
-
-            grid = participating_drivers.copy()
-            simulation_results = simEngine(APIdata, selected_strategy_name, grid, real_race_results)
-
-            timing_board = simulation_results.get('timing_board', [])
-            strategy_accuracy = simulation_results.get('strategy_accuracy', 0)
-            driver_selected = selected_driver
-            real_race_results = simulation_results.get('real_results', [])
-
-            flash(f'Simulation completed. Closeness: {strategy_accuracy:.2f}%', 'info')
-
-            # Optionally clear races_found from session after simulation
-            session.pop('races_found', None)
+            job_id = get_jobs().submit('simulate', params, owner=current_user.id)
+            session['sim_job'] = {'id': job_id, 'circuit_key': params['circuit_key'],
+                                  'driver': selected_driver_number, 'strategy': selected_strategy_name, 'grid': grid}
+            return redirect(url_for('main_bp.account'))
 
     return render_template('account.html',
                            races_found=races_found,
@@ -133,8 +200,114 @@ def account():
                            result=strategy_accuracy,
                            driver_selected=driver_selected,
                            timing_board=timing_board,
+                           strategy_stats=strategy_stats,
+                           optimal_strategy=optimal_strategy,
+                           simulation_seed=simulation_seed,
+                           lap_stream_url=lap_stream_url,
                            real_race_results=real_race_results,
-                           participating_drivers=participating_drivers)
+                           participating_drivers=participating_drivers,
+                           pending_job=pending_job)
+
+@main_bp.route('/simulation/stream')
+@login_required
+def simulation_stream():
+    """
+    Streams a lap-by-lap simulation as Server-Sent Events: one 'lap' event per lap with the
+    running order, gaps and pit stops, then a 'done' event.
+    """
+    try:
+        APIdata = {
+            'driver_number': request.args.get('driver', type=int),
+            'circuit_key': request.args.get('circuit_key', type=int)
+        }
+        grid_numbers = [num for num in request.args.get('grid', '').split(',') if num]
+        if len(grid_numbers) > MAX_GRID_SIZE:
+            raise ValueError(f"At most {MAX_GRID_SIZE} cars are allowed")
+        grid = [int(num) for num in grid_numbers]
+        laps = simulate_race_laps(APIdata, request.args.get('strategy', ''), grid,
+                                  seed=request.args.get('seed', type=int))
+        # Run the setup now, so bad parameters get a 400 instead of a broken stream
+        first = next(laps, None)
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    def events():
+        snapshot = first
+        while snapshot is not None:
+            yield f"event: lap\ndata: {json.dumps(snapshot)}\n\n"
+            snapshot = next(laps, None)
+        yield "event: done\ndata: {}\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def _job_accepted(job_id):
+    response = jsonify({'job_id': job_id, 'status': QUEUED,
+                        'status_url': url_for('main_bp.job_status', job_id=job_id),
+                        'result_url': url_for('main_bp.job_result', job_id=job_id)})
+    response.status_code = 202
+    response.headers['Location'] = url_for('main_bp.job_status', job_id=job_id)
+    return response
+
+def _own_job(job_id):
+    """The job record if it exists and was submitted by the current user, else None."""
+    job = get_jobs().get(job_id)
+    if job is None or job['owner'] != current_user.id:
+        return None
+    return job
+
+@main_bp.route('/jobs/racefinder', methods=['POST'])
+@login_required
+def submit_racefinder_job():
+    """Queues a race search for a 'YYYY-MM-DD' date and returns the job id right away."""
+    data = request.get_json(silent=True) or request.form
+    date = data.get('date', '')
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', date):
+        abort(400, description="'date' must be YYYY-MM-DD")
+    return _job_accepted(get_jobs().submit('racefinder', {'date': date}, owner=current_user.id))
+
+@main_bp.route('/jobs/simulate', methods=['POST'])
+@login_required
+def submit_simulation_job():
+    """Queues a simulation (circuit_key, driver_number, strategy, grid, optional seed/real_results)."""
+    data = request.get_json(silent=True) or {}
+    try:
+        params = {
+            'circuit_key': int(data['circuit_key']),
+            'driver_number': int(data['driver_number']),
+            'strategy': str(data['strategy']),
+            'grid': [int(num) for num in data['grid']],
+            'real_results': data.get('real_results') or [],
+            'seed': int(data['seed']) if data.get('seed') is not None else None,
+        }
+    except (KeyError, TypeError, ValueError):
+        abort(400, description='circuit_key, driver_number, strategy and grid are required')
+    try:
+        validate_race_request(params['grid'], params['seed'])
+    except ValueError as e:
+        abort(400, description=str(e))
+    return _job_accepted(get_jobs().submit('simulate', params, owner=current_user.id))
+
+@main_bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    job = _own_job(job_id)
+    if job is None:
+        abort(404, description='Unknown or expired job')
+    return jsonify({field: job[field] for field in ('id', 'kind', 'status', 'error', 'created_at', 'finished_at')})
+
+@main_bp.route('/jobs/<job_id>/result')
+@login_required
+def job_result(job_id):
+    """The job's result once finished; 202 while it is still queued or running."""
+    job = _own_job(job_id)
+    if job is None:
+        abort(404, description='Unknown or expired job')
+    if job['status'] in (QUEUED, RUNNING):
+        return jsonify({'id': job_id, 'status': job['status']}), 202
+    if job['status'] == FAILED:
+        return jsonify({'id': job_id, 'status': FAILED, 'error': job['error']}), 500
+    return jsonify({'id': job_id, 'status': job['status'], 'result': job['result']})
 
 @main_bp.route('/')
 def index():
@@ -199,7 +372,56 @@ def dashboard():
 @main_bp.route('/user_stats')
 @login_required
 def user_stats():
-    # Fetch user-specific statistics
-    stats = {}  # Placeholder for user stats data
-    return render_template('user_stats.html', stats=stats)
+    # Running totals are kept per user, so this is a primary key lookup however many simulations they ran
+    stats = UserStats.query.get(current_user.id)
+    return render_template('user_stats.html', stats=stats, recent=recent_results(current_user.id))
+
+
+def _history_page():
+    try:
+        return history_page(current_user.id,
+                            cursor=request.args.get('cursor'),
+                            limit=request.args.get('limit', current_app.config['HISTORY_PAGE_SIZE'], type=int))
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+@main_bp.route('/history')
+@login_required
+def history():
+    page = _history_page()
+    return render_template('history.html', results=page['results'], next_cursor=page['next_cursor'],
+                           first_page=not request.args.get('cursor'))
+
+
+@main_bp.route('/api/history')
+@login_required
+def history_json():
+    """
+    The user's simulation results, newest first. Pass a page's next_cursor as ?cursor= to get the page after it.
+    """
+    page = _history_page()
+    if page['next_cursor']:
+        page['next_url'] = url_for('main_bp.history_json', cursor=page['next_cursor'],
+                                   limit=request.args.get('limit', type=int))
+    return jsonify(page)
+
+
+@main_bp.route('/history.csv')
+@login_required
+def history_csv():
+    """Streams the user's whole simulation history as CSV, without holding it in memory."""
+    rows = iter_history_csv(current_user.id, current_app.config['HISTORY_EXPORT_BATCH_SIZE'])
+    return Response(stream_with_context(rows), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=simulation_history.csv'})
+
+
+@main_bp.route('/leaderboard')
+@login_required
+def leaderboard():
+    min_simulations = current_app.config['LEADERBOARD_MIN_SIMULATIONS']
+    return render_template('leaderboard.html',
+                           users=top_users(min_simulations=min_simulations),
+                           races=top_races(),
+                           min_simulations=min_simulations)
 
@@ -0,0 +1,106 @@
+# app/services/catalog.py
+# Circuits, tire compounds, strategies and drivers, loaded once from app/data/catalog.json.
+
+import json
+import os
+
+from .sim_types import TireCompound
+
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'catalog.json')
+
+
+class CatalogError(ValueError):
+    pass
+
+
+class Catalog:
+    """
+    Validated, read-mostly reference data indexed by key.
+
+    Attributes:
+        circuits (list): Circuit dicts in calendar order.
+        compounds (tuple): TireCompound records, indexed by compound code.
+        tire_types (dict): Compound name -> specification, in compound code order.
+        strategies (list): Preset strategy dicts.
+        drivers (dict): Driver number -> driver name.
+    """
+
+    def __init__(self, circuits, tire_compounds, strategies, drivers):
+        self.circuits = list(circuits)
+        self.compounds = tuple(
+            TireCompound(code, compound['name'], compound['base_lap_time'], compound['degradation_rate'],
+                         compound['wear_limit'])
+            for code, compound in enumerate(tire_compounds)
+        )
+        self.tire_types = {compound.name: compound.to_dict() for compound in self.compounds}
+        self.strategies = list(strategies)
+        self.drivers = {entry['driver_number']: entry['name'] for entry in drivers}
+
+        self._circuits_by_key = {circuit['circuit_key']: circuit for circuit in self.circuits}
+        self._strategies_by_name = {strategy['name'].lower(): strategy for strategy in self.strategies}
+        self._validate(tire_compounds, drivers)
+
+    def _validate(self, tire_compounds, drivers):
+        _require_unique('circuit_key', [circuit['circuit_key'] for circuit in self.circuits])
+        _require_unique('tire compound', [compound['name'] for compound in tire_compounds])
+        _require_unique('strategy name', [strategy['name'].lower() for strategy in self.strategies])
+        _require_unique('driver_number', [entry['driver_number'] for entry in drivers])
+
+        for circuit in self.circuits:
+            if circuit['number_of_laps'] <= 0:
+                raise CatalogError(f"Circuit {circuit['circuit_key']} has no laps")
+
+        for name, spec in self.tire_types.items():
+            if spec['base_lap_time'] <= 0 or spec['degradation_rate'] < 0 or spec['wear_limit'] <= 0:
+                raise CatalogError(f"Tire compound '{name}' has an invalid specification")
+
+        # A pit lap past the longest race could never be reached on any circuit. Shorter
+        # races skip the stops they don't reach (see sim_vectorized.strategy_stints).
+        longest_race = max((circuit['number_of_laps'] for circuit in self.circuits), default=0)
+        for strategy in self.strategies:
+            tires = [strategy['start_tire']] + list(strategy['next_tires'])
+            unknown = [tire for tire in tires if tire not in self.tire_types]
+            if unknown:
+                raise CatalogError(f"Strategy '{strategy['name']}' uses unknown compounds {unknown}")
+            pit_laps = strategy['pit_laps']
+            if len(strategy['next_tires']) != len(pit_laps):
+                raise CatalogError(f"Strategy '{strategy['name']}' needs one next tire per pit lap")
+            if any(lap <= 1 or lap > longest_race for lap in pit_laps):
+                raise CatalogError(f"Strategy '{strategy['name']}' pits outside laps 2-{longest_race}")
+            if any(later <= earlier for earlier, later in zip(pit_laps, pit_laps[1:])):
+                raise CatalogError(f"Strategy '{strategy['name']}' pit laps are not increasing")
+
+    def circuit(self, circuit_key):
+        """Returns the circuit with circuit_key, or None."""
+        return self._circuits_by_key.get(circuit_key)
+
+    def strategy(self, name):
+        """Returns the preset strategy called name (case-insensitive), or None."""
+        return self._strategies_by_name.get(name.lower())
+
+
+def _require_unique(label, values):
+    seen = set()
+    for value in values:
+        if value in seen:
+            raise CatalogError(f"Duplicate {label}: {value}")
+        seen.add(value)
+
+
+def load_catalog(path=CATALOG_PATH):
+    """
+    Reads and validates a catalog file.
+
+    Parameters:
+        path (str): Location of the catalog JSON file.
+
+    Returns:
+        Catalog: The loaded catalog.
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return Catalog(data['circuits'], data['tire_compounds'], data['strategies'], data['drivers'])
+
+
+CATALOG = load_catalog()
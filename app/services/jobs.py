@@ -0,0 +1,365 @@
+# app/services/jobs.py
+# Background jobs for slow work (race searches, simulations) with pollable status and results.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RESULT_TTL = 60 * 60  # seconds a finished job's result is kept
+DEFAULT_POLL_INTERVAL = 0.5  # seconds between broker polls when idle
+DEFAULT_LEASE_TIME = 60  # seconds a claimed job may go without a heartbeat before it is queued again
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+
+# Job kind -> function(**params); params and results must be JSON-serializable
+_tasks = {}
+
+
+def job_task(kind):
+    """
+    Registers a function as the handler for jobs of the given kind.
+    """
+    def register(fn):
+        _tasks[kind] = fn
+        return fn
+    return register
+
+
+def run_task(kind, params):
+    if kind not in _tasks:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    return _tasks[kind](**params)
+
+
+class InProcessJobQueue:
+    """
+    Runs jobs on a thread pool in this process and keeps their records in memory.
+    """
+
+    def __init__(self, app=None, max_workers=DEFAULT_MAX_WORKERS, result_ttl=DEFAULT_RESULT_TTL):
+        self.app = app
+        self.result_ttl = result_ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='jobs')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, params, owner=None):
+        """
+        Queues a job and returns its id right away. owner (e.g. a user id) is kept on the record.
+        """
+        if kind not in _tasks:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            self._jobs[job_id] = {'id': job_id, 'kind': kind, 'owner': owner, 'status': QUEUED, 'result': None,
+                                  'error': None, 'created_at': now, 'finished_at': None}
+        self._pool.submit(self._run, job_id, kind, params)
+        return job_id
+
+    def _run(self, job_id, kind, params):
+        self._update(job_id, status=RUNNING)
+        try:
+            result = _call_in_app(self.app, kind, params)
+        except Exception as e:
+            print(f"Error running {kind} job {job_id}: {e}")
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        else:
+            self._update(job_id, status=FINISHED, result=result, finished_at=time.time())
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        """
+        Returns a copy of the job record, or None if it is unknown or has expired.
+        """
+        with self._lock:
+            self._purge(time.time())
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _purge(self, now):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] + self.result_ttl <= now]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    owner INTEGER,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    claimed_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created_at ON jobs (status, created_at);
+"""
+
+
+class SQLiteJobQueue:
+    """
+    Stand-in for a message broker: jobs live in a SQLite file that every web and worker
+    process shares. Any process can submit and poll; any process with workers claims
+    queued jobs one at a time, so capacity grows with the number of worker processes.
+
+    A claim is a lease: while a job runs, its process renews claimed_at every third of
+    lease_time. If the process dies, the lease runs out and the job is queued again.
+    """
+
+    def __init__(self, path, app=None, max_workers=DEFAULT_MAX_WORKERS, result_ttl=DEFAULT_RESULT_TTL,
+                 poll_interval=DEFAULT_POLL_INTERVAL, lease_time=DEFAULT_LEASE_TIME):
+        self.path = os.path.abspath(path)
+        self.app = app
+        self.max_workers = max_workers
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.lease_time = lease_time
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._workers = []
+        self._heartbeat = None
+        self._running = set()
+        self._running_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            # Queue files created before jobs had owners or leases
+            columns = {column[1] for column in conn.execute('PRAGMA table_info(jobs)')}
+            if 'owner' not in columns:
+                conn.execute('ALTER TABLE jobs ADD COLUMN owner INTEGER')
+            if 'claimed_at' not in columns:
+                conn.execute('ALTER TABLE jobs ADD COLUMN claimed_at REAL')
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind, params, owner=None):
+        """
+        Queues a job and returns its id right away. owner (e.g. a user id) is kept on the record.
+        """
+        if kind not in _tasks:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        job_id = uuid.uuid4().hex
+        conn = self._connection()
+        conn.execute('DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at <= ?',
+                     (time.time() - self.result_ttl,))
+        conn.execute('INSERT INTO jobs (id, kind, owner, params, status, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                     (job_id, kind, owner, json.dumps(params), QUEUED, time.time()))
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        """
+        Returns the job record, or None if it is unknown or has expired.
+        """
+        row = self._connection().execute(
+            'SELECT id, kind, owner, status, result, error, created_at, finished_at FROM jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, owner, status, result, error, created_at, finished_at = row
+        if finished_at is not None and finished_at + self.result_ttl <= time.time():
+            return None
+        return {'id': job_id, 'kind': kind, 'owner': owner, 'status': status,
+                'result': json.loads(result) if result else None,
+                'error': error, 'created_at': created_at, 'finished_at': finished_at}
+
+    def requeue_stale(self):
+        """
+        Queues running jobs whose lease has run out again, e.g. because their process exited.
+
+        Returns:
+            int: Number of jobs queued again.
+        """
+        return self._connection().execute(
+            'UPDATE jobs SET status = ?, claimed_at = NULL '
+            'WHERE status = ? AND (claimed_at IS NULL OR claimed_at <= ?)',
+            (QUEUED, RUNNING, time.time() - self.lease_time)
+        ).rowcount
+
+    def _claim(self):
+        # Claims the oldest queued job; the status check makes the claim atomic across processes
+        conn = self._connection()
+        self.requeue_stale()
+        while True:
+            row = conn.execute('SELECT id, kind, params FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1',
+                               (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute('UPDATE jobs SET status = ?, claimed_at = ? WHERE id = ? AND status = ?',
+                                   (RUNNING, time.time(), row[0], QUEUED)).rowcount
+            if claimed:
+                return row[0], row[1], json.loads(row[2])
+
+    def _renew_leases(self):
+        while not self._stopped.wait(self.lease_time / 3):
+            with self._running_lock:
+                running = list(self._running)
+            if running:
+                self._connection().executemany('UPDATE jobs SET claimed_at = ? WHERE id = ? AND status = ?',
+                                               [(time.time(), job_id, RUNNING) for job_id in running])
+
+    def _finish(self, job_id, status, result=None, error=None):
+        self._connection().execute(
+            'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+            (status, json.dumps(result) if status == FINISHED else None, error, time.time(), job_id)
+        )
+
+    def run_pending(self):
+        """
+        Runs queued jobs in the calling thread until none are left.
+
+        Returns:
+            int: Number of jobs run.
+        """
+        count = 0
+        while not self._stopped.is_set():
+            claimed = self._claim()
+            if claimed is None:
+                break
+            job_id, kind, params = claimed
+            with self._running_lock:
+                self._running.add(job_id)
+            try:
+                result = _call_in_app(self.app, kind, params)
+            except Exception as e:
+                print(f"Error running {kind} job {job_id}: {e}")
+                self._finish(job_id, FAILED, error=str(e))
+            else:
+                self._finish(job_id, FINISHED, result=result)
+            finally:
+                with self._running_lock:
+                    self._running.discard(job_id)
+            count += 1
+        return count
+
+    def _work(self):
+        while not self._stopped.is_set():
+            if not self.run_pending():
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def start_workers(self, count=None):
+        """
+        Makes sure count worker threads (defaults to max_workers) run in this process,
+        starting only the ones missing, and starts the lease heartbeat with them.
+        """
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        for _ in range((self.max_workers if count is None else count) - len(self._workers)):
+            worker = threading.Thread(target=self._work, name='jobs-worker', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        if self._workers and self._heartbeat is None:
+            self._heartbeat = threading.Thread(target=self._renew_leases, name='jobs-heartbeat', daemon=True)
+            self._heartbeat.start()
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._wakeup.set()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+def _call_in_app(app, kind, params):
+    # Tasks may touch the database or current_app, so run them inside the app context
+    if app is None:
+        return run_task(kind, params)
+    with app.app_context():
+        return run_task(kind, params)
+
+
+_queue = None
+
+
+def configure_jobs(app):
+    """
+    Sets up the module-wide job queue from the app config.
+
+    JOBS_BACKEND 'inprocess' runs jobs on a thread pool in each web process; 'sqlite' shares
+    one queue file between processes. No SQLite workers are started here, since create_app
+    also runs for every short-lived `flask` command: web processes start JOBS_MAX_WORKERS
+    of them on their first request (0 for web processes that only submit), and
+    `flask jobs-worker` starts its own.
+
+    Returns:
+        InProcessJobQueue or SQLiteJobQueue: The active queue.
+
+    Raises:
+        RuntimeError: If the in-process backend is configured for more than one web process,
+            where a job submitted by one process could not be polled from another.
+    """
+    global _queue
+    if _queue is not None:
+        _queue.shutdown(wait=False)
+
+    config = app.config
+    if config['JOBS_BACKEND'] == 'sqlite':
+        _queue = SQLiteJobQueue(config['JOBS_DB_PATH'], app, config['JOBS_MAX_WORKERS'], config['JOBS_RESULT_TTL'],
+                                lease_time=config['JOBS_LEASE_TIME'])
+    elif config['WEB_PROCESSES'] > 1:
+        raise RuntimeError(f"JOBS_BACKEND=inprocess keeps jobs in one process, but WEB_PROCESSES is "
+                           f"{config['WEB_PROCESSES']}; use JOBS_BACKEND=sqlite")
+    else:
+        _queue = InProcessJobQueue(app, config['JOBS_MAX_WORKERS'] or DEFAULT_MAX_WORKERS, config['JOBS_RESULT_TTL'])
+    return _queue
+
+
+def get_jobs():
+    """
+    Returns the active job queue, creating an in-process one on first use.
+    """
+    global _queue
+    if _queue is None:
+        _queue = InProcessJobQueue()
+    return _queue
+
+
+@job_task('racefinder')
+def _racefinder_job(date):
+    from .openf1_service import racefinder
+    return racefinder(date)
+
+
+@job_task('simulate')
+def _simulate_job(circuit_key, driver_number, strategy, grid, real_results=None, seed=None, record=None):
+    from .sim import simEngine
+    APIdata = {'driver_number': driver_number, 'circuit_key': circuit_key}
+    results = simEngine(APIdata, strategy, grid, real_results or [], seed=seed)
+    if record:
+        # Account-page simulations are saved for the stats pages once they finish
+        from .catalog import CATALOG
+        from .sim_results import simulation_record, record_simulation
+        selected_time = next((car['total_time'] for car in results.get('timing_board', [])
+                              if car['car_id'] == driver_number), None)
+        record_simulation(simulation_record(record['user_id'], record['race'], driver_number,
+                                            CATALOG.drivers.get(driver_number, "Unknown Driver"), selected_time,
+                                            strategy, results.get('strategy_accuracy', 0), record['search_date']))
+    return results
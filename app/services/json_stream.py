@@ -0,0 +1,133 @@
+# app/services/json_stream.py
+# Incremental parsing of large JSON array responses.
+
+import codecs
+import itertools
+import json
+
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def iter_json_array(chunks):
+    """
+    Yields the elements of a top-level JSON array as they arrive, so only the
+    element being parsed is held in memory rather than the whole document.
+
+    A top-level object (e.g. {"results": [...]}) is not an array; its
+    'results' list, if any, is yielded after the whole object has been read.
+
+    Parameters:
+        chunks (iterable): Consecutive UTF-8 encoded pieces of the document.
+
+    Yields:
+        Decoded array elements, in order.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    started = False
+    finished = False
+    # Elements must alternate with single commas: '[1 2]' and '[1,,2]' are rejected
+    expect_value = True
+    first = True
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+        if not started:
+            stripped = buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                continue
+            if stripped[0] != '[':
+                yield from _iter_object_results(stripped, chunks, text_decoder)
+                return
+            pos = len(buffer) - len(stripped) + 1
+            started = True
+
+        while True:
+            pos = _skip(buffer, pos, _WHITESPACE)
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if expect_value:
+                if char == ']' and first:
+                    finished = True
+                    break
+                if char in ',]':
+                    raise ValueError(f"Expected an array element, found {char!r}")
+                parsed = _parse_element(buffer, pos)
+                if parsed is None:
+                    # The element is incomplete; wait for more data
+                    break
+                value, pos = parsed
+                yield value
+                expect_value = first = False
+            elif char == ',':
+                pos += 1
+                expect_value = True
+            elif char == ']':
+                finished = True
+                break
+            else:
+                raise ValueError(f"Expected ',' or ']' after an array element, found {char!r}")
+
+        if finished:
+            # Only whitespace may follow the array; reading it also leaves the source fully consumed
+            trailing = itertools.chain([buffer[pos + 1:]], (text_decoder.decode(chunk) for chunk in chunks),
+                                       [text_decoder.decode(b'', final=True)])
+            if any(part.strip(_WHITESPACE) for part in trailing):
+                raise ValueError("Extra data after the JSON array")
+            return
+
+    if started:
+        raise ValueError("Unterminated JSON array")
+    raise ValueError("Empty JSON document")
+
+
+def _parse_element(buffer, pos):
+    """
+    Decodes the element starting at pos, or returns None if the buffer ends before it does.
+
+    Strings, objects and arrays end with a closing character, so a successful decode is final.
+    Numbers and literals do not: '1.' in the buffer may be the start of '1.5', so they are only
+    decoded once a delimiter follows them.
+    """
+    if buffer[pos] in '"{[':
+        try:
+            return _decoder.raw_decode(buffer, pos)
+        except ValueError:
+            return None
+    end = pos
+    while end < len(buffer) and buffer[end] not in _DELIMITERS:
+        end += 1
+    if end == len(buffer):
+        return None
+    token = buffer[pos:end]
+    try:
+        value, token_end = _decoder.raw_decode(token)
+    except ValueError:
+        token_end = None
+    if token_end != len(token):
+        raise ValueError(f"Invalid JSON array element {token!r}")
+    return value, end
+
+
+def _skip(buffer, pos, characters):
+    while pos < len(buffer) and buffer[pos] in characters:
+        pos += 1
+    return pos
+
+
+def _iter_object_results(head, chunks, text_decoder):
+    parts = [head]
+    for chunk in chunks:
+        parts.append(text_decoder.decode(chunk))
+    parts.append(text_decoder.decode(b'', final=True))
+    data = json.loads(''.join(parts))
+    if isinstance(data, dict):
+        yield from data.get('results', [])
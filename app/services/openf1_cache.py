@@ -0,0 +1,262 @@
+# app/services/openf1_cache.py
+# Persistent on-disk cache for raw OpenF1 API responses, keyed by request URL.
+
+import os
+import re
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'openf1_cache.sqlite3')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_LIVE_TTL = 60
+
+# How long after a session (or a queried time window) ends before its data is considered final
+SETTLE_TIME = timedelta(hours=6)
+
+_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?')
+_SESSION_KEY_PATTERN = re.compile(r'[?&]session_key=(\w+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access);
+CREATE TABLE IF NOT EXISTS session_ends (
+    session_key INTEGER PRIMARY KEY,
+    date_end TEXT NOT NULL
+);
+"""
+
+
+def _parse_url_date(value):
+    """
+    Parses a date found in a query string into an aware UTC datetime.
+
+    A bare 'YYYY-MM-DD' is treated as the end of that day, so a query for a
+    whole day is not considered final until the day is over.
+    """
+    if 'T' not in value:
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with immutable entries for finished sessions,
+    a TTL for live or 'latest' queries, and LRU eviction once max_bytes is exceeded.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, live_ttl=DEFAULT_LIVE_TTL):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self._local = threading.local()
+        self._evict_lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, url):
+        """
+        Returns the cached response body for url, or None on a miss or expired entry.
+        """
+        return self._fresh(self._connection(), url, 'body')
+
+    def get_chunks(self, url, chunk_size):
+        """
+        Returns an iterator over the cached response body for url in chunk_size pieces,
+        or None on a miss or expired entry. The body is read from the database a piece
+        at a time, so it is never held in memory whole.
+        """
+        conn = self._connection()
+        rowid = self._fresh(conn, url, 'rowid')
+        if rowid is None:
+            return None
+        return self._read_blob(conn, rowid, chunk_size)
+
+    def _fresh(self, conn, url, column):
+        # column of url's entry, dropping the entry instead if it has expired
+        row = conn.execute(f'SELECT {column}, expires_at FROM responses WHERE url = ?', (url,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at is not None and expires_at <= now:
+            conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            return None
+        conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (now, url))
+        return value
+
+    @staticmethod
+    def _read_blob(conn, rowid, chunk_size):
+        with conn.blobopen('responses', 'body', rowid, readonly=True) as blob:
+            while True:
+                chunk = blob.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def set(self, url, body, ttl=None):
+        """
+        Stores a response body for url, choosing between an immutable entry and a TTL entry.
+        ttl replaces live_ttl for this entry if the response may still change.
+        """
+        conn = self._connection()
+        self._remember_session_ends(conn, url, body)
+        expires_at = self._expires_at(url, ttl)
+        now = time.time()
+        conn.execute(
+            'INSERT OR REPLACE INTO responses (url, body, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)',
+            (url, body, len(body), expires_at, now)
+        )
+        self._evict(conn)
+
+    def set_file(self, url, file, size, chunk_size=64 * 1024, ttl=None):
+        """
+        Stores a response body read from a binary file, like set but without loading it
+        into memory: the entry is created at its full size and the body copied in by chunks.
+        """
+        conn = self._connection()
+        if '/sessions' in url:
+            file.seek(0)
+            self._remember_session_ends(conn, url, file.read())
+        expires_at = self._expires_at(url, ttl)
+        now = time.time()
+        file.seek(0)
+        # One transaction, so readers never see a partly written body
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rowid = conn.execute(
+                'INSERT OR REPLACE INTO responses (url, body, size, expires_at, last_access) '
+                'VALUES (?, zeroblob(?), ?, ?, ?)',
+                (url, size, size, expires_at, now)
+            ).lastrowid
+            with conn.blobopen('responses', 'body', rowid) as blob:
+                for chunk in iter(lambda: file.read(chunk_size), b''):
+                    blob.write(chunk)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._evict(conn)
+
+    def _expires_at(self, url, ttl):
+        if self.is_immutable(url):
+            return None
+        return time.time() + (self.live_ttl if ttl is None else ttl)
+
+    def is_immutable(self, url):
+        """
+        Decides whether the response for url can never change.
+
+        'latest' queries are always live. Queries bounded by dates are final once
+        every date has settled, and session queries are final once the session's
+        recorded end time has settled.
+        """
+        if 'latest' in url:
+            return False
+
+        settled_before = datetime.now(timezone.utc) - SETTLE_TIME
+        dates = _DATE_PATTERN.findall(url)
+        if dates:
+            try:
+                return all(_parse_url_date(d) <= settled_before for d in dates)
+            except ValueError:
+                return False
+
+        match = _SESSION_KEY_PATTERN.search(url)
+        if match and match.group(1).isdigit():
+            row = self._connection().execute(
+                'SELECT date_end FROM session_ends WHERE session_key = ?', (int(match.group(1)),)
+            ).fetchone()
+            if row:
+                try:
+                    return _parse_url_date(row[0]) <= settled_before
+                except ValueError:
+                    return False
+        return False
+
+    def _remember_session_ends(self, conn, url, body):
+        # Sessions responses tell us when each session ended, which later
+        # lets session_key queries be cached permanently.
+        if '/sessions' not in url:
+            return
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return
+        rows = [
+            (entry['session_key'], entry['date_end'])
+            for entry in data if isinstance(entry, dict) and entry.get('session_key') and entry.get('date_end')
+        ] if isinstance(data, list) else []
+        if rows:
+            conn.executemany('INSERT OR REPLACE INTO session_ends (session_key, date_end) VALUES (?, ?)', rows)
+
+    def _evict(self, conn):
+        with self._evict_lock:
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            victims = []
+            for url, size in conn.execute('SELECT url, size FROM responses ORDER BY last_access'):
+                victims.append((url,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany('DELETE FROM responses WHERE url = ?', victims)
+
+    def clear(self):
+        conn = self._connection()
+        conn.execute('DELETE FROM responses')
+        conn.execute('DELETE FROM session_ends')
+
+
+_UNCONFIGURED = object()
+_cache = _UNCONFIGURED
+
+
+def configure_cache(path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, live_ttl=DEFAULT_LIVE_TTL, enabled=True):
+    """
+    Sets up the module-wide response cache used by openf1_service.
+
+    Parameters:
+        path (str): Location of the SQLite cache file.
+        max_bytes (int): Total response size kept before least recently used entries are evicted.
+        live_ttl (int): Seconds a live or 'latest' response stays valid.
+        enabled (bool): When False, every request goes straight to the API.
+
+    Returns:
+        ResponseCache or None: The active cache.
+    """
+    global _cache
+    _cache = ResponseCache(path, max_bytes, live_ttl) if enabled else None
+    return _cache
+
+
+def get_cache():
+    """
+    Returns the active response cache, creating the default on-disk cache on first use.
+    """
+    if _cache is _UNCONFIGURED:
+        configure_cache()
+    return _cache
@@ -0,0 +1,239 @@
+# app/services/openf1_client.py
+# Shared HTTP client for the OpenF1 API with pooled keep-alive connections.
+
+import gzip
+import os
+import queue
+import threading
+import zlib
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from urllib.parse import urlsplit
+
+
+DEFAULT_BASE_URL = 'https://api.openf1.org/v1'
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 10
+
+
+class OpenF1HTTPError(Exception):
+    """Raised when the API answers with a non-200 status."""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+
+
+class OpenF1Client:
+    """
+    Keeps a bounded pool of persistent connections to one API host.
+
+    Parameters:
+        base_url (str): Scheme, host and path prefix every request path is appended to.
+        timeout (float): Socket timeout in seconds, also the longest wait for a free connection.
+        pool_size (int): Maximum number of connections open at once in this process.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT, pool_size=DEFAULT_POOL_SIZE):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported base URL: {base_url}")
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._prefix = parts.path.rstrip('/')
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def url(self, path):
+        """Full URL for a request path such as '/sessions?year=2024'."""
+        return self.base_url + path
+
+    def get(self, path):
+        """
+        Sends a GET request and returns the decoded response body.
+
+        Parameters:
+            path (str): Request path and query string, relative to base_url.
+
+        Returns:
+            bytes: Response body with any gzip/deflate encoding removed.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free connection to {self._host} within {self.timeout}s")
+        try:
+            return self._request(path)
+        finally:
+            self._slots.release()
+
+    def _request(self, path):
+        conn, response = self._open(path)
+        body = response.read()
+        self._release(conn, response)
+
+        if response.status != 200:
+            raise OpenF1HTTPError(response.status, self.url(path))
+        return _decode_body(body, response.getheader('Content-Encoding', ''))
+
+    def stream(self, path, chunk_size=64 * 1024):
+        """
+        Sends a GET request and yields the decoded response body in chunks,
+        so large responses never have to be held in memory at once.
+
+        Parameters:
+            path (str): Request path and query string, relative to base_url.
+            chunk_size (int): Bytes read from the socket per chunk.
+
+        Yields:
+            bytes: Consecutive pieces of the decoded body.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"No free connection to {self._host} within {self.timeout}s")
+        try:
+            conn, response = self._open(path)
+            try:
+                if response.status != 200:
+                    response.read()
+                    raise OpenF1HTTPError(response.status, self.url(path))
+                decoder = _stream_decoder(response.getheader('Content-Encoding', ''))
+                while True:
+                    chunk = response.read(chunk_size)
+                    if not chunk:
+                        break
+                    if not decoder:
+                        yield chunk
+                        continue
+                    # Bound each decompressed piece, since compressed JSON expands many times over
+                    while chunk:
+                        yield decoder.decompress(chunk, chunk_size)
+                        chunk = decoder.unconsumed_tail
+                if decoder:
+                    tail = decoder.flush()
+                    if tail:
+                        yield tail
+            except BaseException:
+                # Unread data may be left on the socket, so the connection cannot be reused
+                conn.close()
+                raise
+            self._release(conn, response)
+        finally:
+            self._slots.release()
+
+    def _open(self, path):
+        conn = self._checkout()
+        reused = conn.sock is not None
+        try:
+            return conn, self._send(conn, path)
+        except (HTTPException, ConnectionError, OSError):
+            conn.close()
+            if not reused:
+                raise
+        # The server may have closed an idle keep-alive connection; retry once on a fresh one
+        conn = self._new_connection()
+        try:
+            return conn, self._send(conn, path)
+        except Exception:
+            conn.close()
+            raise
+
+    def _release(self, conn, response):
+        if response.will_close:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    def _send(self, conn, path):
+        conn.request('GET', self._prefix + path, headers={
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        return conn.getresponse()
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def _new_connection(self):
+        connection_class = HTTPSConnection if self._scheme == 'https' else HTTPConnection
+        return connection_class(self._host, self._port, timeout=self.timeout)
+
+    def close(self):
+        """Closes every idle connection in the pool."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def reset_after_fork(self):
+        # Sockets inherited from the parent process must not be shared with it
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+
+
+def _decode_body(body, encoding):
+    encoding = encoding.lower()
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        return zlib.decompress(body)
+    return body
+
+
+def _stream_decoder(encoding):
+    encoding = encoding.lower()
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return zlib.decompressobj()
+    return None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the process-wide client, creating one for the public API on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OpenF1Client()
+        return _client
+
+
+def set_client(client):
+    """
+    Replaces the process-wide client, e.g. to point the service at a local stand-in server.
+
+    Parameters:
+        client (OpenF1Client): The client every fetch should go through.
+
+    Returns:
+        OpenF1Client: The previous client, if any.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+    return previous
+
+
+def _reset_client_after_fork():
+    global _client_lock
+    _client_lock = threading.Lock()
+    if _client is not None:
+        _client.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
@@ -0,0 +1,177 @@
+# app/services/openf1_replay.py
+# Records real OpenF1 responses to fixture files and replays them from a local HTTP server.
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+from .openf1_client import OpenF1Client, DEFAULT_BASE_URL, DEFAULT_TIMEOUT, DEFAULT_POOL_SIZE
+
+
+def fixture_path(fixtures_dir, path):
+    """
+    Location of the fixture for a request path: one directory per endpoint,
+    one file per query string.
+
+    Parameters:
+        fixtures_dir (str): Root directory of the fixtures.
+        path (str): Request path relative to the API base, e.g. '/drivers?session_key=9158'.
+
+    Returns:
+        str: Path of the fixture file.
+    """
+    parts = urlsplit(path)
+    endpoint = parts.path.strip('/').replace('/', '_') or 'root'
+    query_hash = hashlib.sha1(parts.query.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(fixtures_dir, endpoint, f'{query_hash}.json')
+
+
+def save_fixture(fixtures_dir, path, body):
+    target = fixture_path(fixtures_dir, path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fixture = {'path': path, 'body': body.decode('utf-8')}
+    # Write to a temporary file first so a concurrent reader never sees half a fixture
+    temporary = f'{target}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(fixture, f)
+    os.replace(temporary, target)
+
+
+def load_fixture(fixtures_dir, path):
+    """
+    Returns the recorded body for a request path, or None if it was never recorded.
+    """
+    try:
+        with open(fixture_path(fixtures_dir, path), encoding='utf-8') as f:
+            return json.load(f)['body'].encode('utf-8')
+    except FileNotFoundError:
+        return None
+
+
+class RecordingClient(OpenF1Client):
+    """
+    OpenF1Client that saves every successful response as a fixture file.
+    """
+
+    def __init__(self, fixtures_dir, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT, pool_size=DEFAULT_POOL_SIZE):
+        super().__init__(base_url, timeout=timeout, pool_size=pool_size)
+        self.fixtures_dir = fixtures_dir
+
+    def get(self, path):
+        body = super().get(path)
+        save_fixture(self.fixtures_dir, path, body)
+        return body
+
+    def stream(self, path, chunk_size=64 * 1024):
+        # The whole body is needed for the fixture, so recording does not stream
+        body = self.get(path)
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        path = self.path
+        if path.startswith(server.prefix):
+            path = path[len(server.prefix):]
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = load_fixture(server.fixtures_dir, path)
+        if body is None:
+            self._send(404, json.dumps({'detail': f'No fixture recorded for {path}'}).encode('utf-8'))
+            return
+        self._send(200, body)
+
+    def _send(self, status, body):
+        gzip_ok = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzip_ok:
+            body = gzip.compress(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if gzip_ok:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the OpenF1 API that serves recorded fixtures.
+
+    Parameters:
+        fixtures_dir (str): Directory written by RecordingClient.
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        latency (float): Seconds added to every response.
+        jitter (float): Random extra delay of up to +/- this many seconds.
+        prefix (str): Path prefix stripped from requests, matching the API's '/v1'.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixtures_dir, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, prefix='/v1', verbose=False):
+        super().__init__((host, port), _ReplayHandler)
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.prefix = prefix
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{self.prefix}'
+
+
+def start_replay_server(fixtures_dir, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+    """
+    Starts a ReplayServer on a background thread.
+
+    Returns:
+        ReplayServer: The running server; use its base_url for OpenF1Client.
+    """
+    server = ReplayServer(fixtures_dir, host, port, latency, jitter)
+    thread = threading.Thread(target=server.serve_forever, name='openf1-replay', daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded OpenF1 responses locally.')
+    parser.add_argument('fixtures_dir', help='Directory of recorded fixtures')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds added to the latency')
+    args = parser.parse_args()
+
+    server = ReplayServer(args.fixtures_dir, args.host, args.port, args.latency, args.jitter, verbose=True)
+    print(f"Replaying {args.fixtures_dir} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
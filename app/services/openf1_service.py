@@ -1,39 +1,187 @@
 # app/services/openf1_service.py
 
-from urllib.request import urlopen
 import json
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+import time
 import random
+import tempfile
+from flask import has_app_context
+from .openf1_cache import get_cache
+from .race_cache import get_race_cache
+from .openf1_client import get_client
+from .telemetry_store import TelemetryStore, TIME_FIELDS
+from .json_stream import iter_json_array
+from .singleflight import SingleFlight
+from .catalog import CATALOG
 
 
-driver_dict = {
-    1: "Max Verstappen",
-    10: "Pierre Gasly",
-    11: "Sergio Pérez",
-    14: "Fernando Alonso",
-    16: "Charles Leclerc",
-    18: "Lance Stroll",
-    2: "Logan Sargeant",
-    20: "Kevin Magnussen",
-    22: "Yuki Tsunoda",
-    23: "Alexander Albon",
-    24: "Zhou Guanyu",
-    27: "Nico Hülkenberg",
-    3: "Daniel Ricciardo",
-    31: "Esteban Ocon",
-    37: "Isack Hadjar",
-    50: "Oliver Bearman",
-    4: "Lando Norris",
-    40: "Ayumu Iwasa",
-    44: "Lewis Hamilton",
-    43: "Franco Colapinto",
-    55: "Carlos Sainz",
-    61: "Jack Doohan",
-    63: "George Russell",
-    77: "Valtteri Bottas",
-    81: "Oscar Piastri",
-    97: "Robert Shwartzman"
-}
+driver_dict = CATALOG.drivers
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+# Identical concurrent requests share one upstream fetch
+_inflight = SingleFlight()
+_racefinder_inflight = SingleFlight()
+_cache_hits = 0
+_cache_hits_lock = threading.Lock()
+
+
+def fetch_json(path):
+    """
+    Fetches and decodes a JSON response from the OpenF1 API, serving it from the
+    on-disk response cache when possible. Concurrent callers asking for the same
+    URL wait on a single upstream fetch and share its decoded result, which must
+    therefore be treated as read-only.
+
+    Parameters:
+        path (str): Endpoint path and query string, e.g. '/sessions?year=2024'.
+            The full URL is used as the cache key.
+
+    Returns:
+        list or dict: Decoded JSON body.
+    """
+    client = get_client()
+    url = client.url(path)
+    cache = get_cache()
+    ttl = _override_ttl()
+    body = cache.get(url) if _read_cache(cache, url, ttl) else None
+    if body is not None:
+        global _cache_hits
+        with _cache_hits_lock:
+            _cache_hits += 1
+        return json.loads(body.decode('utf-8'))
+    return _inflight.do(url, lambda: _fetch_and_cache(client, cache, path, url, ttl))
+
+
+def _fetch_and_cache(client, cache, path, url, ttl=None):
+    body = client.get(path)
+    if cache is not None:
+        cache.set(url, body, ttl=ttl)
+    return json.loads(body.decode('utf-8'))
+
+
+_ttl_override = threading.local()
+
+
+@contextmanager
+def cache_ttl(seconds):
+    """
+    Within the block, responses this thread fetches that may still change are fetched
+    again rather than served from the cache, and then cached for seconds instead of the
+    live TTL. Final responses are still served from the cache.
+    """
+    previous = _override_ttl()
+    _ttl_override.seconds = seconds
+    try:
+        yield
+    finally:
+        _ttl_override.seconds = previous
+
+
+def _override_ttl():
+    return getattr(_ttl_override, 'seconds', None)
+
+
+def _read_cache(cache, url, ttl):
+    return cache is not None and (ttl is None or cache.is_immutable(url))
+
+
+def fetch_stats():
+    """
+    Returns counters for the fetch layer: response cache hits, and for cache misses
+    the total calls, upstream fetches made, calls that waited on an identical fetch
+    already in flight, and fetches in flight right now.
+    """
+    stats = _inflight.stats()
+    with _cache_hits_lock:
+        stats['cache_hits'] = _cache_hits
+    return stats
+
+
+def stream_json(path):
+    """
+    Yields the elements of a JSON array response one at a time.
+
+    A cached response is read back from the cache in chunks. Otherwise the body is parsed
+    as it arrives from the API while the raw bytes are spooled to a temporary file, which
+    is copied into the cache once the whole body has been read. Either way memory use
+    depends on the size of one element, not of the response.
+
+    Parameters:
+        path (str): Endpoint path and query string.
+
+    Yields:
+        Decoded array elements, in order.
+    """
+    client = get_client()
+    url = client.url(path)
+    cache = get_cache()
+    ttl = _override_ttl()
+    cached = cache.get_chunks(url, STREAM_CHUNK_SIZE) if _read_cache(cache, url, ttl) else None
+    if cached is not None:
+        yield from iter_json_array(cached)
+        return
+
+    source = client.stream(path, STREAM_CHUNK_SIZE)
+    if cache is None:
+        yield from iter_json_array(source)
+        return
+
+    with tempfile.TemporaryFile() as spool:
+        def chunks():
+            for chunk in source:
+                spool.write(chunk)
+                yield chunk
+
+        yield from iter_json_array(chunks())
+        # The parser reads through to the end of the body, but make sure the spooled copy is whole
+        for chunk in source:
+            spool.write(chunk)
+        cache.set_file(url, spool, spool.tell(), STREAM_CHUNK_SIZE, ttl=ttl)
+
+
+# Whole-session telemetry for getcardata, getintervaldata, getlapdata and getpositiondata
+def _is_settled(path):
+    # A snapshot is final once the response cache would keep the same request forever
+    cache = get_cache()
+    return cache is not None and cache.is_immutable(get_client().url(path))
+
+
+_telemetry = TelemetryStore(lambda path: fetch_json(path), is_final=_is_settled)
+
+
+# Thread pools for concurrent API calls, shared across requests
+ALLDATA_MAX_WORKERS = 16
+ALLDATA_CALL_TIMEOUT = 10  # seconds each API call may take before its data is skipped
+RACEFINDER_MAX_WORKERS = 6
+RACEFINDER_SESSION_TIMEOUT = 30  # seconds to enrich one session before it is dropped
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(name, max_workers):
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'openf1-{name}')
+        return _pools[name]
+
+
+def _result_or_default(future, deadline, name, default=None):
+    """
+    Waits for a submitted fetch until its deadline, returning default ({} if not given)
+    if it runs out of time.
+    """
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except FutureTimeoutError:
+        print(f"Timed out waiting for {name}")
+        return {} if default is None else default
 
 
 def findracestart(session_key):
@@ -47,21 +195,29 @@ def findracestart(session_key):
         str or None: Race start date-time in ISO format if found, else None.
     """
     try:
-        url = f'https://api.openf1.org/v1/intervals?gap_to_leader<0.5&gap_to_leader>0&session_key={session_key}'
-        response = urlopen(url)
-        data = json.loads(response.read().decode('utf-8'))
-        if isinstance(data, list) and data:
-            return data[0].get('date')
-        return None
+        return _findracestart(session_key)
     except Exception as e:
         print(f"Error in findracestart: {e}")
         return None
 
 
+def _findracestart(session_key):
+    # findracestart without the error handling, for callers that need to tell a failure from no data
+    path = f'/intervals?gap_to_leader<0.5&gap_to_leader>0&session_key={session_key}'
+    data = fetch_json(path)
+    if isinstance(data, list) and data:
+        return data[0].get('date')
+    return None
+
+
 def poll_positions(race_start, current_time):
     """
     Fetches the real race positions from the API.
 
+    The position feed covers the whole grid for hours, so it is parsed incrementally,
+    keeping only the latest entry per position; memory depends on grid size rather
+    than race length.
+
     Parameters:
         race_start (str): The race start date-time in ISO format.
         current_time (str): The current date-time in ISO format.
@@ -70,40 +226,39 @@ def poll_positions(race_start, current_time):
         list: Sorted list of real race results.
     """
     try:
-        # Define the time window for fetching positions
-        datewindowbegin = datetime.fromisoformat(race_start) - timedelta(hours=2)
-        formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
-        formatted_date = datetime.fromisoformat(current_time).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+        return _poll_positions(race_start, current_time)
+    except Exception as e:
+        print(f"Error in poll_positions: {e}")
+        return []
 
-        # Fetch positions within the time window
-        url = f'https://api.openf1.org/v1/position?date>={formattedwindow}&date<={formatted_date}'
-        response = urlopen(url)
-        data = json.loads(response.read().decode('utf-8'))
 
-        # Handle response structure
-        if isinstance(data, dict) and 'results' in data:
-            data = data['results']
+def _poll_positions(race_start, current_time):
+    # poll_positions without the error handling
+    # Define the time window for fetching positions
+    datewindowbegin = datetime.fromisoformat(race_start) - timedelta(hours=2)
+    formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
+    formatted_date = datetime.fromisoformat(current_time).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
-        positions = []
-        seen_positions = set()
+    # Fetch positions within the time window
+    path = f'/position?date>={formattedwindow}&date<={formatted_date}'
 
-        for entry in reversed(data):
-            position = entry.get("position")
-            driver_number = int(entry.get("driver_number", 0))
+    latest_by_position = {}
+    for entry in stream_json(path):
+        driver_number = int(entry.get("driver_number", 0))
+        if driver_number in driver_dict:
+            latest_by_position[entry.get("position")] = entry
+    latest_entries = latest_by_position.values()
 
-            if position not in seen_positions and driver_number in driver_dict:
-                driver_name = driver_dict[driver_number]
-                race_time = entry.get("time", "N/A")  # Adjust based on actual API response
-                positions.append({"position": position, "driver_name": driver_name, "time": race_time})
-                seen_positions.add(position)
+    positions = []
+    for entry in latest_entries:
+        driver_name = driver_dict[int(entry.get("driver_number", 0))]
+        race_time = entry.get("time", "N/A")  # Adjust based on actual API response
+        positions.append({"position": entry.get("position"), "driver_name": driver_name, "time": race_time})
 
-        # Sort positions based on the 'position' key
-        sorted_positions = sorted(positions, key=lambda x: x["position"])
+    # Sort positions based on the 'position' key
+    sorted_positions = sorted(positions, key=lambda x: x["position"])
 
-        return sorted_positions
-    except Exception as e:
-        print(f"Error in poll_positions: {e}")
-        return []
+    return sorted_positions
 
 
 def fetch_race_results(session_key):
@@ -117,14 +272,8 @@ def fetch_race_results(session_key):
         list: List of race result entries.
     """
     try:
-        url = f'https://api.openf1.org/v1/race-results?session_key={session_key}'
-        response = urlopen(url)
-
-        if response.getcode() != 200:
-            print(f"Failed to fetch race results: HTTP {response.getcode()}")
-            return []
-
-        data = json.loads(response.read().decode('utf-8'))
+        path = f'/race-results?session_key={session_key}'
+        data = fetch_json(path)
 
         # Handle response structure
         if isinstance(data, dict) and 'results' in data:
@@ -142,157 +291,237 @@ def fetch_participating_drivers(session_key):
     Fetches the list of participating drivers for a specific race session via the /drivers endpoint.
     """
     try:
-        url = f'https://api.openf1.org/v1/drivers?session_key={session_key}'
-        response = urlopen(url)
-        if response.getcode() != 200:
-            print(f"Failed to fetch drivers: HTTP {response.getcode()}")
-            return []
+        return _participating_drivers(session_key)
+    except Exception as e:
+        print(f"Error fetching participating drivers: {e}")
+        return []
 
-        data = json.loads(response.read().decode('utf-8'))
 
-        # Check the structure of `data`.
-        # If it's a list, iterate through it and extract driver_number.
-        participating_drivers = []
-        for driver_entry in data:
-            driver_number = driver_entry.get("driver_number")
-            # Check if driver_number exists in your driver_dict
-            if driver_number in driver_dict:
-                participating_drivers.append(driver_number)
+def _participating_drivers(session_key):
+    # fetch_participating_drivers without the error handling
+    path = f'/drivers?session_key={session_key}'
+    data = fetch_json(path)
 
-        return participating_drivers
+    # Check the structure of `data`.
+    # If it's a list, iterate through it and extract driver_number.
+    participating_drivers = []
+    for driver_entry in data:
+        driver_number = driver_entry.get("driver_number")
+        # Check if driver_number exists in your driver_dict
+        if driver_number in driver_dict:
+            participating_drivers.append(driver_number)
+
+    return participating_drivers
+
+def session_day_path(date):
+    """Sessions endpoint path racefinder uses for a 'YYYY-MM-DD' date."""
+    return f'/sessions?date_start={date}&date_end={date}'
 
-    except Exception as e:
-        print(f"Error fetching participating drivers: {e}")
-        return []
 
 def racefinder(date):
     """
     Fetches races occurring on the given date along with participating drivers and real-life results.
 
+    Assembled results are shared by every user through the race result cache, and concurrent
+    searches for the same date wait on a single assembly.
+
     Parameters:
         date (str): Date in 'YYYY-MM-DD' format.
 
     Returns:
         list: List of races with details including circuit information and participating drivers.
     """
-    try:
-        # Fetch sessions for the specific date
-        url = f'https://api.openf1.org/v1/sessions?date_start={date}&date_end={date}'
-        response = urlopen(url)
+    cache = get_race_cache()
+    races = cache.get(date) if cache is not None else None
+    if races is not None:
+        return races
+    return _racefinder_inflight.do(date, lambda: _find_and_cache_races(cache, date))
+
+
+def refresh_races(date, ttl=None):
+    """
+    Assembles racefinder's result for date afresh and stores it in the race result cache,
+    kept for ttl seconds instead of the cache's TTL while the day can still change.
+
+    Returns:
+        list: The races found.
+    """
+    cache = get_race_cache()
+    return _racefinder_inflight.do(date, lambda: _find_and_cache_races(cache, date, ttl))
 
-        # Check for successful response
-        if response.getcode() != 200:
-            print(f"Failed to fetch data: HTTP {response.getcode()}")
-            return []
 
-        data = json.loads(response.read().decode('utf-8'))
-        print("API Response Data:", json.dumps(data, indent=4))  # Debugging Statement
+def _find_and_cache_races(cache, date, ttl=None):
+    races, complete = _find_races(date)
+    if cache is not None:
+        # An empty day may just be an upstream failure, so only keep it for the short TTL
+        complete = complete and bool(races)
+        cache.set(date, races, complete=complete, ttl=ttl if complete else None)
+    return races
 
+
+def _find_races(date):
+    """
+    Assembles racefinder's result from the API.
+
+    Returns:
+        tuple: (list of races, False if the sessions lookup failed or a session failed or timed out)
+    """
+    try:
+        # Fetch sessions for the specific date
+        data = _sessions_on(date)
     except Exception as e:
         print(f"Error fetching race data: {e}")
-        return []
+        return [], False
+
+    # Enrich every session in parallel; results keep the order the API returned them in
+    pool = _get_pool('racefinder', RACEFINDER_MAX_WORKERS)
+    futures = [pool.submit(_enrich_session, session) for session in data]
+    deadline = time.monotonic() + RACEFINDER_SESSION_TIMEOUT
 
     results = []
+    complete = True
+    for future in futures:
+        race_details = _result_or_default(future, deadline, 'session details', default=False)
+        if race_details is False:
+            complete = False
+        elif race_details:
+            results.append(race_details)
 
-    for session in data:
-        try:
-            # Debugging: Print the entire session data to inspect its structure
-            print("Session Data:", json.dumps(session, indent=4))
-
-            # Parse start and end dates
-            date_start_str = session.get('date_start')
-            date_end_str = session.get('date_end')
-
-            if not date_start_str or not date_end_str:
-                print("Missing date information in session.")
-                continue
-
-            # Parse dates with timezone
-            try:
-                date_start = datetime.strptime(date_start_str, "%Y-%m-%dT%H:%M:%S%z")
-                date_end = datetime.strptime(date_end_str, "%Y-%m-%dT%H:%M:%S%z")
-            except ValueError as ve:
-                print(f"Error parsing dates: {ve}")
-                continue
-
-            # Extract circuit details
-            circuit_key = session.get('circuit_key')
-            circuit_name = session.get('circuit_short_name') or session.get('location') or 'Unknown Circuit'
-
-            # Fetch participating drivers using 'session_key'
-            session_key = session.get('session_key')
-            if not session_key:
-                print("Missing session key in session data.")
-                continue
-
-            participating_drivers = fetch_participating_drivers(session_key)
-
-            if not participating_drivers:
-                print("No participating drivers found for this race.")
-                continue
-
-            # Fetch real-life race results
-            race_start = findracestart(session_key)
-            if not race_start:
-                print("No race start time found.")
-                real_results = []
-            else:
-                real_results = poll_positions(race_start, race_start)  # Adjust parameters as needed
-
-            race_details = {
-                'circuit_details': {
-                    'circuit_key': circuit_key,
-                    'circuit_name': circuit_name
-                },
-                'participating_drivers': participating_drivers,
-                'real_results': real_results
-            }
+    return results, complete
 
-            results.append(race_details)
 
+def _sessions_on(date):
+    """
+    Sessions to enrich for a date: race sessions from the local race calendar when it has
+    any that day (see `flask ingest-races`), otherwise every session from the API.
+    """
+    if has_app_context():
+        try:
+            from .race_calendar import sessions_on
+            sessions = sessions_on(date)
+            if sessions:
+                return sessions
         except Exception as e:
-            print(f"Error processing session: {e}")
-            continue
+            print(f"Error reading the race calendar: {e}")
+            from .. import db
+            db.session.rollback()
+    return fetch_json(session_day_path(date))
 
-    return results
 
-def getcardata(driver_number, date):
+def _enrich_session(session):
+    """
+    Builds the race details for one session: circuit, participating drivers and real-life results.
+
+    Parameters:
+        session (dict): Session entry from the /sessions endpoint.
+
+    Returns:
+        dict or None: Race details, or None if the session should be skipped. False if
+        fetching its drivers or results failed, so the day's result is not cached as complete.
+    """
     try:
-        datewindowbegin = datetime.fromisoformat(date) - timedelta(seconds=1)
-        formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/car_data?driver_number={driver_number}&date>={formattedwindow}&date<={date}')
-        data = json.loads(response.read().decode('utf-8'))
-        return data[-1] if data else {}
+        # Parse start and end dates
+        date_start_str = session.get('date_start')
+        date_end_str = session.get('date_end')
+
+        if not date_start_str or not date_end_str:
+            print("Missing date information in session.")
+            return None
+
+        # Parse dates with timezone
+        try:
+            date_start = datetime.strptime(date_start_str, "%Y-%m-%dT%H:%M:%S%z")
+            date_end = datetime.strptime(date_end_str, "%Y-%m-%dT%H:%M:%S%z")
+        except ValueError as ve:
+            print(f"Error parsing dates: {ve}")
+            return None
+
+        # Extract circuit details
+        circuit_key = session.get('circuit_key')
+        circuit_name = session.get('circuit_short_name') or session.get('location') or 'Unknown Circuit'
+
+        # Fetch participating drivers using 'session_key'
+        session_key = session.get('session_key')
+        if not session_key:
+            print("Missing session key in session data.")
+            return None
+
+        participating_drivers = _participating_drivers(session_key)
+
+        if not participating_drivers:
+            print("No participating drivers found for this race.")
+            return None
+
+        # Fetch real-life race results
+        race_start = _findracestart(session_key)
+        if not race_start:
+            print("No race start time found.")
+            real_results = []
+        else:
+            real_results = _poll_positions(race_start, race_start)  # Adjust parameters as needed
+
+        race_details = {
+            'session_key': session_key,
+            'date_start': date_start_str,
+            'date_end': date_end_str,
+            'location': session.get('location'),
+            'circuit_details': {
+                'circuit_key': circuit_key,
+                'circuit_name': circuit_name
+            },
+            'participating_drivers': participating_drivers,
+            'real_results': real_results
+        }
+
+        return race_details
+
+    except Exception as e:
+        print(f"Error processing session: {e}")
+        return False
+
+def _latest_telemetry(endpoint, driver_number, date, session_key, window):
+    """
+    Returns the driver's latest record from endpoint at date, at most window old.
+
+    Lookups go through the session snapshot store, so a session's telemetry is
+    downloaded once and every later lookup is a local binary search. If the session
+    cannot be determined, falls back to a windowed query for just that moment.
+    """
+    if not session_key:
+        session_key = getsessiondata(date).get('session_key')
+    if session_key:
+        return _telemetry.latest(endpoint, session_key, driver_number, date, max_age=window.total_seconds())
+
+    time_field = TIME_FIELDS[endpoint]
+    datewindowbegin = datetime.fromisoformat(date) - window
+    formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
+    data = fetch_json(f'/{endpoint}?driver_number={driver_number}&{time_field}>={formattedwindow}&{time_field}<={date}')
+    return data[-1] if data else {}
+
+def getcardata(driver_number, date, session_key=None):
+    try:
+        return _latest_telemetry('car_data', driver_number, date, session_key, timedelta(seconds=1))
     except Exception as e:
         print(f"Error in getcardata: {e}")
         return {}
 
-def getintervaldata(driver_number, date):
+def getintervaldata(driver_number, date, session_key=None):
     try:
-        datewindowbegin = datetime.fromisoformat(date) - timedelta(minutes=5)
-        formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/intervals?driver_number={driver_number}&date>={formattedwindow}&date<={date}')
-        data = json.loads(response.read().decode('utf-8'))
-        return data[-1] if data else {}
+        return _latest_telemetry('intervals', driver_number, date, session_key, timedelta(minutes=5))
     except Exception as e:
         print(f"Error in getintervaldata: {e}")
         return {}
 
-def getlapdata(driver_number, date):
+def getlapdata(driver_number, date, session_key=None):
     try:
-        datewindowbegin = datetime.fromisoformat(date) - timedelta(hours=4)
-        formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/laps?driver_number={driver_number}&date_start>={formattedwindow}&date_start<={date}')
-        data = json.loads(response.read().decode('utf-8'))
-        return data[-1] if data else {}
+        return _latest_telemetry('laps', driver_number, date, session_key, timedelta(hours=4))
     except Exception as e:
         print(f"Error in getlapdata: {e}")
         return {}
 
 def getdriverdata(driver_number):
     try:
-        response = urlopen(f'https://api.openf1.org/v1/drivers?driver_number={driver_number}&session_key=latest')
-        data = json.loads(response.read().decode('utf-8'))
+        data = fetch_json(f'/drivers?driver_number={driver_number}&session_key=latest')
         return data[0] if data else {}
     except Exception as e:
         print(f"Error in getdriverdata: {e}")
@@ -300,8 +529,7 @@ def getdriverdata(driver_number):
 
 def getmeetingdata(meeting_key):
     try:
-        response = urlopen(f'https://api.openf1.org/v1/meetings?meeting_key={meeting_key}')
-        data = json.loads(response.read().decode('utf-8'))
+        data = fetch_json(f'/meetings?meeting_key={meeting_key}')
         return data[0] if data else {}
     except Exception as e:
         print(f"Error in getmeetingdata: {e}")
@@ -313,8 +541,7 @@ def getsessiondata(date):
         formattedwindowbegin = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
         datewindowend = datetime.fromisoformat(date) + timedelta(hours=3)
         formattedwindowend = datewindowend.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/sessions?date_start>={formattedwindowbegin}&date_start<={formattedwindowend}')
-        data = json.loads(response.read().decode('utf-8'))
+        data = fetch_json(f'/sessions?date_start>={formattedwindowbegin}&date_start<={formattedwindowend}')
         return data[0] if data else {}
     except Exception as e:
         print(f"Error in getsessiondata: {e}")
@@ -324,29 +551,25 @@ def getpitdata(driver_number, date):
     try:
         datewindowbegin = datetime.fromisoformat(date) - timedelta(hours=4)
         formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/laps?driver_number={driver_number}&date>={formattedwindow}&date<={date}')
-        data = json.loads(response.read().decode('utf-8'))
+        data = fetch_json(f'/laps?driver_number={driver_number}&date>={formattedwindow}&date<={date}')
         return data[-1] if data else {}
     except Exception as e:
         print(f"Error in getpitdata: {e}")
         return {}
 
-def getpositiondata(driver_number, date):
+def getpositiondata(driver_number, date, session_key=None):
     try:
-        datewindowbegin = datetime.fromisoformat(date) - timedelta(hours=4)
-        formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/position?driver_number={driver_number}&date>={formattedwindow}&date<={date}')
-        data = json.loads(response.read().decode('utf-8'))
-        return data[-1] if data else {}
+        return _latest_telemetry('position', driver_number, date, session_key, timedelta(hours=4))
     except Exception as e:
         print(f"Error in getpositiondata: {e}")
         return {}
 
 def getstintdata(driver_number, session_key):
     try:
-        response = urlopen(f'https://api.openf1.org/v1/stints?driver_number={driver_number}&session_key={session_key}')
-        data = json.loads(response.read().decode('utf-8'))
-        return data[-1] if data else {}
+        # One download covers every driver in the session (and is what prefetch warms)
+        data = fetch_json(f'/stints?session_key={session_key}')
+        stints = [stint for stint in data if stint.get('driver_number') == int(driver_number)]
+        return max(stints, key=lambda stint: stint.get('stint_number') or 0) if stints else {}
     except Exception as e:
         print(f"Error in getstintdata: {e}")
         return {}
@@ -355,17 +578,35 @@ def getweather(date):
     try:
         datewindowbegin = datetime.fromisoformat(date) - timedelta(minutes=3)
         formattedwindow = datewindowbegin.strftime('%Y-%m-%dT%H:%M:%S.%f')
-        response = urlopen(f'https://api.openf1.org/v1/weather?&date>={formattedwindow}&date<={date}')
-        data = json.loads(response.read().decode('utf-8'))
+        data = fetch_json(f'/weather?&date>={formattedwindow}&date<={date}')
         return data[-1] if data else {}
     except Exception as e:
         print(f"Error in getweather: {e}")
         return {}
 
-def getalldata(driver_number, date):
+def getalldata(driver_number, date, concurrent=True, timeout=ALLDATA_CALL_TIMEOUT):
     """
     Fetches comprehensive data for a driver at a specific date and time.
+
+    Parameters:
+        driver_number (int): Driver to fetch data for.
+        date (str): Date-time in ISO format.
+        concurrent (bool): Run independent API calls in parallel on a shared thread pool.
+            Only the meeting lookup waits on car data, so wall-clock time follows the
+            slowest chain of dependent calls instead of the sum of all of them.
+        timeout (float): Seconds each call may take in concurrent mode before it is skipped.
+
+    Returns:
+        dict: Merged data from every endpoint.
     """
+    if not concurrent:
+        return _getalldata_sequential(driver_number, date)
+
+    pool = _get_pool('alldata', ALLDATA_MAX_WORKERS)
+    # Driver data depends on nothing, so it can start before the session lookups
+    driver_future = pool.submit(getdriverdata, driver_number)
+    driver_deadline = time.monotonic() + timeout
+
     results = {}
     sessiondata = getsessiondata(date)
     if not sessiondata:
@@ -377,12 +618,53 @@ def getalldata(driver_number, date):
         print("No session key found.")
         return results
 
+    stint_future = pool.submit(getstintdata, driver_number, session_key)
+    stint_deadline = time.monotonic() + timeout
+
     race_start = findracestart(session_key)
     if not race_start:
         print("No race start data found.")
         return results
 
-    # Adjust date based on race start
+    date = _align_to_race_start(date, race_start, sessiondata)
+    results['datetime'] = date
+
+    deadline = time.monotonic() + timeout
+    futures = {
+        'car': pool.submit(getcardata, driver_number, date, session_key),
+        'interval': pool.submit(getintervaldata, driver_number, date, session_key),
+        'lap': pool.submit(getlapdata, driver_number, date, session_key),
+        'pit': pool.submit(getpitdata, driver_number, date),
+        'position': pool.submit(getpositiondata, driver_number, date, session_key),
+        'weather': pool.submit(getweather, date),
+    }
+
+    cardata = _result_or_default(futures['car'], deadline, 'car data')
+    meetingdata = _result_or_default(pool.submit(getmeetingdata, cardata.get('meeting_key', '')),
+                                   time.monotonic() + timeout, 'meeting data')
+
+    alldata = [cardata,
+               _result_or_default(driver_future, driver_deadline, 'driver data'),
+               _result_or_default(futures['interval'], deadline, 'interval data'),
+               _result_or_default(futures['lap'], deadline, 'lap data'),
+               meetingdata,
+               _result_or_default(futures['pit'], deadline, 'pit data'),
+               _result_or_default(futures['position'], deadline, 'position data'),
+               sessiondata,
+               _result_or_default(stint_future, stint_deadline, 'stint data'),
+               _result_or_default(futures['weather'], deadline, 'weather data')]
+
+    for data_item in alldata:
+        if isinstance(data_item, dict):
+            results.update(data_item)
+
+    return results
+
+
+def _align_to_race_start(date, race_start, sessiondata):
+    """
+    Shifts date by the difference between the actual and the scheduled race start.
+    """
     try:
         actual_start = datetime.fromisoformat(race_start)
     except ValueError:
@@ -403,16 +685,37 @@ def getalldata(driver_number, date):
         datereal = datereal + time_diff
         date = datereal.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]
 
+    return date
+
+
+def _getalldata_sequential(driver_number, date):
+    results = {}
+    sessiondata = getsessiondata(date)
+    if not sessiondata:
+        print("No session data found.")
+        return results
+
+    session_key = str(sessiondata.get('session_key', ''))
+    if not session_key:
+        print("No session key found.")
+        return results
+
+    race_start = findracestart(session_key)
+    if not race_start:
+        print("No race start data found.")
+        return results
+
+    date = _align_to_race_start(date, race_start, sessiondata)
     results['datetime'] = date
 
     # Fetch all relevant data
-    cardata = getcardata(driver_number, date)
+    cardata = getcardata(driver_number, date, session_key)
     meetingdata = getmeetingdata(cardata.get('meeting_key', ''))
     driverdata = getdriverdata(driver_number)
-    intervaldata = getintervaldata(driver_number, date)
-    lapdata = getlapdata(driver_number, date)
+    intervaldata = getintervaldata(driver_number, date, session_key)
+    lapdata = getlapdata(driver_number, date, session_key)
     pitdata = getpitdata(driver_number, date)
-    positiondata = getpositiondata(driver_number, date)
+    positiondata = getpositiondata(driver_number, date, session_key)
     stintdata = getstintdata(driver_number, session_key)
     weather = getweather(date)
 
@@ -424,6 +727,3 @@ def getalldata(driver_number, date):
             results.update(data_item)
 
     return results
-
-
-
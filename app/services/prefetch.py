@@ -0,0 +1,138 @@
+# app/services/prefetch.py
+# Pre-warms the OpenF1 response cache for recent and upcoming sessions.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from .openf1_service import (cache_ttl, fetch_json, fetch_participating_drivers, findracestart, poll_positions,
+                             refresh_races, session_day_path)
+from .race_cache import get_race_cache
+
+
+DEFAULT_LOOKBACK_DAYS = 7
+DEFAULT_LOOKAHEAD_DAYS = 7
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_INTERVAL = 15 * 60  # seconds between scheduler runs
+# Warmed entries that can still change outlive the interval by this much, so they are
+# still cached when the next run refreshes them
+TTL_MARGIN = 5 * 60
+
+
+def discover_sessions(lookback_days=DEFAULT_LOOKBACK_DAYS, lookahead_days=DEFAULT_LOOKAHEAD_DAYS, now=None):
+    """
+    Lists sessions starting within the window around now via the sessions endpoint.
+
+    Parameters:
+        lookback_days (int): Days before now to include.
+        lookahead_days (int): Days after now to include.
+        now (datetime): Reference time, defaults to the current UTC time.
+
+    Returns:
+        list: Session entries from the API.
+    """
+    now = now or datetime.now(timezone.utc)
+    begin = (now - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+    end = (now + timedelta(days=lookahead_days)).strftime('%Y-%m-%d')
+    data = fetch_json(f'/sessions?date_start>={begin}&date_start<={end}')
+    return data if isinstance(data, list) else []
+
+
+def prefetch_session(session, ttl=DEFAULT_INTERVAL + TTL_MARGIN):
+    """
+    Loads everything racefinder and the simulation need for one session into the cache:
+    the day's session list, drivers, race start, positions and stints.
+
+    Upcoming and just-finished sessions are not final yet, so their responses are fetched
+    again even if cached and kept for ttl seconds rather than the short live TTL.
+
+    Returns:
+        bool: True if the session was warmed without errors.
+    """
+    session_key = session.get('session_key')
+    if not session_key:
+        return False
+    try:
+        with cache_ttl(ttl):
+            date_start = session.get('date_start', '')
+            if date_start:
+                fetch_json(session_day_path(date_start[:10]))
+            fetch_participating_drivers(session_key)
+            race_start = findracestart(session_key)
+            if race_start:
+                poll_positions(race_start, race_start)
+            fetch_json(f'/stints?session_key={session_key}')
+        return True
+    except Exception as e:
+        print(f"Error prefetching session {session_key}: {e}")
+        return False
+
+
+def prefetch_races(date, ttl=DEFAULT_INTERVAL + TTL_MARGIN):
+    """
+    Assembles the racefinder result for a day into the shared race result cache, so the
+    first search for it does not have to. Its sessions should be warmed first.
+
+    Returns:
+        bool: True if the day was warmed without errors.
+    """
+    try:
+        refresh_races(date, ttl)
+        return True
+    except Exception as e:
+        print(f"Error prefetching races on {date}: {e}")
+        return False
+
+
+def prefetch(lookback_days=DEFAULT_LOOKBACK_DAYS, lookahead_days=DEFAULT_LOOKAHEAD_DAYS,
+             max_workers=DEFAULT_MAX_WORKERS, ttl=DEFAULT_INTERVAL + TTL_MARGIN):
+    """
+    Discovers sessions in the window and warms them, at most max_workers at a time, then
+    the race searches for their days.
+
+    Parameters:
+        ttl (int): Seconds warmed entries that can still change stay cached; at least the
+            time until the next run.
+
+    Returns:
+        dict: Counts of sessions found, sessions warmed and days whose races were warmed.
+    """
+    try:
+        sessions = discover_sessions(lookback_days, lookahead_days)
+    except Exception as e:
+        print(f"Error discovering sessions to prefetch: {e}")
+        return {'sessions': 0, 'warmed': 0, 'days': 0}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='openf1-prefetch') as pool:
+        warmed = sum(pool.map(lambda session: prefetch_session(session, ttl), sessions))
+        days = 0
+        if get_race_cache() is not None:
+            dates = sorted({session['date_start'][:10] for session in sessions if session.get('date_start')})
+            days = sum(pool.map(lambda date: prefetch_races(date, ttl), dates))
+    return {'sessions': len(sessions), 'warmed': warmed, 'days': days}
+
+
+class PrefetchScheduler(threading.Thread):
+    """
+    Background thread that runs prefetch every interval seconds until stopped. Warmed
+    entries are kept for the interval plus TTL_MARGIN, until the next run refreshes them.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, lookback_days=DEFAULT_LOOKBACK_DAYS,
+                 lookahead_days=DEFAULT_LOOKAHEAD_DAYS, max_workers=DEFAULT_MAX_WORKERS):
+        super().__init__(name='openf1-prefetch-scheduler', daemon=True)
+        self.interval = interval
+        self.lookback_days = lookback_days
+        self.lookahead_days = lookahead_days
+        self.max_workers = max_workers
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            result = prefetch(self.lookback_days, self.lookahead_days, self.max_workers,
+                              self.interval + TTL_MARGIN)
+            print(f"Prefetched {result['warmed']} of {result['sessions']} sessions and {result['days']} race days")
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
@@ -0,0 +1,116 @@
+# app/services/race_cache.py
+# Shared cache of fully assembled racefinder results, keyed by date.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from .openf1_cache import SETTLE_TIME
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'instance', 'racefinder_cache.sqlite3')
+DEFAULT_TTL = 5 * 60  # seconds, for today, future dates and incomplete results
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS race_results (
+    date TEXT PRIMARY KEY,
+    races TEXT NOT NULL,
+    expires_at REAL,
+    computed_at REAL NOT NULL
+);
+"""
+
+
+class RaceResultCache:
+    """
+    SQLite-backed racefinder results shared by every user and process. Settled past days
+    never expire; today, future dates and results assembled after upstream errors use a TTL.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL):
+        self.path = os.path.abspath(path)
+        self.ttl = ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, date):
+        """
+        Returns the cached races for date ('YYYY-MM-DD'), or None on a miss or expired entry.
+        """
+        row = self._connection().execute('SELECT races, expires_at FROM race_results WHERE date = ?',
+                                         (date,)).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return json.loads(row[0])
+
+    def set(self, date, races, complete=True, ttl=None):
+        """
+        Stores the races found for date.
+
+        Parameters:
+            date (str): Date in 'YYYY-MM-DD' format.
+            races (list): racefinder result.
+            complete (bool): False if any part of the result could not be fetched; such
+                results are only kept for the TTL so the next search can fill the gaps.
+            ttl (int): Seconds to keep the result if it can still change, instead of the cache's TTL.
+        """
+        now = time.time()
+        expires_at = None if complete and self.is_final(date) else now + (self.ttl if ttl is None else ttl)
+        self._connection().execute(
+            'INSERT OR REPLACE INTO race_results (date, races, expires_at, computed_at) VALUES (?, ?, ?, ?)',
+            (date, json.dumps(races), expires_at, now)
+        )
+
+    @staticmethod
+    def is_final(date):
+        """True once the whole day, plus time for its data to settle, is over in UTC."""
+        try:
+            day_end = datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+        except ValueError:
+            return False
+        return day_end + SETTLE_TIME <= datetime.now(timezone.utc)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM race_results')
+
+
+_UNCONFIGURED = object()
+_cache = _UNCONFIGURED
+
+
+def configure_race_cache(path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, enabled=True):
+    """
+    Sets up the module-wide racefinder result cache.
+
+    Parameters:
+        path (str): Location of the SQLite cache file.
+        ttl (int): Seconds results for today, future dates or incomplete searches stay valid.
+        enabled (bool): When False, every search is assembled from scratch.
+
+    Returns:
+        RaceResultCache or None: The active cache.
+    """
+    global _cache
+    _cache = RaceResultCache(path, ttl) if enabled else None
+    return _cache
+
+
+def get_race_cache():
+    """
+    Returns the active racefinder result cache, creating the default on-disk cache on first use.
+    """
+    if _cache is _UNCONFIGURED:
+        configure_race_cache()
+    return _cache
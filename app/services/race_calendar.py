@@ -0,0 +1,87 @@
+# app/services/race_calendar.py
+# Local race calendar: race sessions bulk-loaded from OpenF1 into the races table.
+
+from datetime import datetime, timezone
+
+from .. import db
+from ..models import Race
+from .openf1_service import fetch_json
+
+
+def _parse_session_time(value):
+    # Stored as naive UTC, to the second, so it formats back the way the API sends it
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.replace(microsecond=0)
+
+
+def _race_row(session):
+    date_start = _parse_session_time(session['date_start'])
+    return {
+        'session_key': session['session_key'],
+        'circuit_key': session['circuit_key'],
+        'circuit_short_name': session.get('circuit_short_name'),
+        'location': session.get('location') or session.get('circuit_short_name') or 'Unknown',
+        'race_date': date_start.date(),
+        'date_start': date_start,
+        'date_end': _parse_session_time(session['date_end']),
+    }
+
+
+def ingest_season(year):
+    """
+    Loads every race session of a season into the races table, updating rows that already exist.
+
+    Parameters:
+        year (int): Season to load.
+
+    Returns:
+        dict: Counts of races 'inserted' and 'updated'.
+    """
+    sessions = fetch_json(f'/sessions?year={year}&session_name=Race')
+    rows = [
+        _race_row(session) for session in sessions
+        if session.get('session_key') and session.get('circuit_key') and session.get('date_start')
+        and session.get('date_end')
+    ]
+    existing = {
+        race.session_key: race
+        for race in Race.query.filter(Race.session_key.in_([row['session_key'] for row in rows])).all()
+    } if rows else {}
+
+    new_rows = [row for row in rows if row['session_key'] not in existing]
+    for row in rows:
+        race = existing.get(row['session_key'])
+        if race is not None:
+            for field, value in row.items():
+                setattr(race, field, value)
+    if new_rows:
+        db.session.execute(db.insert(Race), new_rows)
+    db.session.commit()
+    return {'inserted': len(new_rows), 'updated': len(rows) - len(new_rows)}
+
+
+def sessions_on(date):
+    """
+    Race sessions on a date from the local calendar, shaped like /sessions entries.
+
+    Parameters:
+        date (str): Date in 'YYYY-MM-DD' format.
+
+    Returns:
+        list: Session dicts with session_key, circuit_key, circuit_short_name, location,
+            date_start and date_end; empty if the calendar has no race that day.
+    """
+    race_date = datetime.strptime(date, '%Y-%m-%d').date()
+    return [
+        {
+            'session_key': race.session_key,
+            'circuit_key': race.circuit_key,
+            'circuit_short_name': race.circuit_short_name,
+            'location': race.location,
+            'date_start': race.date_start.isoformat() + '+00:00',
+            'date_end': race.date_end.isoformat() + '+00:00',
+        }
+        for race in Race.query.filter_by(race_date=race_date).order_by(Race.date_start).all()
+    ]
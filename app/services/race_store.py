@@ -0,0 +1,141 @@
+# app/services/race_store.py
+# Server-side store for race search results, so the session cookie only carries a small handle.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 6 * 60 * 60  # seconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    key TEXT PRIMARY KEY,
+    race TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def race_key(date, session_key):
+    return f"{date}:{session_key}"
+
+
+class RaceSearchStore:
+    """
+    In-process LRU of race details keyed by 'date:session_key', with an optional SQLite file
+    shared between processes behind it. Everyone searching the same date shares the entries.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, store_path=None, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.store_path = os.path.abspath(store_path) if store_path else None
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if self.store_path:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.store_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def put(self, date, races):
+        """
+        Stores the races found for date.
+
+        Returns:
+            dict: Handle to keep in the session: {'date': date, 'session_keys': [...]}.
+        """
+        expires_at = time.time() + self.ttl
+        rows = [(race_key(date, race['session_key']), race) for race in races]
+        for key, race in rows:
+            self._remember(key, race, expires_at)
+        if self.store_path and rows:
+            self._connection().executemany(
+                'INSERT OR REPLACE INTO races (key, race, expires_at) VALUES (?, ?, ?)',
+                [(key, json.dumps(race), expires_at) for key, race in rows]
+            )
+        return {'date': date, 'session_keys': [race['session_key'] for race in races]}
+
+    def get(self, date, session_key):
+        """
+        Returns the race details for date and session_key, or None if unknown or expired.
+        """
+        key = race_key(date, session_key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                race, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return race
+                del self._entries[key]
+
+        if self.store_path:
+            row = self._connection().execute('SELECT race, expires_at FROM races WHERE key = ?', (key,)).fetchone()
+            if row is not None and row[1] > now:
+                race = json.loads(row[0])
+                self._remember(key, race, row[1])
+                return race
+        return None
+
+    def load(self, handle):
+        """
+        Returns every race a handle refers to, or None if any of them is no longer stored.
+        """
+        races = [self.get(handle['date'], session_key) for session_key in handle.get('session_keys', [])]
+        return None if any(race is None for race in races) else races
+
+    def _remember(self, key, race, expires_at):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (race, expires_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store_path:
+            self._connection().execute('DELETE FROM races')
+
+
+_store = None
+
+
+def configure_race_store(max_entries=DEFAULT_MAX_ENTRIES, store_path=None, ttl=DEFAULT_TTL):
+    """
+    Sets up the module-wide race search store.
+
+    Parameters:
+        max_entries (int): Races kept in memory before the least recently used are dropped.
+        store_path (str): Optional SQLite file shared by every process; None keeps races in-process.
+        ttl (int): Seconds a stored race stays valid.
+
+    Returns:
+        RaceSearchStore: The active store.
+    """
+    global _store
+    _store = RaceSearchStore(max_entries, store_path, ttl)
+    return _store
+
+
+def get_race_store():
+    """
+    Returns the active race search store, creating an in-process one on first use.
+    """
+    if _store is None:
+        configure_race_store()
+    return _store
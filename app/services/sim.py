@@ -2,20 +2,51 @@
 
 import random
 
-# Driver Dictionary maintained as per your request
-driver_dict = {
-    1: "Max Verstappen", 10: "Pierre Gasly", 11: "Sergio Pérez", 14: "Fernando Alonso",
-    16: "Charles Leclerc", 18: "Lance Stroll", 2: "Logan Sargeant", 20: "Kevin Magnussen",
-    22: "Yuki Tsunoda", 23: "Alexander Albon", 24: "Zhou Guanyu", 27: "Nico Hülkenberg",
-    3: "Daniel Ricciardo", 31: "Esteban Ocon", 37: "Isack Hadjar", 50: "Oliver Bearman",
-    4: "Lando Norris", 40: "Ayumu Iwasa", 44: "Lewis Hamilton", 43: "Franco Colapinto",
-    55: "Carlos Sainz", 61: "Jack Doohan", 63: "George Russell", 77: "Valtteri Bottas",
-    81: "Oscar Piastri", 97: "Robert Shwartzman", 30: "Liam Lawson"
-}
-
+import numpy as np
+from .sim_vectorized import simulate_race_vectorized
+from .sim_grid import simulate_grid, grid_timing_board, iter_grid_laps
+from .sim_types import CarResult, tire_compounds
+from .sim_montecarlo import DEFAULT_REPLICAS
+from .sim_cache import evaluate_strategies_cached
+from .sim_optimizer import optimal_strategy
+from .catalog import CATALOG
+
+# Reference data shared with the rest of the app (see app/data/catalog.json)
+driver_dict = CATALOG.drivers
+TRACKS = CATALOG.circuits
+TIRE_TYPES = CATALOG.tire_types
+STRATEGIES = CATALOG.strategies
+
+# Limits on what one request may simulate
+MAX_GRID_SIZE = 20  # cars in a real Formula 1 field
+MAX_LAPS = 100
+MAX_SEED = 2 ** 128  # SeedSequence draws 128-bit seeds
+
+
+def validate_race_request(grid, seed=None):
+    """
+    Checks user-supplied simulation inputs before any work is done.
 
+    Parameters:
+        grid (list): Driver numbers in the race.
+        seed (int): Seed for the run, if one was given.
 
-def simulate_race(driver_name, strategy, laps, tire_types, pit_stop_time=22):
+    Raises:
+        ValueError: If the grid is larger than a real field, repeats a driver or names a
+            driver outside the catalog, or the seed is out of range.
+    """
+    if len(grid) > MAX_GRID_SIZE:
+        raise ValueError(f"The grid has {len(grid)} cars; at most {MAX_GRID_SIZE} are allowed")
+    if len(set(grid)) != len(grid):
+        raise ValueError("The grid lists a driver more than once")
+    unknown = [car_id for car_id in grid if car_id not in driver_dict]
+    if unknown:
+        raise ValueError(f"Unknown driver numbers in the grid: {unknown}")
+    if seed is not None and not 0 <= seed < MAX_SEED:
+        raise ValueError("The seed must be between 0 and 2**128 - 1")
+
+
+def simulate_race(driver_name, strategy, laps, tire_types, pit_stop_time=22, rng=None):
     """
     Simulates a race for a single driver based on the provided strategy.
 
@@ -25,10 +56,12 @@ def simulate_race(driver_name, strategy, laps, tire_types, pit_stop_time=22):
         laps (int): Total number of laps in the race.
         tire_types (dict): Dictionary containing tire specifications.
         pit_stop_time (int): Time penalty for each pit stop in seconds.
+        rng (numpy.random.Generator): Source of lap noise; the global random module if not given.
 
     Returns:
         tuple: (total_time, fastest_lap)
     """
+    rng = rng if rng is not None else random
     current_tire = strategy['start_tire']
     pit_laps = strategy['pit_laps'][:]
     next_tires = strategy['next_tires'][:]
@@ -50,7 +83,7 @@ def simulate_race(driver_name, strategy, laps, tire_types, pit_stop_time=22):
         # Lap time calculation with random variation
         base_lap_time = tire_types[current_tire]['base_lap_time']
         degradation = wear_level * tire_types[current_tire]['degradation_rate']
-        variation = random.uniform(-0.5, 0.5)  # Simulating driver performance variability
+        variation = rng.uniform(-0.5, 0.5)  # Simulating driver performance variability
         lap_time = base_lap_time + degradation + variation
 
         fastest_lap = min(fastest_lap, lap_time)
@@ -125,85 +158,157 @@ def display_timing_board(cars, real_results):
     return timingBoard
 
 
-def simEngine(APIdata, selected_strategy_name, grid, real_results):
+def prepare_race(APIdata, selected_strategy_name, grid, seed=None):
     """
-    Simulates the race based on the selected strategy and drivers.
+    Looks up the track and gives every car in the grid its strategy and random stream.
 
     Parameters:
         APIdata (dict): Contains 'driver_number' and 'circuit_key'.
         selected_strategy_name (str): The name of the strategy chosen by the user.
         grid (list): List of driver numbers participating in the race.
-        real_results (list): List of real-life race results.
+        seed (int): Seed for every random choice in the run; a fresh one is drawn if not given.
 
     Returns:
-        dict: Contains 'timing_board', 'strategy_accuracy', and 'real_results'.
+        dict: 'track', 'laps', 'seed', 'selected_driver_id', and per car in grid order
+            'driver_names', 'car_strategies' and 'car_rngs'.
     """
-    results = {}
-
-    # Define Tracks (This should ideally be fetched from a centralized data source or API)
-    track_dict = [
-        {"circuit_key": 63, "track_name": "Bahrain International Circuit", "track_length_miles": 3.363,
-         "number_of_laps": 57},
-        {"circuit_key": 149, "track_name": "Jeddah Corniche Circuit", "track_length_miles": 3.836,
-         "number_of_laps": 50},
-        {"circuit_key": 10, "track_name": "Albert Park Circuit", "track_length_miles": 3.295, "number_of_laps": 58},
-        {"circuit_key": 46, "track_name": "Suzuka International Racing Course", "track_length_miles": 3.609,
-         "number_of_laps": 53},
-        {"circuit_key": 49, "track_name": "Shanghai International Circuit", "track_length_miles": 3.388,
-         "number_of_laps": 56},
-        {"circuit_key": 151, "track_name": "Miami International Autodrome", "track_length_miles": 3.362,
-         "number_of_laps": 57},
-        {"circuit_key": 6, "track_name": "Autodromo Enzo e Dino Ferrari (Imola)", "track_length_miles": 3.050,
-         "number_of_laps": 63},
-        {"circuit_key": 22, "track_name": "Circuit de Monaco", "track_length_miles": 2.074, "number_of_laps": 78},
-        {"circuit_key": 23, "track_name": "Circuit Gilles Villeneuve", "track_length_miles": 2.710,
-         "number_of_laps": 70},
-        {"circuit_key": 24, "track_name": "Circuit de Barcelona-Catalunya", "track_length_miles": 2.892,
-         "number_of_laps": 66},
-        {"circuit_key": 19, "track_name": "Red Bull Ring", "track_length_miles": 2.683, "number_of_laps": 71},
-        {"circuit_key": 2, "track_name": "Silverstone Circuit", "track_length_miles": 3.661, "number_of_laps": 52},
-        {"circuit_key": 4, "track_name": "Hungaroring", "track_length_miles": 2.722, "number_of_laps": 70},
-        {"circuit_key": 7, "track_name": "Circuit de Spa-Francorchamps", "track_length_miles": 4.352,
-         "number_of_laps": 44},
-        {"circuit_key": 55, "track_name": "Circuit Zandvoort", "track_length_miles": 2.647, "number_of_laps": 72},
-        {"circuit_key": 39, "track_name": "Autodromo Nazionale Monza", "track_length_miles": 3.600,
-         "number_of_laps": 53},
-        {"circuit_key": 144, "track_name": "Baku City Circuit", "track_length_miles": 3.730, "number_of_laps": 51},
-        {"circuit_key": 61, "track_name": "Marina Bay Street Circuit", "track_length_miles": 3.146,
-         "number_of_laps": 61},
-        {"circuit_key": 9, "track_name": "Circuit of the Americas", "track_length_miles": 3.426, "number_of_laps": 56},
-        {"circuit_key": 65, "track_name": "Autódromo Hermanos Rodríguez", "track_length_miles": 2.674,
-         "number_of_laps": 71},
-        {"circuit_key": 14, "track_name": "Interlagos Circuit", "track_length_miles": 2.677, "number_of_laps": 71},
-        {"circuit_key": 152, "track_name": "Las Vegas Strip Circuit", "track_length_miles": 3.852,
-         "number_of_laps": 50},
-        {"circuit_key": 150, "track_name": "Lusail International Circuit", "track_length_miles": 3.367,
-         "number_of_laps": 57},
-        {"circuit_key": 70, "track_name": "Yas Marina Circuit", "track_length_miles": 3.281, "number_of_laps": 58}
-    ]
-
-    tire_types = {
-        'soft': {'base_lap_time': 95.0, 'degradation_rate': 0.17, 'wear_limit': 12},
-        'medium': {'base_lap_time': 95.8, 'degradation_rate': 0.10, 'wear_limit': 20},
-        'hard': {'base_lap_time': 96.8, 'degradation_rate': 0.07, 'wear_limit': 35},
-    }
+    validate_race_request(grid, seed)
 
-    strategies = [
-        {'name': 'Aggressive', 'start_tire': 'soft', 'pit_laps': [20, 40], 'next_tires': ['medium', 'hard']},
-        {'name': 'Defensive', 'start_tire': 'soft', 'pit_laps': [20], 'next_tires': ['hard']},
-        {'name': 'Balanced', 'start_tire': 'soft', 'pit_laps': [15, 45], 'next_tires': ['hard', 'hard']},
-        {'name': 'Medium Aggressive', 'start_tire': 'medium', 'pit_laps': [25], 'next_tires': ['hard']},
-        {'name': 'Medium Balanced', 'start_tire': 'medium', 'pit_laps': [20, 50], 'next_tires': ['hard', 'soft']},
-        {'name': 'Conservative', 'start_tire': 'hard', 'pit_laps': [30, 47], 'next_tires': ['medium', 'medium']},
-    ]
+    # Independent streams for strategy assignment and each car's laps, so changing one part
+    # of a run never shifts the random numbers of another. Monte Carlo evaluations use their
+    # own fixed seed (see sim_cache) so they can be shared between runs.
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    assignment_seed, grid_seed = np.random.SeedSequence(seed).spawn(2)
+    assignment_rng = np.random.default_rng(assignment_seed)
 
     selected_driver_id = APIdata.get('driver_number')
-    selected_driver_name = driver_dict.get(selected_driver_id, "Unknown Driver")
 
-    selected_track = next((track for track in track_dict if track["circuit_key"] == APIdata['circuit_key']), None)
+    selected_track = CATALOG.circuit(APIdata['circuit_key'])
     if not selected_track:
         raise ValueError(f"Track with circuit key {APIdata['circuit_key']} not found!")
-    laps = selected_track['number_of_laps']
+    if selected_track['number_of_laps'] > MAX_LAPS:
+        raise ValueError(f"Races longer than {MAX_LAPS} laps are not simulated")
+
+    driver_names = []
+    car_strategies = []
+
+    for car_id in grid:
+        driver_names.append(driver_dict.get(car_id, "Unknown Driver"))
+        # Assign strategy based on whether it's the selected driver
+        if car_id == selected_driver_id:
+            # Find the strategy by name (case-insensitive)
+            strategy = CATALOG.strategy(selected_strategy_name)
+            if not strategy:
+                raise ValueError(f"Strategy '{selected_strategy_name}' not found!")
+        else:
+            # Assign a random strategy to other drivers from the strategies list
+            strategy = STRATEGIES[assignment_rng.integers(len(STRATEGIES))]
+        car_strategies.append(strategy)
+
+    return {
+        "track": selected_track,
+        "laps": selected_track['number_of_laps'],
+        "seed": seed,
+        "selected_driver_id": selected_driver_id,
+        "driver_names": driver_names,
+        "car_strategies": car_strategies,
+        "car_rngs": [np.random.default_rng(car_seed) for car_seed in grid_seed.spawn(len(grid))],
+    }
+
+
+def simulate_race_laps(APIdata, selected_strategy_name, grid, seed=None, pit_stop_time=22):
+    """
+    Simulates the race lap by lap, yielding the running order after every lap.
+
+    Uses the same setup as simEngine, so with the same seed the final lap matches
+    simEngine's timing board. Only the current standings are kept between laps.
+
+    Parameters:
+        APIdata (dict): Contains 'driver_number' and 'circuit_key'.
+        selected_strategy_name (str): The name of the strategy chosen by the user.
+        grid (list): List of driver numbers participating in the race.
+        seed (int): Seed for every random choice in the run; a fresh one is drawn if not given.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+
+    Yields:
+        dict: 'lap', 'total_laps', 'track_name', 'seed', 'order' (position, car_id, driver_name,
+            tire, pit_stops, last_lap, fastest_lap, total_time, gap to the leader and interval
+            to the car ahead) and 'pit_events' (cars that pitted on this lap and their new tire).
+    """
+    race = prepare_race(APIdata, selected_strategy_name, grid, seed)
+    compounds = tire_compounds(TIRE_TYPES)
+    car_ids = list(grid)
+
+    for state in iter_grid_laps(race['car_strategies'], race['laps'], TIRE_TYPES, pit_stop_time, race['car_rngs']):
+        elapsed = state['elapsed'].tolist()
+        lap_times = state['lap_times'].tolist()
+        fastest_laps = state['fastest_lap'].tolist()
+        codes = state['compound'].tolist()
+        pit_stops = state['pit_stops'].tolist()
+        order = []
+        for position, car in enumerate(np.argsort(state['elapsed'], kind='stable').tolist(), start=1):
+            order.append({
+                "position": position,
+                "car_id": car_ids[car],
+                "driver_name": race['driver_names'][car],
+                "tire": compounds[codes[car]].name,
+                "pit_stops": pit_stops[car],
+                "last_lap": lap_times[car],
+                "fastest_lap": fastest_laps[car],
+                "total_time": elapsed[car],
+                "gap": elapsed[car] - order[0]['total_time'] if order else 0.0,
+                "interval": elapsed[car] - order[-1]['total_time'] if order else 0.0,
+            })
+        yield {
+            "lap": state['lap'],
+            "total_laps": race['laps'],
+            "track_name": race['track']['track_name'],
+            "seed": race['seed'],
+            "order": order,
+            "pit_events": [
+                {"car_id": car_ids[car], "driver_name": race['driver_names'][car], "tire": compounds[codes[car]].name}
+                for car in np.flatnonzero(state['pitted']).tolist()
+            ],
+        }
+
+
+def simEngine(APIdata, selected_strategy_name, grid, real_results, vectorized=True, monte_carlo=True,
+              replicas=DEFAULT_REPLICAS, workers=None, seed=None):
+    """
+    Simulates the race based on the selected strategy and drivers.
+
+    Parameters:
+        APIdata (dict): Contains 'driver_number' and 'circuit_key'.
+        selected_strategy_name (str): The name of the strategy chosen by the user.
+        grid (list): List of driver numbers participating in the race.
+        real_results (list): List of real-life race results.
+        vectorized (bool): Simulate the whole grid as NumPy cars x laps arrays instead of
+            running the per-lap Python loop car by car.
+        monte_carlo (bool): Base strategy_accuracy on expected times from replicas simulated
+            races per strategy instead of a single race each.
+        replicas (int): Simulated races per strategy in Monte Carlo mode.
+        workers (int): Worker processes for the Monte Carlo replicas; defaults to the
+            configured count (see sim_parallel.configure_workers). 1 runs in-process.
+        seed (int): Seed for every random choice in the run; a fresh one is drawn if not given.
+            The same inputs and seed always give the same results.
+
+    Returns:
+        dict: Contains 'timing_board', 'strategy_accuracy' (chosen strategy against the optimal
+            one), 'strategy_stats' (mean, p5, p95 and win probability per strategy in Monte Carlo
+            mode), 'optimal_strategy' (see sim_optimizer.optimal_strategy), 'seed' and 'real_results'.
+    """
+    results = {}
+
+    tire_types = TIRE_TYPES
+    strategies = STRATEGIES
+    race_simulator = simulate_race_vectorized if vectorized else simulate_race
+
+    race = prepare_race(APIdata, selected_strategy_name, grid, seed)
+    seed = race['seed']
+    selected_driver_id = race['selected_driver_id']
+    selected_track = race['track']
+    laps = race['laps']
 
     print(f"You selected {selected_track['track_name']} ({laps} laps).\n")
 
@@ -212,65 +317,66 @@ def simEngine(APIdata, selected_strategy_name, grid, real_results):
         return {
             "timing_board": [],
             "strategy_accuracy": 0,
+            "strategy_stats": [],
+            "optimal_strategy": None,
+            "seed": seed,
             "real_results": real_results  # Include real results
         }
 
-    cars = []
-    selected_driver_result = None
+    driver_names = race['driver_names']
+    car_strategies = race['car_strategies']
+    car_rngs = race['car_rngs']
 
-    for car_id in grid:
-        driver_name = driver_dict.get(car_id, "Unknown Driver")
-        # Assign strategy based on whether it's the selected driver
-        if car_id == selected_driver_id:
-            # Find the strategy by name (case-insensitive)
-            strategy = next((s for s in strategies if s['name'].lower() == selected_strategy_name.lower()), None)
-            if not strategy:
-                raise ValueError(f"Strategy '{selected_strategy_name}' not found!")
-        else:
-            # Assign a random strategy to other drivers from the strategies list
-            strategy = random.choice(strategies)
-
-        total_time, fastest_lap = simulate_race(driver_name, strategy, laps, tire_types)
-        car_data = {
-            "car_id": car_id,
-            "driver_name": driver_name,
-            "pit_stops": len(strategy['pit_laps']),
-            "fastest_lap": fastest_lap,
-            "time": total_time
-        }
-        if car_id == selected_driver_id:
-            car_data["strategy"] = strategy
-            selected_driver_result = car_data
-        cars.append(car_data)
-
-    # Display Timing Board with Real-Life Results
-    timing_board = display_timing_board(cars, real_results)
-
-    # Calculate optimal time across all strategies for the selected driver
-    simulated_strategies = {}
-    optimal_time = float('inf')
-
-    for strategy in strategies:
-        strategy_key = strategy['name']
-        if strategy_key not in simulated_strategies:
-            # Simulate the race for this strategy if not already done
-            total_time, _ = simulate_race(selected_driver_result['driver_name'], strategy, laps, tire_types)
-            simulated_strategies[strategy_key] = total_time
-        else:
-            total_time = simulated_strategies[strategy_key]
+    selected_driver_result = None
 
-        if total_time < optimal_time:
-            optimal_time = total_time
+    if vectorized:
+        # Simulate the whole field at once as cars x laps arrays
+        grid_result = simulate_grid(car_strategies, laps, tire_types, rng=car_rngs)
+        timing_board = grid_timing_board(grid, driver_names, grid_result)
+        if selected_driver_id in grid:
+            selected_index = grid.index(selected_driver_id)
+            selected_driver_result = {
+                "driver_name": driver_names[selected_index],
+                "strategy": car_strategies[selected_index],
+                "time": float(grid_result['total_time'][selected_index])
+            }
+    else:
+        cars = []
+        for car_id, driver_name, strategy, car_rng in zip(grid, driver_names, car_strategies, car_rngs):
+            total_time, fastest_lap = race_simulator(driver_name, strategy, laps, tire_types, rng=car_rng)
+            car = CarResult(car_id, driver_name, len(strategy['pit_laps']), fastest_lap, total_time)
+            if car_id == selected_driver_id:
+                selected_driver_result = {"driver_name": driver_name, "strategy": strategy, "time": total_time}
+            cars.append(car)
+
+        # Display Timing Board with Real-Life Results
+        timing_board = display_timing_board([car.to_dict() for car in cars], real_results)
+
+    # Reference: the fastest possible strategy for this race. simulate_race does not enforce
+    # wear limits, so the search doesn't either; otherwise a chosen strategy could beat it.
+    optimal = optimal_strategy(laps, tire_types, respect_wear_limit=False)
+
+    strategy_stats = []
+    if monte_carlo:
+        # Judge the chosen strategy on expected times over many simulated races, not one noisy sample each
+        # Inputs rarely change between requests, so most evaluations come straight from the cache
+        strategy_stats = evaluate_strategies_cached(strategies, laps, tire_types, replicas, workers=workers)
+        chosen_name = selected_driver_result['strategy']['name']
+        chosen_time = next(stats['mean'] for stats in strategy_stats if stats['name'].lower() == chosen_name.lower())
+    else:
+        chosen_time = selected_driver_result['time']
 
-    # Calculate chosen strategy's accuracy
-    chosen_time = selected_driver_result['time']
+    # Calculate chosen strategy's accuracy; a single noisy race can come in under the expected optimum
     if chosen_time > 0:
-        accuracy = (optimal_time / chosen_time) * 100
+        accuracy = min(100.0, (optimal['expected_time'] / chosen_time) * 100)
     else:
         accuracy = 0
 
     return {
         "timing_board": timing_board,
         "strategy_accuracy": accuracy,
+        "strategy_stats": strategy_stats,
+        "optimal_strategy": optimal,
+        "seed": seed,
         "real_results": real_results  # Include real results
     }
\ No newline at end of file
@@ -0,0 +1,218 @@
+# app/services/sim_cache.py
+# Memoized Monte Carlo strategy evaluations, keyed by everything that determines the result.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .sim_montecarlo import summarize_totals
+from .sim_parallel import parallel_total_times
+
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Evaluations always use this seed so that the same inputs hit the same cache entry
+EVALUATION_SEED = 0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evaluations (
+    key TEXT PRIMARY KEY,
+    totals BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def evaluation_key(strategy, laps, tire_types, replicas, pit_stop_time=22, seed=EVALUATION_SEED):
+    """
+    Hash of everything that decides a strategy's simulated total times.
+
+    The strategy's name is left out, so identical plans under different names share an entry.
+    """
+    plan = {field: strategy[field] for field in ('start_tire', 'pit_laps', 'next_tires')}
+    payload = json.dumps([laps, tire_types, plan, pit_stop_time, replicas, seed], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class StrategyEvalCache:
+    """
+    In-process LRU of per-strategy total time arrays, bounded by size, with an optional
+    SQLite file shared between processes behind it.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, store_path=None):
+        self.max_bytes = max_bytes
+        self.store_path = os.path.abspath(store_path) if store_path else None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        if self.store_path:
+            os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.store_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """
+        Returns the cached total times for key, or None on a miss.
+        """
+        with self._lock:
+            totals = self._entries.get(key)
+            if totals is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return totals
+
+        if self.store_path:
+            row = self._connection().execute('SELECT totals FROM evaluations WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                totals = np.frombuffer(row[0], dtype=np.float64)
+                self._remember(key, totals)
+                with self._lock:
+                    self._shared_hits += 1
+                return totals
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def set(self, key, totals):
+        """
+        Stores the total times for key in memory and, if configured, in the shared store.
+        """
+        totals = np.ascontiguousarray(totals, dtype=np.float64)
+        totals.setflags(write=False)
+        self._remember(key, totals)
+        if self.store_path:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO evaluations (key, totals, created_at) VALUES (?, ?, ?)',
+                (key, totals.tobytes(), time.time())
+            )
+
+    def _remember(self, key, totals):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = totals
+            self._bytes += totals.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def stats(self):
+        """
+        Returns lookup counters and the share of lookups served from memory or the shared store.
+        """
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            return {
+                'hits': self._hits,
+                'shared_hits': self._shared_hits,
+                'misses': self._misses,
+                'hit_ratio': (self._hits + self._shared_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = self._shared_hits = self._misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.store_path:
+            self._connection().execute('DELETE FROM evaluations')
+
+
+_UNCONFIGURED = object()
+_cache = _UNCONFIGURED
+
+
+def configure_eval_cache(max_bytes=DEFAULT_MAX_BYTES, store_path=None, enabled=True):
+    """
+    Sets up the module-wide strategy evaluation cache.
+
+    Parameters:
+        max_bytes (int): Size of total time arrays kept in memory before the least recently used are dropped.
+        store_path (str): Optional SQLite file shared by every process; None keeps the cache in-process.
+        enabled (bool): When False, every evaluation is simulated from scratch.
+
+    Returns:
+        StrategyEvalCache or None: The active cache.
+    """
+    global _cache
+    _cache = StrategyEvalCache(max_bytes, store_path) if enabled else None
+    return _cache
+
+
+def get_eval_cache():
+    """
+    Returns the active evaluation cache, creating an in-process one on first use.
+    """
+    if _cache is _UNCONFIGURED:
+        configure_eval_cache()
+    return _cache
+
+
+def strategy_totals(strategy, laps, tire_types, replicas, pit_stop_time=22, seed=EVALUATION_SEED, workers=None):
+    """
+    Total times of replicas simulated races of one strategy, from the cache when possible.
+
+    Each strategy is simulated from its own key-derived seed, so its result does not depend
+    on which other strategies it is evaluated with.
+
+    Returns:
+        numpy array: One total time per replica (read-only).
+    """
+    key = evaluation_key(strategy, laps, tire_types, replicas, pit_stop_time, seed)
+    cache = get_eval_cache()
+    totals = cache.get(key) if cache is not None else None
+    if totals is None:
+        totals = parallel_total_times([strategy], laps, tire_types, replicas, pit_stop_time,
+                                      seed=int(key, 16), workers=workers)[0]
+        if cache is not None:
+            cache.set(key, totals)
+    return totals
+
+
+def evaluate_strategies_cached(strategies, laps, tire_types, replicas, pit_stop_time=22, seed=EVALUATION_SEED,
+                               workers=None):
+    """
+    Per-strategy statistics in the format of sim_montecarlo.summarize_totals, reusing cached evaluations.
+
+    Parameters:
+        strategies (list): Strategy dicts, each with a 'name'.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        replicas (int): Simulated races per strategy.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        seed (int): Evaluation seed, part of the cache key.
+        workers (int): Worker processes used on a miss, defaults to the configured count.
+
+    Returns:
+        list: Per-strategy statistics, in the order of strategies (see summarize_totals).
+    """
+    totals = np.vstack([
+        strategy_totals(strategy, laps, tire_types, replicas, pit_stop_time, seed, workers)
+        for strategy in strategies
+    ])
+    return summarize_totals([strategy['name'] for strategy in strategies], totals)
@@ -0,0 +1,149 @@
+# app/services/sim_grid.py
+# Whole-field race simulation with the grid held as cars x laps arrays.
+
+import numpy as np
+
+from .sim_types import CarTable, encode_strategies
+from .sim_vectorized import LAP_NOISE
+
+
+def grid_plan(strategies, laps, tire_types):
+    """
+    Lays out the noise-free part of a race for the whole field.
+
+    Parameters:
+        strategies (list): One strategy dict per car.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+
+    Returns:
+        dict: 'compound' (cars x laps compound codes), 'wear' (cars x laps laps-on-tire),
+            'pit' (cars x laps, True on laps that start with a pit stop) and
+            'pit_stops' (stops taken per car).
+    """
+    # Lay out each distinct plan once, then give every car its plan's rows
+    strategy_index, distinct = encode_strategies(strategies, tire_types)
+    plans = len(distinct)
+    compound = np.empty((plans, laps), dtype=np.int8)
+    wear = np.empty((plans, laps), dtype=np.int16)
+    pit = np.zeros((plans, laps), dtype=bool)
+    pit_stops = np.empty(plans, dtype=np.int16)
+
+    for row, strategy in enumerate(distinct):
+        stints, stops = strategy.stints(laps)
+        lap = 0
+        for index, (code, stint_laps) in enumerate(stints):
+            compound[row, lap:lap + stint_laps] = code
+            wear[row, lap:lap + stint_laps] = np.arange(stint_laps)
+            if index > 0 and lap < laps:
+                pit[row, lap] = True
+            lap += stint_laps
+        pit_stops[row] = stops
+
+    compound, wear, pit, pit_stops = (
+        compound[strategy_index], wear[strategy_index], pit[strategy_index], pit_stops[strategy_index])
+    return {'compound': compound, 'wear': wear, 'pit': pit, 'pit_stops': pit_stops}
+
+
+def simulate_grid(strategies, laps, tire_types, pit_stop_time=22, rng=None):
+    """
+    Simulates every car in the field in one vectorized pass.
+
+    Parameters:
+        strategies (list): One strategy dict per car.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        rng (numpy.random.Generator or list): Source of lap noise, or one generator per car so
+            each car's laps do not depend on the rest of the field.
+
+    Returns:
+        dict: The grid_plan arrays plus 'lap_times' (cars x laps, pit stops excluded),
+            'cumulative' (cars x laps elapsed race time, pit stops included),
+            'total_time' and 'fastest_lap' per car.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    plan = grid_plan(strategies, laps, tire_types)
+    base = np.array([spec['base_lap_time'] for spec in tire_types.values()])
+    rate = np.array([spec['degradation_rate'] for spec in tire_types.values()])
+
+    compound = plan['compound']
+    lap_times = base[compound] + plan['wear'] * rate[compound]
+    if isinstance(rng, (list, tuple)):
+        lap_times += np.array([car_rng.uniform(-LAP_NOISE, LAP_NOISE, laps) for car_rng in rng]).reshape(lap_times.shape)
+    else:
+        lap_times += rng.uniform(-LAP_NOISE, LAP_NOISE, lap_times.shape)
+    cumulative = np.cumsum(lap_times + plan['pit'] * pit_stop_time, axis=1)
+
+    cars = len(strategies)
+    plan.update({
+        'lap_times': lap_times,
+        'cumulative': cumulative,
+        'total_time': cumulative[:, -1] if laps else np.zeros(cars),
+        'fastest_lap': lap_times.min(axis=1) if laps else np.full(cars, np.inf),
+    })
+    return plan
+
+
+def iter_grid_laps(strategies, laps, tire_types, pit_stop_time=22, rng=None):
+    """
+    Simulates every car in the field one lap at a time, yielding the state after each lap.
+
+    Only running totals are kept, never the lap history. With one generator per car the
+    noise is drawn in the same order as simulate_grid, so both give the same race.
+
+    Parameters:
+        strategies (list): One strategy dict per car.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        rng (numpy.random.Generator or list): Source of lap noise, or one generator per car.
+
+    Yields:
+        dict: 'lap' (1-based), then per car 'lap_times', 'elapsed' (pit stops included),
+            'pitted' (stopped at the start of this lap), 'compound', 'pit_stops' and 'fastest_lap' so far.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    plan = grid_plan(strategies, laps, tire_types)
+    base = np.array([spec['base_lap_time'] for spec in tire_types.values()])
+    rate = np.array([spec['degradation_rate'] for spec in tire_types.values()])
+
+    cars = len(strategies)
+    elapsed = np.zeros(cars)
+    fastest_lap = np.full(cars, np.inf)
+    pit_stops = np.zeros(cars, dtype=np.int16)
+    for lap in range(laps):
+        compound = plan['compound'][:, lap]
+        pitted = plan['pit'][:, lap]
+        if isinstance(rng, (list, tuple)):
+            noise = np.array([car_rng.uniform(-LAP_NOISE, LAP_NOISE) for car_rng in rng])
+        else:
+            noise = rng.uniform(-LAP_NOISE, LAP_NOISE, cars)
+        lap_times = base[compound] + plan['wear'][:, lap] * rate[compound] + noise
+        elapsed += lap_times + pitted * pit_stop_time
+        np.minimum(fastest_lap, lap_times, out=fastest_lap)
+        pit_stops += pitted
+        yield {
+            'lap': lap + 1,
+            'lap_times': lap_times,
+            'elapsed': elapsed.copy(),
+            'pitted': pitted,
+            'compound': compound,
+            'pit_stops': pit_stops.copy(),
+            'fastest_lap': fastest_lap.copy(),
+        }
+
+
+def grid_timing_board(car_ids, driver_names, result):
+    """
+    Builds the timing board from simulate_grid arrays, in the format display_timing_board returns.
+
+    Parameters:
+        car_ids (list): Driver number of each car, in grid order.
+        driver_names (list): Driver name of each car, in grid order.
+        result (dict): Output of simulate_grid.
+
+    Returns:
+        list: Timing board entries sorted by total race time.
+    """
+    return CarTable.from_grid(car_ids, result).timing_board(driver_names)
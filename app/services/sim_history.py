@@ -0,0 +1,133 @@
+# app/services/sim_history.py
+# A user's saved simulation results, paged by (timestamp, id) and streamed for export.
+
+import base64
+import csv
+import io
+from datetime import datetime
+
+from .. import db
+from ..models import Race, SimulationResult
+
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = ['timestamp', 'id', 'session_key', 'location', 'race_date', 'driver_number', 'selected_driver',
+                 'strategy', 'selected_time', 'strategy_accuracy']
+
+_COLUMNS = (
+    SimulationResult.id, SimulationResult.timestamp, Race.session_key, Race.location, Race.race_date,
+    SimulationResult.driver_number, SimulationResult.selected_driver, SimulationResult.strategy,
+    SimulationResult.selected_time, SimulationResult.strategy_accuracy,
+)
+
+
+def encode_cursor(timestamp, result_id):
+    """
+    Opaque cursor pointing just past the result with this (timestamp, id).
+    """
+    raw = f"{timestamp.isoformat()}|{result_id}".encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (timestamp, id) a cursor points past.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        timestamp, result_id = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(result_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
+
+
+def _history_query(user_id):
+    # Newest first; id breaks timestamp ties so every row has exactly one place in the order
+    return (db.select(*_COLUMNS)
+            .join(Race, SimulationResult.race_id == Race.id)
+            .where(SimulationResult.user_id == user_id)
+            .order_by(SimulationResult.timestamp.desc(), SimulationResult.id.desc()))
+
+
+def _row_dict(row):
+    return {
+        'id': row.id,
+        'timestamp': row.timestamp.isoformat(),
+        'session_key': row.session_key,
+        'location': row.location,
+        'race_date': row.race_date.isoformat(),
+        'driver_number': row.driver_number,
+        'selected_driver': row.selected_driver,
+        'strategy': row.strategy,
+        'selected_time': row.selected_time,
+        'strategy_accuracy': row.strategy_accuracy,
+    }
+
+
+def history_page(user_id, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    One page of a user's simulation results, newest first.
+
+    Pages are found by seeking the (user_id, timestamp, id) index to the cursor rather than
+    skipping rows with OFFSET, so every page costs the same however deep it is.
+
+    Parameters:
+        user_id (int): Whose results to page through.
+        cursor (str): next_cursor of the previous page; None for the newest page.
+        limit (int): Results per page, capped at MAX_PAGE_SIZE.
+
+    Returns:
+        dict: 'results' (list of result dicts) and 'next_cursor' (None on the last page).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = _history_query(user_id)
+    if cursor:
+        timestamp, result_id = decode_cursor(cursor)
+        query = query.where(db.tuple_(SimulationResult.timestamp, SimulationResult.id) < (timestamp, result_id))
+
+    # One extra row tells whether there is a next page without counting
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = encode_cursor(rows[limit - 1].timestamp, rows[limit - 1].id) if len(rows) > limit else None
+    return {'results': [_row_dict(row) for row in rows[:limit]], 'next_cursor': next_cursor}
+
+
+def iter_history(user_id, batch_size=DEFAULT_EXPORT_BATCH_SIZE):
+    """
+    Yields every simulation result of a user, newest first, as dicts.
+
+    Rows come from a server-side cursor batch_size at a time, so memory use doesn't grow
+    with the length of the history.
+    """
+    result = db.session.execute(_history_query(user_id).execution_options(yield_per=batch_size))
+    try:
+        for row in result:
+            yield _row_dict(row)
+    finally:
+        result.close()
+
+
+def iter_history_csv(user_id, batch_size=DEFAULT_EXPORT_BATCH_SIZE):
+    """
+    Yields a user's simulation history as CSV text: the header, then one chunk per batch_size rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    count = 0
+    for row in iter_history(user_id, batch_size):
+        writer.writerow(row)
+        count += 1
+        if count % batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
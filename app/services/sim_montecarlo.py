@@ -0,0 +1,66 @@
+# app/services/sim_montecarlo.py
+# Monte Carlo evaluation of pit strategies: many simulated races per strategy at once.
+
+import numpy as np
+
+from .sim_vectorized import lap_profile, LAP_NOISE
+
+
+DEFAULT_REPLICAS = 10000
+
+# Noise values drawn per array; bounds memory for many strategies and long races
+_CHUNK_VALUES = 2 ** 20
+
+
+def total_times_matrix(strategies, laps, tire_types, replicas, pit_stop_time=22, rng=None):
+    """
+    Total race times of many independent runs of several strategies, computed as one
+    batched array operation per chunk of replicas.
+
+    Only totals are needed here, so lap noise is summed chunk by chunk instead of
+    keeping a strategies x replicas x laps array around.
+
+    Returns:
+        numpy array: Total times, shape (strategies, replicas).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    offsets = np.empty(len(strategies))
+    for i, strategy in enumerate(strategies):
+        _, deterministic_total, stops = lap_profile(strategy, laps, tire_types)
+        offsets[i] = deterministic_total + stops * pit_stop_time
+
+    totals = np.empty((len(strategies), replicas))
+    chunk = max(1, _CHUNK_VALUES // max(1, len(strategies) * laps))
+    for start in range(0, replicas, chunk):
+        stop = min(start + chunk, replicas)
+        noise = rng.uniform(-LAP_NOISE, LAP_NOISE, (len(strategies), stop - start, laps))
+        totals[:, start:stop] = noise.sum(axis=2)
+    totals += offsets[:, None]
+    return totals
+
+
+def summarize_totals(names, totals):
+    """
+    Summary statistics for a strategies x replicas matrix of total times.
+
+    Parameters:
+        names (list): Strategy names, one per row.
+        totals (numpy array): Total times, shape (strategies, replicas).
+
+    Returns:
+        list: One dict per strategy with 'name', 'mean', 'p5', 'p95' and 'win_probability',
+            the share of replicas in which that strategy was the fastest.
+    """
+    means = totals.mean(axis=1)
+    p5, p95 = np.percentile(totals, [5, 95], axis=1)
+    wins = np.bincount(totals.argmin(axis=0), minlength=len(names)) / totals.shape[1]
+    return [
+        {
+            'name': name,
+            'mean': float(means[i]),
+            'p5': float(p5[i]),
+            'p95': float(p95[i]),
+            'win_probability': float(wins[i]),
+        }
+        for i, name in enumerate(names)
+    ]
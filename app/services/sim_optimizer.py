@@ -0,0 +1,129 @@
+# app/services/sim_optimizer.py
+# Exact pit strategy search: dynamic programming over closed-form stint costs.
+
+from functools import lru_cache
+
+import numpy as np
+
+from .sim_types import Strategy
+from .sim_vectorized import stint_cost
+
+
+def _tire_key(tire_types):
+    return tuple(
+        (name, (spec['base_lap_time'], spec['degradation_rate'], spec.get('wear_limit')))
+        for name, spec in tire_types.items()
+    )
+
+
+@lru_cache(maxsize=256)
+def _solve(laps, tire_key, pit_stop_time, max_stops, respect_wear_limit, require_two_compounds):
+    # Returns (total, ((compound code, stint laps), ...)), or None
+    compounds = len(tire_key)
+    masks = 1 << compounds
+    lengths = np.arange(laps + 1)
+
+    # cost[c, n]: noise-free time of an n-lap stint on compound c (stints are never empty)
+    cost = np.empty((compounds, laps + 1))
+    for c, (_, (base, rate, wear_limit)) in enumerate(tire_key):
+        cost[c] = stint_cost(base, rate, lengths)
+        cost[c, 0] = np.inf
+        if respect_wear_limit and wear_limit is not None:
+            cost[c, wear_limit + 1:] = np.inf
+
+    # covered[l, n] = l - n: laps covered before a stint of n laps that ends on lap l
+    covered = lengths[:, None] - lengths[None, :]
+    valid = covered >= 0
+    covered = np.where(valid, covered, 0)
+
+    # best[k][mask, l]: fastest way to cover l laps with k stints using the compounds in mask
+    best = np.full((masks, laps + 1), np.inf)
+    best[0, 0] = 0.0
+    layers = []
+    results = []
+    # No lap is faster than the fastest base lap time, so once the pit losses alone push
+    # that bound past the best total found, more stops cannot help
+    floor = laps * min(base for _, (base, _, _) in tire_key)
+    stints = 0
+    while stints < laps and (max_stops is None or stints <= max_stops):
+        stints += 1
+        if results and floor + (stints - 1) * pit_stop_time >= min(results)[0]:
+            break
+        layer = np.full((masks, laps + 1), np.inf)
+        choice = np.full((masks, laps + 1, 3), -1, dtype=np.int64)  # (prev mask, compound, stint laps)
+        for mask in range(masks):
+            prev = best[mask]
+            if not np.isfinite(prev).any():
+                continue
+            gathered = np.where(valid, prev[covered], np.inf)
+            for c in range(compounds):
+                candidates = gathered + cost[c][None, :]
+                stint_laps = candidates.argmin(axis=1)
+                times = candidates[lengths, stint_laps]
+                new_mask = mask | (1 << c)
+                better = times < layer[new_mask]
+                layer[new_mask] = np.where(better, times, layer[new_mask])
+                choice[new_mask][better] = np.stack(
+                    [np.full(better.sum(), mask), np.full(better.sum(), c), stint_laps[better]], axis=1)
+        layers.append(choice)
+        best = layer
+        for mask in range(1, masks):
+            if require_two_compounds and bin(mask).count('1') < 2:
+                continue
+            total = layer[mask, laps] + (stints - 1) * pit_stop_time
+            if np.isfinite(total):
+                results.append((float(total), stints, mask))
+
+    if not results:
+        return None
+
+    total, stints, mask = min(results)
+    plan = []
+    covered_laps = laps
+    for choice in reversed(layers[:stints]):
+        prev_mask, c, stint_laps = choice[mask, covered_laps].tolist()
+        plan.append((c, stint_laps))
+        mask, covered_laps = prev_mask, covered_laps - stint_laps
+    plan.reverse()
+    return total, tuple(plan)
+
+
+def optimal_strategy(laps, tire_types, pit_stop_time=22, max_stops=None, respect_wear_limit=True,
+                     require_two_compounds=False):
+    """
+    Finds the fastest noise-free strategy over every stop count, pit lap and compound order.
+
+    A race is a sequence of stints whose cost has a closed form (see stint_cost), so the
+    search is a shortest path over (stints used, compounds used, laps covered) instead of
+    a simulation of every candidate.
+
+    Parameters:
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        max_stops (int): Most pit stops to consider; None searches until more stops cannot help.
+        respect_wear_limit (bool): Never run a compound for more laps than its 'wear_limit'.
+        require_two_compounds (bool): Use at least two different compounds, as the sporting rules require.
+
+    Returns:
+        dict: Strategy in the same format as STRATEGIES ('name', 'start_tire', 'pit_laps',
+            'next_tires') plus 'stints' and 'expected_time', or None if no strategy fits the constraints.
+    """
+    solution = _solve(laps, _tire_key(tire_types), pit_stop_time, max_stops, respect_wear_limit,
+                      require_two_compounds)
+    if solution is None:
+        return None
+
+    expected_time, stints = solution
+    pit_laps = []
+    lap = 1
+    for _, stint_laps in stints[:-1]:
+        lap += stint_laps
+        pit_laps.append(lap)
+    tire_names = list(tire_types)
+    strategy = Strategy('Optimal', stints[0][0], tuple(pit_laps), tuple(code for code, _ in stints[1:]))
+    return {
+        **strategy.to_dict(tire_names),
+        'stints': [[tire_names[code], stint_laps] for code, stint_laps in stints],
+        'expected_time': expected_time,
+    }
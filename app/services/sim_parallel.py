@@ -0,0 +1,122 @@
+# app/services/sim_parallel.py
+# Shards independent simulations across a process pool with deterministic per-shard seeds.
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .sim_montecarlo import total_times_matrix, summarize_totals
+
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Replicas per shard. Shards, and therefore results, depend only on the seed and
+# the replica count, never on how many workers happen to run them.
+SHARD_REPLICAS = 2500
+
+_workers = DEFAULT_WORKERS
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def configure_workers(workers):
+    """
+    Sets the number of worker processes used by the parallel simulation backend.
+
+    Parameters:
+        workers (int): Worker processes; 1 runs every shard in the calling process.
+    """
+    global _workers, _executor
+    with _executor_lock:
+        _workers = max(1, int(workers))
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def get_executor():
+    """
+    Returns the shared process pool, started on first use. Workers are spawned rather
+    than forked so they never inherit the web server's threads or sockets.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=_workers, mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def _seed_sequence(seed):
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def _shard_sizes(replicas):
+    sizes = [SHARD_REPLICAS] * (replicas // SHARD_REPLICAS)
+    if replicas % SHARD_REPLICAS:
+        sizes.append(replicas % SHARD_REPLICAS)
+    return sizes
+
+
+def configured_workers():
+    """Number of worker processes set by configure_workers."""
+    return _workers
+
+
+def _map(fn, tasks, workers):
+    workers = _workers if workers is None else workers
+    if workers <= 1 or len(tasks) <= 1:
+        return [fn(*task) for task in tasks]
+    return list(get_executor().map(fn, *zip(*tasks)))
+
+
+def _total_times_shard(strategies, laps, tire_types, replicas, pit_stop_time, seed_sequence):
+    return total_times_matrix(strategies, laps, tire_types, replicas, pit_stop_time,
+                              np.random.default_rng(seed_sequence))
+
+
+def parallel_total_times(strategies, laps, tire_types, replicas, pit_stop_time=22, seed=None, workers=None):
+    """
+    Total times of replicas runs of every strategy, sharded across worker processes.
+
+    Returns:
+        numpy array: Total times, shape (strategies, replicas).
+    """
+    sizes = _shard_sizes(replicas)
+    seeds = _seed_sequence(seed).spawn(len(sizes))
+    tasks = [(strategies, laps, tire_types, size, pit_stop_time, seq) for size, seq in zip(sizes, seeds)]
+    return np.hstack(_map(_total_times_shard, tasks, workers))
+
+
+def sweep(tracks, strategies, tire_types, replicas, pit_stop_time=22, seed=None, workers=None):
+    """
+    Evaluates every strategy on every track, with all (track, shard) pieces run in parallel.
+
+    Parameters:
+        tracks (list): Track dicts with 'circuit_key' and 'number_of_laps'.
+        strategies (list): Strategy dicts, each with a 'name'.
+        tire_types (dict): Dictionary containing tire specifications.
+        replicas (int): Simulated races per strategy per track.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        seed (int or numpy.random.SeedSequence): Root seed; each track gets its own independent child stream.
+        workers (int): Worker processes, defaults to the configured count.
+
+    Returns:
+        dict: circuit_key -> per-strategy statistics (see sim_montecarlo.summarize_totals).
+    """
+    sizes = _shard_sizes(replicas)
+    track_seeds = _seed_sequence(seed).spawn(len(tracks))
+    tasks = []
+    for track, track_seed in zip(tracks, track_seeds):
+        for size, seq in zip(sizes, track_seed.spawn(len(sizes))):
+            tasks.append((strategies, track['number_of_laps'], tire_types, size, pit_stop_time, seq))
+
+    shards = _map(_total_times_shard, tasks, workers)
+    names = [strategy['name'] for strategy in strategies]
+    results = {}
+    for index, track in enumerate(tracks):
+        track_shards = shards[index * len(sizes):(index + 1) * len(sizes)]
+        results[track['circuit_key']] = summarize_totals(names, np.hstack(track_shards))
+    return results
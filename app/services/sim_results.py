@@ -0,0 +1,388 @@
+# app/services/sim_results.py
+# Saves simulation results in batches off the request path and keeps per-user and per-race totals.
+
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from .. import db
+from ..models import Race, RaceStats, SimulationResult, UserStats
+from .race_calendar import _parse_session_time
+
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 2.0  # seconds a result may wait for its batch to fill
+DEFAULT_MAX_PENDING = 10000
+WRITE_ATTEMPTS = 2  # a batch is retried once if another process inserted the same race or totals row
+
+
+def simulation_record(user_id, race, driver_number, selected_driver, selected_time, strategy, strategy_accuracy,
+                      search_date):
+    """
+    Builds the record for one finished simulation, ready for SimulationResultWriter.submit.
+
+    Parameters:
+        user_id (int): User who ran the simulation.
+        race (dict): racefinder entry the simulation was run for.
+        driver_number (int): Driver the user picked.
+        selected_driver (str): That driver's name.
+        selected_time (float): Simulated race time of that driver, in seconds (None if unknown).
+        strategy (str): Strategy the user picked.
+        strategy_accuracy (float): Closeness of that strategy to the optimal one, in percent.
+        search_date (str): Date the race was found on, 'YYYY-MM-DD'; used when the race entry
+            carries no start and end times.
+
+    Returns:
+        dict: The record.
+    """
+    return {
+        'user_id': user_id,
+        'race': {
+            'session_key': race['session_key'],
+            'circuit_key': race['circuit_details']['circuit_key'],
+            'circuit_short_name': race['circuit_details'].get('circuit_name'),
+            'location': race.get('location') or race['circuit_details'].get('circuit_name') or 'Unknown',
+            'date_start': race.get('date_start'),
+            'date_end': race.get('date_end'),
+            'search_date': search_date,
+        },
+        'driver_number': driver_number,
+        'selected_driver': selected_driver,
+        'selected_time': f"{selected_time:.3f}s" if selected_time is not None else 'N/A',
+        'strategy': strategy,
+        'strategy_accuracy': float(strategy_accuracy),
+        'timestamp': datetime.utcnow(),
+    }
+
+
+def _race_row(race):
+    if race['date_start'] and race['date_end']:
+        date_start = _parse_session_time(race['date_start'])
+        date_end = _parse_session_time(race['date_end'])
+    else:
+        # Older cached searches have no session times; the search date is the race day
+        date_start = date_end = datetime.strptime(race['search_date'], '%Y-%m-%d')
+    return {
+        'session_key': race['session_key'],
+        'circuit_key': race['circuit_key'],
+        'circuit_short_name': race['circuit_short_name'],
+        'location': race['location'],
+        'race_date': date_start.date(),
+        'date_start': date_start,
+        'date_end': date_end,
+    }
+
+
+def _race_ids(records):
+    # session_key -> races.id, adding races the calendar hasn't loaded yet
+    races = {record['race']['session_key']: record['race'] for record in records}
+    race_ids = dict(db.session.query(Race.session_key, Race.id).filter(Race.session_key.in_(races)).all())
+    missing = [_race_row(race) for session_key, race in races.items() if session_key not in race_ids]
+    if missing:
+        db.session.execute(db.insert(Race), missing)
+        race_ids.update(db.session.query(Race.session_key, Race.id)
+                        .filter(Race.session_key.in_([row['session_key'] for row in missing])).all())
+    return race_ids
+
+
+def _totals(rows, key):
+    totals = defaultdict(lambda: {'simulations': 0, 'accuracy_sum': 0.0, 'best_accuracy': 0.0, 'last': None})
+    for row in rows:
+        entry = totals[row[key]]
+        entry['simulations'] += 1
+        entry['accuracy_sum'] += row['strategy_accuracy']
+        entry['best_accuracy'] = max(entry['best_accuracy'], row['strategy_accuracy'])
+        entry['last'] = row['timestamp'] if entry['last'] is None else max(entry['last'], row['timestamp'])
+    return totals
+
+
+def _add_totals(model, key_column, key, entry, **extra):
+    # Adds a batch to the stored totals in one UPDATE, so concurrent writers never lose counts
+    updated = db.session.execute(
+        db.update(model).where(key_column == key).values(
+            simulations=model.simulations + entry['simulations'],
+            accuracy_sum=model.accuracy_sum + entry['accuracy_sum'],
+            best_accuracy=db.case((model.best_accuracy < entry['best_accuracy'], entry['best_accuracy']),
+                                  else_=model.best_accuracy),
+            **extra
+        ).execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        db.session.execute(db.insert(model), [{
+            key_column.key: key,
+            'simulations': entry['simulations'],
+            'accuracy_sum': entry['accuracy_sum'],
+            'best_accuracy': entry['best_accuracy'],
+            **{field: entry['last'] for field in extra},
+        }])
+
+
+def save_results(records):
+    """
+    Inserts a batch of simulation records and adds them to the user and race totals, in one transaction.
+
+    Parameters:
+        records (list): Records built by simulation_record.
+
+    Returns:
+        int: Number of results saved.
+    """
+    if not records:
+        return 0
+    for attempt in range(WRITE_ATTEMPTS):
+        try:
+            race_ids = _race_ids(records)
+            rows = [
+                {
+                    'user_id': record['user_id'],
+                    'race_id': race_ids[record['race']['session_key']],
+                    'driver_number': record['driver_number'],
+                    'selected_time': record['selected_time'],
+                    'selected_driver': record['selected_driver'],
+                    'strategy_accuracy': record['strategy_accuracy'],
+                    'strategy': record['strategy'],
+                    'timestamp': record['timestamp'],
+                }
+                for record in records
+            ]
+            db.session.execute(db.insert(SimulationResult), rows)
+
+            # Sorted so concurrent batches lock totals rows in the same order
+            for user_id, entry in sorted(_totals(rows, 'user_id').items()):
+                last = UserStats.last_simulation_at
+                _add_totals(UserStats, UserStats.user_id, user_id, entry,
+                            last_simulation_at=db.case((db.or_(last.is_(None), last < entry['last']), entry['last']),
+                                                       else_=last))
+            for race_id, entry in sorted(_totals(rows, 'race_id').items()):
+                _add_totals(RaceStats, RaceStats.race_id, race_id, entry)
+            db.session.commit()
+            return len(rows)
+        except IntegrityError:
+            db.session.rollback()
+            if attempt == WRITE_ATTEMPTS - 1:
+                raise
+
+
+def rebuild_stats():
+    """
+    Recomputes every user and race total from the saved simulation results.
+
+    Returns:
+        dict: Number of 'users' and 'races' with totals.
+    """
+    accuracy = SimulationResult.strategy_accuracy
+    user_rows = db.session.query(
+        SimulationResult.user_id, db.func.count(), db.func.sum(accuracy), db.func.max(accuracy),
+        db.func.max(SimulationResult.timestamp)
+    ).group_by(SimulationResult.user_id).all()
+    race_rows = db.session.query(
+        SimulationResult.race_id, db.func.count(), db.func.sum(accuracy), db.func.max(accuracy)
+    ).group_by(SimulationResult.race_id).all()
+
+    db.session.execute(db.delete(UserStats))
+    db.session.execute(db.delete(RaceStats))
+    if user_rows:
+        db.session.execute(db.insert(UserStats), [
+            {'user_id': user_id, 'simulations': count, 'accuracy_sum': total, 'best_accuracy': best,
+             'last_simulation_at': last}
+            for user_id, count, total, best, last in user_rows
+        ])
+    if race_rows:
+        db.session.execute(db.insert(RaceStats), [
+            {'race_id': race_id, 'simulations': count, 'accuracy_sum': total, 'best_accuracy': best}
+            for race_id, count, total, best in race_rows
+        ])
+    db.session.commit()
+    return {'users': len(user_rows), 'races': len(race_rows)}
+
+
+def top_users(limit=20, min_simulations=5):
+    """
+    Global leaderboard: users with the best mean strategy accuracy, read from the totals table.
+
+    Parameters:
+        limit (int): Number of users to return.
+        min_simulations (int): Simulations a user needs before being ranked.
+
+    Returns:
+        list: UserStats rows, best first, with their users loaded.
+    """
+    return (UserStats.query
+            .options(db.joinedload(UserStats.user))
+            .filter(UserStats.simulations >= min_simulations)
+            .order_by((UserStats.accuracy_sum / UserStats.simulations).desc(), UserStats.user_id)
+            .limit(limit)
+            .all())
+
+
+def top_races(limit=10):
+    """
+    Most simulated races, read from the totals table.
+
+    Returns:
+        list: RaceStats rows, most simulations first, with their races loaded.
+    """
+    return (RaceStats.query
+            .options(db.joinedload(RaceStats.race))
+            .order_by(RaceStats.simulations.desc(), RaceStats.race_id)
+            .limit(limit)
+            .all())
+
+
+def recent_results(user_id, limit=10):
+    """
+    A user's latest simulation results, newest first (served by the user_id, timestamp, id index).
+    """
+    return (SimulationResult.query
+            .options(db.joinedload(SimulationResult.race))
+            .filter_by(user_id=user_id)
+            .order_by(SimulationResult.timestamp.desc(), SimulationResult.id.desc())
+            .limit(limit)
+            .all())
+
+
+class SimulationResultWriter:
+    """
+    Collects simulation records from request threads and saves them from one background
+    thread, a batch at a time: whenever batch_size records are waiting or the oldest has
+    waited flush_interval seconds.
+    """
+
+    def __init__(self, app, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_pending=DEFAULT_MAX_PENDING):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._stopped = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, record):
+        """
+        Queues a record for saving. Returns False if the queue is full and the record was dropped.
+        """
+        self._ensure_started()
+        try:
+            self._pending.put_nowait(record)
+        except queue.Full:
+            print(f"Simulation result queue full, dropping result for user {record['user_id']}")
+            return False
+        return True
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='sim-results-writer', daemon=True)
+                    self._thread.start()
+
+    def _next_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                first = self._pending.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._next_batch(first))
+
+    def _write(self, batch):
+        with self.app.app_context():
+            try:
+                save_results(batch)
+            except Exception as e:
+                print(f"Error saving {len(batch)} simulation results: {e}")
+                db.session.rollback()
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def flush(self):
+        """
+        Saves everything still queued, in the calling thread.
+
+        Returns:
+            int: Number of records written.
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(batch), self.batch_size):
+            self._write(batch[start:start + self.batch_size])
+        # Wait for a batch the background thread may still be collecting or writing
+        self._pending.join()
+        return len(batch)
+
+    def shutdown(self):
+        self._stopped.set()
+        self.flush()
+
+
+_writer = None
+
+
+def configure_results_writer(app):
+    """
+    Sets up the module-wide simulation result writer from the app config. With
+    SIM_RESULTS_ASYNC off, results are saved inside the request instead.
+
+    Returns:
+        SimulationResultWriter or None: The active writer.
+    """
+    global _writer
+    if _writer is not None:
+        _writer.shutdown()
+    _writer = None
+    if app.config['SIM_RESULTS_ASYNC']:
+        _writer = SimulationResultWriter(app,
+                                         batch_size=app.config['SIM_RESULTS_BATCH_SIZE'],
+                                         flush_interval=app.config['SIM_RESULTS_FLUSH_INTERVAL'],
+                                         max_pending=app.config['SIM_RESULTS_MAX_PENDING'])
+    return _writer
+
+
+def get_results_writer():
+    """
+    Returns the active simulation result writer, or None when results are saved synchronously.
+    """
+    return _writer
+
+
+def record_simulation(record):
+    """
+    Saves a simulation record through the background writer, or right away if there is none.
+    """
+    if _writer is not None:
+        _writer.submit(record)
+        return
+    try:
+        save_results([record])
+    except Exception as e:
+        print(f"Error saving simulation result: {e}")
+        db.session.rollback()
+
+
+@atexit.register
+def _flush_on_exit():
+    if _writer is not None:
+        _writer.shutdown()
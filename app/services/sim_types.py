@@ -0,0 +1,181 @@
+# app/services/sim_types.py
+# Compact race state: slotted records and struct-of-arrays tables with compounds as small int codes.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .sim_vectorized import strategy_stints
+
+
+@dataclass(frozen=True, slots=True)
+class TireCompound:
+    code: int
+    name: str
+    base_lap_time: float
+    degradation_rate: float
+    wear_limit: int
+
+    def to_dict(self):
+        """The specification in the tire_types dict format, without the name it is keyed by."""
+        return {
+            'base_lap_time': self.base_lap_time,
+            'degradation_rate': self.degradation_rate,
+            'wear_limit': self.wear_limit,
+        }
+
+
+def tire_compounds(tire_types):
+    """
+    Converts the tire_types dict into TireCompound records, coded in dict order.
+
+    Returns:
+        tuple: TireCompound per compound, indexed by code.
+    """
+    return tuple(
+        TireCompound(code, name, spec['base_lap_time'], spec['degradation_rate'], spec.get('wear_limit'))
+        for code, (name, spec) in enumerate(tire_types.items())
+    )
+
+
+def tire_codes(tire_types):
+    """Small integer code for every compound, in the order of tire_types."""
+    return {name: code for code, name in enumerate(tire_types)}
+
+
+@dataclass(frozen=True, slots=True)
+class Strategy:
+    name: str
+    start_tire: int
+    pit_laps: tuple
+    next_tires: tuple
+
+    @classmethod
+    def from_dict(cls, strategy, codes):
+        """
+        Parameters:
+            strategy (dict): Strategy with 'name', 'start_tire', 'pit_laps' and 'next_tires'.
+            codes (dict): Compound name -> int code (see tire_codes).
+        """
+        return cls(strategy['name'], codes[strategy['start_tire']], tuple(strategy['pit_laps']),
+                   tuple(codes[tire] for tire in strategy['next_tires']))
+
+    def to_dict(self, tire_names):
+        """
+        The strategy in the STRATEGIES dict format that templates and callers use.
+
+        Parameters:
+            tire_names (list): Compound names indexed by code.
+        """
+        return {
+            'name': self.name,
+            'start_tire': tire_names[self.start_tire],
+            'pit_laps': list(self.pit_laps),
+            'next_tires': [tire_names[code] for code in self.next_tires],
+        }
+
+    @property
+    def plan(self):
+        """Everything that decides how the strategy races, without its name."""
+        return self.start_tire, self.pit_laps, self.next_tires
+
+    def stints(self, laps):
+        """
+        ((compound code, stint_laps), ...) and the stops taken, as sim_vectorized.strategy_stints.
+        """
+        return strategy_stints({'start_tire': self.start_tire, 'pit_laps': self.pit_laps,
+                                'next_tires': self.next_tires}, laps)
+
+
+def encode_strategies(strategies, tire_types):
+    """
+    Encodes one strategy per car as an index into the distinct strategies in use.
+
+    A field of thousands of cars usually shares a handful of plans, so per-strategy work
+    can be done once per distinct plan and spread to the cars by indexing.
+
+    Returns:
+        tuple: (numpy int array of plan indices per car, tuple of distinct Strategy records)
+    """
+    codes = tire_codes(tire_types)
+    by_identity = {}
+    by_plan = {}
+    distinct = []
+    index = np.empty(len(strategies), dtype=np.int32)
+    for car, strategy in enumerate(strategies):
+        position = by_identity.get(id(strategy))
+        if position is None:
+            compact = Strategy.from_dict(strategy, codes)
+            position = by_plan.setdefault(compact.plan, len(distinct))
+            if position == len(distinct):
+                distinct.append(compact)
+            by_identity[id(strategy)] = position
+        index[car] = position
+    return index, tuple(distinct)
+
+
+@dataclass(slots=True)
+class CarResult:
+    car_id: int
+    driver_name: str
+    pit_stops: int
+    fastest_lap: float
+    time: float
+
+    def to_dict(self):
+        """The per-car dict display_timing_board expects."""
+        return {
+            'car_id': self.car_id,
+            'driver_name': self.driver_name,
+            'pit_stops': self.pit_stops,
+            'fastest_lap': self.fastest_lap,
+            'time': self.time,
+        }
+
+
+class CarTable:
+    """
+    Struct-of-arrays results for a whole field: one NumPy column per field instead of a
+    dict per car. Driver names stay in a plain list, looked up only when rendering.
+    """
+
+    __slots__ = ('car_id', 'pit_stops', 'fastest_lap', 'total_time')
+
+    def __init__(self, car_id, pit_stops, fastest_lap, total_time):
+        self.car_id = np.asarray(car_id, dtype=np.int32)
+        self.pit_stops = np.asarray(pit_stops, dtype=np.int16)
+        self.fastest_lap = np.asarray(fastest_lap, dtype=np.float64)
+        self.total_time = np.asarray(total_time, dtype=np.float64)
+
+    @classmethod
+    def from_grid(cls, car_ids, result):
+        """
+        Parameters:
+            car_ids (list): Driver number of each car, in grid order.
+            result (dict): Output of sim_grid.simulate_grid.
+        """
+        return cls(car_ids, result['pit_stops'], result['fastest_lap'], result['total_time'])
+
+    def __len__(self):
+        return len(self.car_id)
+
+    def timing_board(self, driver_names):
+        """
+        Timing board entries sorted by total race time, in the format display_timing_board returns.
+        """
+        order = np.argsort(self.total_time, kind='stable')
+        car_id = self.car_id.tolist()
+        pit_stops = self.pit_stops.tolist()
+        fastest_lap = self.fastest_lap.tolist()
+        total_time = self.total_time.tolist()
+        return [
+            {
+                "position": position,
+                "car_id": car_id[car],
+                "driver_name": driver_names[car],
+                "pit_stops": pit_stops[car],
+                "fastest_lap": fastest_lap[car],
+                "total_time": total_time[car]
+            }
+            for position, car in enumerate(order.tolist(), start=1)
+        ]
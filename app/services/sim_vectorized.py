@@ -0,0 +1,125 @@
+# app/services/sim_vectorized.py
+# NumPy implementation of simulate_race: closed-form stint costs plus one array of lap noise.
+
+from functools import lru_cache
+
+import numpy as np
+
+
+# Per-lap driver variability, as in simulate_race
+LAP_NOISE = 0.5
+
+# Used when the caller does not pass a generator
+_default_rng = np.random.default_rng()
+
+
+def strategy_stints(strategy, laps):
+    """
+    Splits a race into stints exactly the way simulate_race walks through pit laps.
+
+    A pit lap is only honoured if it comes after the previous one and within the race;
+    once one is skipped, simulate_race never reaches the ones after it either.
+
+    Parameters:
+        strategy (dict): Strategy with 'start_tire', 'pit_laps' and 'next_tires'.
+        laps (int): Total number of laps in the race.
+
+    Returns:
+        tuple: ((tire, stint_laps), ...) in race order, and the number of pit stops taken.
+    """
+    tire = strategy['start_tire']
+    next_tires = list(strategy['next_tires'])
+    stints = []
+    stint_start = 1
+    stops = 0
+    for pit_lap in strategy['pit_laps']:
+        if pit_lap < stint_start + (1 if stops else 0) or pit_lap > laps:
+            break
+        stints.append((tire, pit_lap - stint_start))
+        if next_tires:
+            tire = next_tires.pop(0)
+        stint_start = pit_lap
+        stops += 1
+    stints.append((tire, laps - stint_start + 1))
+    return tuple(stints), stops
+
+
+def stint_cost(base_lap_time, degradation_rate, stint_laps):
+    """
+    Noise-free time of a stint: the arithmetic series base + wear * rate for wear 0..n-1.
+    """
+    return stint_laps * base_lap_time + degradation_rate * stint_laps * (stint_laps - 1) / 2
+
+
+@lru_cache(maxsize=1024)
+def _lap_profile(stints, tire_key):
+    tire_types = dict(tire_key)
+    lengths = np.array([n for _, n in stints], dtype=np.int64)
+    base = np.repeat([tire_types[t][0] for t, _ in stints], lengths)
+    rate = np.repeat([tire_types[t][1] for t, _ in stints], lengths)
+    wear = np.concatenate([np.arange(n) for n in lengths]) if len(lengths) else np.zeros(0)
+    profile = base + wear * rate
+    profile.setflags(write=False)
+    total = sum(stint_cost(tire_types[t][0], tire_types[t][1], n) for t, n in stints)
+    return profile, total
+
+
+def lap_profile(strategy, laps, tire_types):
+    """
+    Noise-free lap times for a strategy and their closed-form total.
+
+    Returns:
+        tuple: (numpy array of lap times without pit stops, float total of those lap times, pit stops taken)
+    """
+    stints, stops = strategy_stints(strategy, laps)
+    tire_key = tuple(sorted(
+        (name, (spec['base_lap_time'], spec['degradation_rate'])) for name, spec in tire_types.items()
+    ))
+    profile, total = _lap_profile(stints, tire_key)
+    return profile, total, stops
+
+
+def simulate_race_vectorized(driver_name, strategy, laps, tire_types, pit_stop_time=22, rng=None):
+    """
+    Simulates a race for a single driver; same inputs and output distribution as simulate_race.
+
+    Parameters:
+        driver_name (str): Name of the driver.
+        strategy (dict): Strategy details including tire choices and pit stop laps.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        rng (numpy.random.Generator): Source of lap noise; a shared module generator if not given.
+
+    Returns:
+        tuple: (total_time, fastest_lap)
+    """
+    rng = rng if rng is not None else _default_rng
+    profile, deterministic_total, stops = lap_profile(strategy, laps, tire_types)
+    noise = rng.uniform(-LAP_NOISE, LAP_NOISE, laps)
+    total_time = deterministic_total + stops * pit_stop_time + noise.sum()
+    fastest_lap = (profile + noise).min() if laps else float('inf')
+    return float(total_time), float(fastest_lap)
+
+
+def simulate_race_batch(strategy, laps, tire_types, replicas, pit_stop_time=22, rng=None):
+    """
+    Simulates many independent runs of one strategy at once.
+
+    Parameters:
+        strategy (dict): Strategy details including tire choices and pit stop laps.
+        laps (int): Total number of laps in the race.
+        tire_types (dict): Dictionary containing tire specifications.
+        replicas (int): Number of independent runs.
+        pit_stop_time (int): Time penalty for each pit stop in seconds.
+        rng (numpy.random.Generator): Source of lap noise; a shared module generator if not given.
+
+    Returns:
+        tuple: (array of total times, array of fastest laps), one entry per replica.
+    """
+    rng = rng if rng is not None else _default_rng
+    profile, deterministic_total, stops = lap_profile(strategy, laps, tire_types)
+    noise = rng.uniform(-LAP_NOISE, LAP_NOISE, (replicas, laps))
+    total_times = deterministic_total + stops * pit_stop_time + noise.sum(axis=1)
+    fastest_laps = (profile + noise).min(axis=1) if laps else np.full(replicas, np.inf)
+    return total_times, fastest_laps
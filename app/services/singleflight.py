@@ -0,0 +1,80 @@
+# app/services/singleflight.py
+# Coalesces concurrent identical calls so only one of them does the work.
+
+import threading
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Threads asking for a key that is
+    already in flight wait for it and receive the same result (or exception),
+    so callers must treat shared results as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {'calls': 0, 'executions': 0, 'waits': 0}
+
+    def do(self, key, fn):
+        """
+        Returns fn(), sharing one execution among all concurrent callers with the same key.
+
+        Parameters:
+            key (hashable): Identifies identical calls, e.g. a request URL.
+            fn (callable): Does the actual work; called with no arguments.
+
+        Returns:
+            The value returned by the single execution of fn.
+        """
+        with self._lock:
+            self._counters['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._counters['waits'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters: total calls, calls that ran fn, calls
+        that waited on another caller, and how many keys are in flight right now.
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
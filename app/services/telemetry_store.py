@@ -0,0 +1,171 @@
+# app/services/telemetry_store.py
+# Whole-session telemetry snapshots with time-indexed "latest record" lookups.
+
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+# Field holding each record's timestamp, per endpoint
+TIME_FIELDS = {
+    'car_data': 'date',
+    'intervals': 'date',
+    'position': 'date',
+    'laps': 'date_start',
+}
+
+DEFAULT_MAX_SNAPSHOTS = 64
+DEFAULT_LIVE_TTL = 60  # seconds a snapshot of a live or unsettled session is reused
+
+
+def to_timestamp(value):
+    """
+    Converts an ISO date-time string to epoch seconds, treating naive values as UTC.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class SessionSnapshot:
+    """
+    Every record of one endpoint for one driver in one session, stored column by
+    column and sorted by timestamp.
+    """
+
+    def __init__(self, records, time_field):
+        timed = []
+        for record in records:
+            value = record.get(time_field)
+            if not value:
+                continue
+            try:
+                timed.append((to_timestamp(value), record))
+            except ValueError:
+                continue
+        timed.sort(key=lambda item: item[0])
+
+        fields = []
+        for _, record in timed:
+            for field in record:
+                if field not in fields:
+                    fields.append(field)
+
+        self.times = array('d', (t for t, _ in timed))
+        self.columns = {field: [record.get(field) for _, record in timed] for field in fields}
+
+    def __len__(self):
+        return len(self.times)
+
+    def row(self, index):
+        return {field: column[index] for field, column in self.columns.items()}
+
+    def latest_at(self, when, max_age=None):
+        """
+        Returns the last record at or before when, found by binary search.
+
+        Parameters:
+            when (str): Date-time in ISO format.
+            max_age (float): Ignore records older than this many seconds before when.
+
+        Returns:
+            dict: The record, or {} if there is none.
+        """
+        target = to_timestamp(when)
+        index = bisect_right(self.times, target) - 1
+        if index < 0:
+            return {}
+        if max_age is not None and target - self.times[index] > max_age:
+            return {}
+        return self.row(index)
+
+
+class TelemetryStore:
+    """
+    In-memory LRU of session snapshots. Each (endpoint, session, driver) is downloaded
+    once and then answered locally; snapshots of sessions that haven't settled yet are
+    downloaded again after live_ttl seconds so live lookups keep seeing new records.
+
+    Parameters:
+        fetch (callable): Takes an endpoint path and returns the decoded JSON list.
+        is_final (callable): Takes an endpoint path and returns True once its data can no
+            longer change; None treats every snapshot as live.
+        max_snapshots (int): Snapshots kept before the least recently used is dropped.
+        live_ttl (float): Seconds a snapshot that isn't final stays valid.
+    """
+
+    def __init__(self, fetch, is_final=None, max_snapshots=DEFAULT_MAX_SNAPSHOTS, live_ttl=DEFAULT_LIVE_TTL):
+        self.fetch = fetch
+        self.is_final = is_final
+        self.max_snapshots = max_snapshots
+        self.live_ttl = live_ttl
+        self._snapshots = OrderedDict()  # key -> (snapshot, expires_at or None)
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def _cached(self, key):
+        # Call with self._lock held
+        entry = self._snapshots.get(key)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._snapshots[key]
+            return None
+        self._snapshots.move_to_end(key)
+        return snapshot
+
+    def snapshot(self, endpoint, session_key, driver_number):
+        key = (endpoint, str(session_key), int(driver_number))
+        with self._lock:
+            snapshot = self._cached(key)
+            if snapshot is not None:
+                return snapshot
+            # Only one thread downloads a given snapshot; the others wait for it
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            try:
+                with self._lock:
+                    snapshot = self._cached(key)
+                    if snapshot is not None:
+                        return snapshot
+                path = f'/{endpoint}?session_key={session_key}&driver_number={driver_number}'
+                data = self.fetch(path)
+                snapshot = SessionSnapshot(data if isinstance(data, list) else [], TIME_FIELDS[endpoint])
+                final = self.is_final is not None and self.is_final(path)
+                expires_at = None if final else time.monotonic() + self.live_ttl
+                with self._lock:
+                    self._snapshots[key] = (snapshot, expires_at)
+                    self._snapshots.move_to_end(key)
+                    while len(self._snapshots) > self.max_snapshots:
+                        self._snapshots.popitem(last=False)
+            finally:
+                with self._lock:
+                    if self._loading.get(key) is load_lock:
+                        del self._loading[key]
+        return snapshot
+
+    def latest(self, endpoint, session_key, driver_number, when, max_age=None):
+        """
+        Returns the latest record for a driver at a point in the session.
+
+        Parameters:
+            endpoint (str): One of TIME_FIELDS.
+            session_key (int): Session the record belongs to.
+            driver_number (int): Driver the record belongs to.
+            when (str): Date-time in ISO format.
+            max_age (float): Ignore records older than this many seconds before when.
+
+        Returns:
+            dict: The record, or {} if there is none.
+        """
+        return self.snapshot(endpoint, session_key, driver_number).latest_at(when, max_age)
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
@@ -0,0 +1,48 @@
+# benchmarks/bench_simulate_race.py
+# Compares the per-lap simulate_race loop with the vectorized NumPy engine.
+#
+# Run from the project root:
+#     python -m benchmarks.bench_simulate_race
+
+import statistics
+import timeit
+
+import numpy as np
+
+from app.services.sim import simulate_race, TIRE_TYPES, STRATEGIES
+from app.services.sim_vectorized import simulate_race_vectorized, simulate_race_batch
+
+
+LAPS = 78  # Monaco, the longest race on the calendar
+CALLS = 2000
+REPLICAS = 10000
+
+
+def per_call_microseconds(fn):
+    return min(timeit.repeat(fn, number=CALLS, repeat=5)) / CALLS * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'Strategy':<20}{'loop (us)':>12}{'vectorized (us)':>18}{'speedup':>10}{'batch (us/run)':>17}{'speedup':>10}")
+    for strategy in STRATEGIES:
+        loop = per_call_microseconds(lambda: simulate_race('', strategy, LAPS, TIRE_TYPES))
+        vectorized = per_call_microseconds(lambda: simulate_race_vectorized('', strategy, LAPS, TIRE_TYPES, rng=rng))
+        batch_seconds = min(timeit.repeat(lambda: simulate_race_batch(strategy, LAPS, TIRE_TYPES, REPLICAS, rng=rng),
+                                          number=1, repeat=5))
+        batch = batch_seconds / REPLICAS * 1e6
+        print(f"{strategy['name']:<20}{loop:>12.1f}{vectorized:>18.1f}{loop / vectorized:>9.1f}x"
+              f"{batch:>17.2f}{loop / batch:>9.1f}x")
+
+    # Both engines should produce the same distribution of total times
+    strategy = STRATEGIES[0]
+    loop_rng = np.random.default_rng(1)
+    loop_totals = [simulate_race('', strategy, LAPS, TIRE_TYPES, rng=loop_rng)[0] for _ in range(REPLICAS)]
+    batch_totals, _ = simulate_race_batch(strategy, LAPS, TIRE_TYPES, REPLICAS, rng=rng)
+    print(f"\nTotal time for {strategy['name']} over {REPLICAS} runs:")
+    print(f"  loop:       mean {statistics.fmean(loop_totals):.3f}s  stdev {statistics.stdev(loop_totals):.3f}s")
+    print(f"  vectorized: mean {batch_totals.mean():.3f}s  stdev {batch_totals.std(ddof=1):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from app import create_app, db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.db'}",
+        'WTF_CSRF_ENABLED': False,
+        'OPENF1_CACHE_PATH': str(tmp_path / 'openf1_cache.sqlite3'),
+        'RACEFINDER_CACHE_ENABLED': False,
+        'SIM_CACHE_ENABLED': False,
+        'SIM_RESULTS_ASYNC': False,
+        'JOBS_DB_PATH': str(tmp_path / 'jobs.sqlite3'),
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    from app.models import Role, User
+    db.session.add(Role(id=1, name='user', permissions='play'))
+    accounts = []
+    for name in ('alice', 'bob'):
+        user = User(username=name, email=f'{name}@example.com', role_id=1)
+        user.password_hash = 'unused'
+        db.session.add(user)
+        accounts.append(user)
+    db.session.commit()
+    return [user.id for user in accounts]
+
+
+@pytest.fixture
+def make_record():
+    """Builds saved-simulation records as simulation_record does, with a fixed timestamp."""
+    from app.services.sim_results import simulation_record
+
+    def build(user_id, session_key, accuracy, timestamp):
+        race = {
+            'session_key': session_key,
+            'location': f'Circuit {session_key}',
+            'date_start': '2024-09-01T13:00:00+00:00',
+            'date_end': '2024-09-01T15:00:00+00:00',
+            'circuit_details': {'circuit_key': session_key, 'circuit_name': f'Circuit {session_key}'},
+        }
+        record = simulation_record(user_id, race, 1, 'Max Verstappen', 5000.0, 'Balanced', accuracy, '2024-09-01')
+        record['timestamp'] = timestamp
+        return record
+    return build
+
+
+class FakeOpenF1:
+    """Stand-in for OpenF1Client that answers from routes: path prefix -> JSON data or an exception."""
+
+    def __init__(self):
+        self.routes = {}
+        self.calls = []
+
+    def url(self, path):
+        return 'https://api.test/v1' + path
+
+    def _body(self, path):
+        from app.services.openf1_client import OpenF1HTTPError
+        self.calls.append(path)
+        for prefix, data in self.routes.items():
+            if path.startswith(prefix):
+                if isinstance(data, Exception):
+                    raise data
+                return json.dumps(data).encode('utf-8')
+        raise OpenF1HTTPError(404, self.url(path))
+
+    def get(self, path):
+        return self._body(path)
+
+    def stream(self, path, chunk_size=64 * 1024):
+        body = self._body(path)
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def openf1(tmp_path, monkeypatch):
+    """A fake API behind the OpenF1 service layer, with fresh response and race result caches."""
+    from app.services import openf1_cache, openf1_client, race_cache
+    fake = FakeOpenF1()
+    monkeypatch.setattr(openf1_client, '_client', fake)
+    monkeypatch.setattr(openf1_cache, '_cache', openf1_cache.ResponseCache(str(tmp_path / 'openf1.sqlite3')))
+    monkeypatch.setattr(race_cache, '_cache', race_cache.RaceResultCache(str(tmp_path / 'races.sqlite3')))
+    return fake
@@ -0,0 +1,56 @@
+import copy
+import json
+
+import pytest
+
+from app.services.catalog import CATALOG, CATALOG_PATH, Catalog, CatalogError, load_catalog
+
+
+with open(CATALOG_PATH, encoding='utf-8') as f:
+    DATA = json.load(f)
+
+
+def _build(change):
+    data = copy.deepcopy(DATA)
+    change(data)
+    return Catalog(data['circuits'], data['tire_compounds'], data['strategies'], data['drivers'])
+
+
+def _longest_race(data):
+    return max(circuit['number_of_laps'] for circuit in data['circuits'])
+
+
+def test_shipped_catalog_loads_and_indexes_its_entries():
+    catalog = load_catalog()
+    circuit = DATA['circuits'][0]
+    assert catalog.circuit(circuit['circuit_key']) == circuit
+    assert catalog.circuit(-1) is None
+    strategy = DATA['strategies'][0]
+    assert catalog.strategy(strategy['name'].upper()) == strategy
+    assert catalog.strategy('no such strategy') is None
+    assert list(catalog.tire_types) == [compound['name'] for compound in DATA['tire_compounds']]
+    assert len(CATALOG.drivers) == len(DATA['drivers'])
+
+
+@pytest.mark.parametrize('change, message', [
+    (lambda d: d['circuits'].append(dict(d['circuits'][0])), 'Duplicate circuit_key'),
+    (lambda d: d['tire_compounds'].append(dict(d['tire_compounds'][0])), 'Duplicate tire compound'),
+    (lambda d: d['strategies'].append(dict(d['strategies'][0], name=d['strategies'][0]['name'].upper())),
+     'Duplicate strategy name'),
+    (lambda d: d['drivers'].append(dict(d['drivers'][0])), 'Duplicate driver_number'),
+    (lambda d: d['circuits'][0].update(number_of_laps=0), 'has no laps'),
+    (lambda d: d['tire_compounds'][0].update(base_lap_time=0), 'invalid specification'),
+    (lambda d: d['tire_compounds'][0].update(degradation_rate=-0.1), 'invalid specification'),
+    (lambda d: d['tire_compounds'][0].update(wear_limit=0), 'invalid specification'),
+    (lambda d: d['strategies'][0].update(start_tire='intermediate'), 'unknown compounds'),
+    (lambda d: d['strategies'][0].update(next_tires=d['strategies'][0]['next_tires'] + ['soft']),
+     'one next tire per pit lap'),
+    (lambda d: d['strategies'][0].update(pit_laps=[1], next_tires=['hard']), 'pits outside laps'),
+    (lambda d: d['strategies'][0].update(pit_laps=[_longest_race(d) + 1], next_tires=['hard']),
+     'pits outside laps'),
+    (lambda d: d['strategies'][0].update(pit_laps=[20, 20], next_tires=['hard', 'medium']),
+     'not increasing'),
+])
+def test_invalid_catalogs_are_rejected(change, message):
+    with pytest.raises(CatalogError, match=message):
+        _build(change)
@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from app import create_app
+from app.services import jobs
+from app.services.jobs import (InProcessJobQueue, SQLiteJobQueue, configure_jobs, job_task,
+                               QUEUED, RUNNING, FINISHED, FAILED)
+
+
+@job_task('test-add')
+def _add(a, b):
+    return a + b
+
+
+@job_task('test-fail')
+def _fail():
+    raise RuntimeError('boom')
+
+
+def _wait(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while queue.get(job_id)['status'] in (QUEUED, RUNNING):
+        assert time.monotonic() < deadline, 'job did not finish'
+        time.sleep(0.01)
+    return queue.get(job_id)
+
+
+@pytest.fixture
+def sqlite_queue(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'jobs.sqlite3'), max_workers=1, result_ttl=60, poll_interval=0.01,
+                           lease_time=30)
+    yield queue
+    queue.shutdown()
+
+
+@pytest.mark.parametrize('backend', ['inprocess', 'sqlite'])
+def test_jobs_run_and_keep_their_owner(backend, tmp_path):
+    if backend == 'sqlite':
+        queue = SQLiteJobQueue(str(tmp_path / 'jobs.sqlite3'), max_workers=2, poll_interval=0.01)
+        queue.start_workers()
+    else:
+        queue = InProcessJobQueue(max_workers=2)
+    try:
+        done = _wait(queue, queue.submit('test-add', {'a': 2, 'b': 3}, owner=7))
+        assert (done['status'], done['result'], done['owner']) == (FINISHED, 5, 7)
+        failed = _wait(queue, queue.submit('test-fail', {}, owner=7))
+        assert (failed['status'], failed['error']) == (FAILED, 'boom')
+        assert queue.get('no-such-job') is None
+        with pytest.raises(ValueError):
+            queue.submit('no-such-kind', {})
+    finally:
+        queue.shutdown()
+
+
+def test_finished_jobs_expire(sqlite_queue):
+    job_id = sqlite_queue.submit('test-add', {'a': 1, 'b': 1})
+    assert sqlite_queue.run_pending() == 1
+    assert sqlite_queue.get(job_id)['result'] == 2
+    sqlite_queue.result_ttl = 0
+    assert sqlite_queue.get(job_id) is None
+
+
+def test_each_job_is_claimed_once(sqlite_queue, tmp_path):
+    other = SQLiteJobQueue(sqlite_queue.path, lease_time=30)
+    job_id = sqlite_queue.submit('test-add', {'a': 1, 'b': 2})
+    assert sqlite_queue._claim()[0] == job_id
+    assert other._claim() is None
+    assert sqlite_queue.get(job_id)['status'] == RUNNING
+
+
+def test_jobs_of_a_dead_process_are_run_again(sqlite_queue):
+    job_id = sqlite_queue.submit('test-add', {'a': 1, 'b': 2})
+    # Claimed by a process that exited before finishing the job
+    sqlite_queue._claim()
+    assert sqlite_queue.run_pending() == 0
+
+    sqlite_queue._connection().execute('UPDATE jobs SET claimed_at = claimed_at - 31')
+    assert sqlite_queue.run_pending() == 1
+    assert sqlite_queue.get(job_id)['result'] == 3
+
+
+def test_running_jobs_keep_their_lease(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / 'jobs.sqlite3'), lease_time=0.3)
+
+    @job_task('test-slow')
+    def _slow():
+        time.sleep(0.6)
+        return 'done'
+
+    queue.start_workers(1)
+    try:
+        job_id = queue.submit('test-slow', {})
+        time.sleep(0.45)
+        # Past the lease time, but the heartbeat keeps the claim from going stale
+        assert queue.requeue_stale() == 0
+        assert _wait(queue, job_id)['result'] == 'done'
+    finally:
+        queue.shutdown()
+
+
+def test_start_workers_only_tops_up(sqlite_queue):
+    sqlite_queue.start_workers(2)
+    sqlite_queue.start_workers(2)
+    assert len(sqlite_queue._workers) == 2
+
+
+def _app(tmp_path, **config):
+    return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'WTF_CSRF_ENABLED': False,
+                       'OPENF1_CACHE_PATH': str(tmp_path / 'openf1_cache.sqlite3'),
+                       'RACEFINDER_CACHE_ENABLED': False, 'JOBS_DB_PATH': str(tmp_path / 'jobs.sqlite3'), **config})
+
+
+def test_sqlite_workers_start_with_the_first_request_only(tmp_path):
+    app = _app(tmp_path, JOBS_BACKEND='sqlite', JOBS_MAX_WORKERS=2)
+    queue = jobs.get_jobs()
+    assert queue._workers == []
+    app.test_client().get('/')
+    assert len(queue._workers) == 2
+    app.test_client().get('/')
+    assert len(queue._workers) == 2
+    queue.shutdown()
+
+
+def test_several_web_processes_share_the_sqlite_queue(tmp_path, monkeypatch):
+    monkeypatch.setenv('WEB_CONCURRENCY', '4')
+    monkeypatch.delenv('JOBS_BACKEND', raising=False)
+    app = _app(tmp_path)
+    assert isinstance(jobs.get_jobs(), SQLiteJobQueue)
+
+    # Jobs kept in one process could not be polled from the others
+    app.config['JOBS_BACKEND'] = 'inprocess'
+    with pytest.raises(RuntimeError):
+        configure_jobs(app)
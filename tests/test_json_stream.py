@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from app.services.json_stream import iter_json_array
+
+
+def _chunks(document, size):
+    data = document.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 4096])
+@pytest.mark.parametrize('document', [
+    '[1.5]',
+    '[12345, 6.7e10, -1]',
+    '[]',
+    ' [ {"a": [1, 2]} , "x,]" ,true,null,false ] \n',
+    '["é日", -0.25E-3, {"nested": {"b": "]"}}]',
+])
+def test_elements_split_across_chunks_are_parsed_whole(document, size):
+    assert list(iter_json_array(_chunks(document, size))) == json.loads(document)
+
+
+@pytest.mark.parametrize('size', [1, 3, 4096])
+def test_results_object_is_unwrapped(size):
+    assert list(iter_json_array(_chunks('{"results": [1, 2]}', size))) == [1, 2]
+
+
+@pytest.mark.parametrize('size', [1, 3, 4096])
+@pytest.mark.parametrize('document', [
+    '[1 2]',
+    '[1,,2]',
+    '[,1]',
+    '[1,]',
+    '[{"a":1}{"b":2}]',
+    '["a" "b"]',
+    '[1.]',
+    '[1.5',
+    '[tru]',
+    '[1x]',
+    '[1] x',
+    '',
+])
+def test_malformed_arrays_are_rejected(document, size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(_chunks(document, size)))
+
+
+def test_elements_are_yielded_before_the_document_ends():
+    def chunks():
+        yield b'[{"a": 1}, '
+        raise AssertionError('read past the first element')
+
+    assert next(iter_json_array(chunks())) == {'a': 1}
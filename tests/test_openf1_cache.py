@@ -0,0 +1,77 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.openf1_cache import ResponseCache, SETTLE_TIME
+
+BASE = 'https://api.openf1.org/v1'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'cache.sqlite3'), live_ttl=60)
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def test_latest_queries_are_never_immutable(cache):
+    assert not cache.is_immutable(f'{BASE}/sessions?session_key=latest')
+    assert not cache.is_immutable(f'{BASE}/position?meeting_key=latest&date>=2020-01-01')
+
+
+def test_dated_queries_are_immutable_once_every_date_has_settled(cache):
+    now = datetime.now(timezone.utc)
+    settled = now - SETTLE_TIME - timedelta(minutes=5)
+    recent = now - SETTLE_TIME + timedelta(minutes=5)
+
+    assert cache.is_immutable(f'{BASE}/sessions?date_start=2023-09-03&date_end=2023-09-03')
+    assert cache.is_immutable(f'{BASE}/position?date>={_iso(settled - timedelta(hours=2))}&date<={_iso(settled)}')
+    assert not cache.is_immutable(f'{BASE}/position?date>={_iso(settled)}&date<={_iso(recent)}')
+    # A bare day only settles once the whole day is over
+    assert not cache.is_immutable(f"{BASE}/sessions?date_start={now:%Y-%m-%d}&date_end={now:%Y-%m-%d}")
+
+
+def test_session_queries_follow_the_recorded_session_end(cache):
+    now = datetime.now(timezone.utc)
+    sessions = [
+        {'session_key': 1, 'date_end': _iso(now - SETTLE_TIME - timedelta(hours=1))},
+        {'session_key': 2, 'date_end': _iso(now - timedelta(hours=1))},
+    ]
+    cache.set(f'{BASE}/sessions?year=2024', json.dumps(sessions).encode('utf-8'))
+
+    assert cache.is_immutable(f'{BASE}/drivers?session_key=1')
+    assert not cache.is_immutable(f'{BASE}/drivers?session_key=2')
+    # Sessions the cache has not seen an end time for are treated as live
+    assert not cache.is_immutable(f'{BASE}/drivers?session_key=3')
+
+
+def test_live_entries_expire_and_immutable_ones_do_not(cache):
+    live = f'{BASE}/sessions?session_key=latest'
+    final = f'{BASE}/sessions?date_start=2023-09-03&date_end=2023-09-03'
+    cache.set(live, b'[]')
+    cache.set(final, b'[]')
+
+    rows = dict(cache._connection().execute('SELECT url, expires_at FROM responses'))
+    assert rows[final] is None
+    assert rows[live] is not None
+
+    cache._connection().execute('UPDATE responses SET expires_at = 0 WHERE url = ?', (live,))
+    assert cache.get(live) is None
+    assert cache.get(final) == b'[]'
+
+
+def test_bodies_are_stored_and_read_back_in_chunks(cache, tmp_path):
+    url = f'{BASE}/position?date>=2023-09-03T11:00:00&date<=2023-09-03T13:00:00'
+    body = json.dumps([{'position': i % 20} for i in range(5000)]).encode('utf-8')
+    spool = tmp_path / 'body'
+    spool.write_bytes(body)
+    with open(spool, 'rb') as file:
+        cache.set_file(url, file, len(body), chunk_size=1000)
+
+    chunks = list(cache.get_chunks(url, 4096))
+    assert b''.join(chunks) == body == cache.get(url)
+    assert max(len(chunk) for chunk in chunks) == 4096
+    assert cache.get_chunks(f'{BASE}/position?date>=2023-09-04', 4096) is None
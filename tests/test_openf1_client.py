@@ -0,0 +1,73 @@
+import json
+import zlib
+
+import pytest
+
+from app.services.openf1_client import OpenF1Client, OpenF1HTTPError, _decode_body
+from app.services.openf1_replay import save_fixture, start_replay_server
+
+
+SESSIONS = [{'session_key': 9000 + i, 'session_name': 'Race', 'location': 'Sakhir'} for i in range(500)]
+
+
+@pytest.fixture
+def server(tmp_path):
+    save_fixture(str(tmp_path), '/sessions?year=2024', json.dumps(SESSIONS).encode('utf-8'))
+    server = start_replay_server(str(tmp_path))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server):
+    client = OpenF1Client(server.base_url, timeout=5, pool_size=2)
+    yield client
+    client.close()
+
+
+def test_get_returns_the_decoded_body(client):
+    assert json.loads(client.get('/sessions?year=2024')) == SESSIONS
+
+
+def test_stream_yields_the_decoded_body_in_bounded_chunks(client):
+    chunks = list(client.stream('/sessions?year=2024', chunk_size=1024))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1024 for chunk in chunks)
+    assert json.loads(b''.join(chunks)) == SESSIONS
+
+
+def test_error_status_raises_http_error(client):
+    with pytest.raises(OpenF1HTTPError) as excinfo:
+        client.get('/sessions?year=1900')
+    assert excinfo.value.status == 404
+    assert excinfo.value.url == client.url('/sessions?year=1900')
+    with pytest.raises(OpenF1HTTPError):
+        list(client.stream('/sessions?year=1900'))
+
+
+def test_connections_are_kept_alive_and_reused(client):
+    client.get('/sessions?year=2024')
+    assert client._idle.qsize() == 1
+    conn = client._idle.queue[0]
+    sock = conn.sock
+    client.get('/sessions?year=2024')
+    list(client.stream('/sessions?year=2024'))
+    assert client._idle.qsize() == 1
+    assert client._idle.queue[0] is conn and conn.sock is sock
+
+
+def test_closed_idle_connection_is_replaced(client, server):
+    client.get('/sessions?year=2024')
+    client._idle.queue[0].sock.close()
+    assert json.loads(client.get('/sessions?year=2024')) == SESSIONS
+
+
+def test_deflate_bodies_are_decoded():
+    assert _decode_body(zlib.compress(b'[1, 2]'), 'deflate') == b'[1, 2]'
+    assert _decode_body(b'[1, 2]', '') == b'[1, 2]'
+
+
+def test_rejects_unsupported_base_url():
+    with pytest.raises(ValueError):
+        OpenF1Client('ftp://api.test/v1')
@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.services.openf1_cache import get_cache
+from app.services.openf1_service import racefinder
+from app.services.prefetch import prefetch
+from app.services.race_cache import get_race_cache
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def _weekend(openf1):
+    # A race that started an hour ago: its data is still inside the settle time
+    now = datetime.now(timezone.utc)
+    session = {'session_key': 9001, 'date_start': _iso(now - timedelta(hours=1)),
+               'date_end': _iso(now + timedelta(hours=1)), 'circuit_key': 39, 'location': 'Monza',
+               'circuit_short_name': 'Monza'}
+    openf1.routes.update({
+        '/sessions?date_start>=': [session],
+        '/sessions?date_start=': [session],
+        '/drivers': [{'driver_number': 1}, {'driver_number': 44}],
+        '/intervals': [{'date': _iso(now - timedelta(minutes=55))}],
+        '/position': [{'driver_number': 1, 'position': 1}, {'driver_number': 44, 'position': 2}],
+        '/stints': [],
+    })
+    return session
+
+
+def test_warmed_entries_outlive_the_live_ttl(openf1):
+    session = _weekend(openf1)
+    assert prefetch(ttl=1200) == {'sessions': 1, 'warmed': 1, 'days': 1}
+
+    # Every warmed response; the discovery query itself keeps the live TTL
+    expiries = [row[0] for row in get_cache()._connection().execute(
+        "SELECT expires_at FROM responses WHERE url NOT LIKE '%date_start>=%'")]
+    assert len(expiries) == 5
+    assert all(expires_at > time.time() + 1100 for expires_at in expiries)
+
+    date = session['date_start'][:10]
+    expires_at = get_race_cache()._connection().execute(
+        'SELECT expires_at FROM race_results WHERE date = ?', (date,)).fetchone()[0]
+    assert expires_at > time.time() + 1100
+
+    # The first search of the day is served without touching the API
+    calls = len(openf1.calls)
+    assert [race['session_key'] for race in racefinder(date)] == [9001]
+    assert len(openf1.calls) == calls
+
+
+def test_each_run_refreshes_what_can_still_change(openf1):
+    _weekend(openf1)
+    prefetch(ttl=1200)
+    warmed = len(openf1.calls) - 1
+    prefetch(ttl=1200)
+    assert len(openf1.calls) == 1 + 2 * warmed
+
+
+def test_failed_days_are_not_kept_for_the_prefetch_ttl(openf1):
+    session = _weekend(openf1)
+    openf1.routes['/drivers'] = RuntimeError('upstream down')
+    assert prefetch(ttl=1200)['days'] == 1
+    expires_at = get_race_cache()._connection().execute(
+        'SELECT expires_at FROM race_results WHERE date = ?', (session['date_start'][:10],)).fetchone()[0]
+    assert expires_at <= time.time() + get_race_cache().ttl
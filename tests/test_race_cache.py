@@ -0,0 +1,82 @@
+import time
+from datetime import datetime, timezone
+
+from app.services import race_cache
+from app.services.openf1_client import OpenF1HTTPError
+from app.services.openf1_service import racefinder
+from app.services.race_cache import RaceResultCache, get_race_cache
+
+
+PAST = '2024-03-02'
+RACES = [{'session_key': 9000}]
+
+
+def _expires_at(cache, date):
+    return cache._connection().execute('SELECT expires_at FROM race_results WHERE date = ?',
+                                       (date,)).fetchone()[0]
+
+
+def test_settled_complete_days_never_expire(tmp_path):
+    cache = RaceResultCache(str(tmp_path / 'races.sqlite3'), ttl=60)
+    cache.set(PAST, RACES)
+    assert _expires_at(cache, PAST) is None
+    assert cache.get(PAST) == RACES
+    assert cache.get('2024-03-09') is None
+
+
+def test_today_and_incomplete_days_use_the_ttl(tmp_path, monkeypatch):
+    now = [time.time()]
+    monkeypatch.setattr(race_cache.time, 'time', lambda: now[0])
+    cache = RaceResultCache(str(tmp_path / 'races.sqlite3'), ttl=60)
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    cache.set(today, RACES)
+    cache.set(PAST, RACES, complete=False)
+    now[0] += 59
+    assert cache.get(today) == RACES and cache.get(PAST) == RACES
+    now[0] += 1
+    assert cache.get(today) is None and cache.get(PAST) is None
+
+
+def test_ttl_override_only_applies_while_the_day_can_change(tmp_path):
+    cache = RaceResultCache(str(tmp_path / 'races.sqlite3'), ttl=60)
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    cache.set(today, RACES, ttl=1200)
+    assert _expires_at(cache, today) > time.time() + 1100
+    cache.set(PAST, RACES, ttl=1200)
+    assert _expires_at(cache, PAST) is None
+
+
+def test_is_final_needs_the_day_and_settle_time_to_pass():
+    assert RaceResultCache.is_final(PAST)
+    assert not RaceResultCache.is_final(datetime.now(timezone.utc).strftime('%Y-%m-%d'))
+    assert not RaceResultCache.is_final('not a date')
+
+
+def _settled_day(openf1):
+    session = {'session_key': 9000, 'date_start': f'{PAST}T15:00:00+00:00', 'date_end': f'{PAST}T17:00:00+00:00',
+               'circuit_key': 3, 'location': 'Sakhir', 'circuit_short_name': 'Sakhir'}
+    openf1.routes.update({
+        '/sessions?date_start=': [session],
+        '/drivers': [{'driver_number': 1}, {'driver_number': 44}],
+        '/intervals': [{'date': f'{PAST}T15:03:00+00:00'}],
+        '/position': [{'driver_number': 44, 'position': 2}, {'driver_number': 1, 'position': 1}],
+    })
+
+
+def test_racefinder_result_is_shared_once_complete(openf1):
+    _settled_day(openf1)
+    races = racefinder(PAST)
+    assert [race['session_key'] for race in races] == [9000]
+    assert [result['position'] for result in races[0]['real_results']] == [1, 2]
+    assert _expires_at(get_race_cache(), PAST) is None
+
+    calls = len(openf1.calls)
+    assert racefinder(PAST) == races
+    assert len(openf1.calls) == calls
+
+
+def test_racefinder_marks_a_day_incomplete_when_a_session_fails(openf1):
+    _settled_day(openf1)
+    openf1.routes['/drivers'] = OpenF1HTTPError(503, openf1.url('/drivers'))
+    assert racefinder(PAST) == []
+    assert _expires_at(get_race_cache(), PAST) is not None
@@ -0,0 +1,51 @@
+from app.models import Race
+from app.services.openf1_cache import get_cache
+from app.services.openf1_service import racefinder
+from app.services.race_calendar import ingest_season, sessions_on
+
+
+SEASON = [
+    {'session_key': 9001, 'circuit_key': 3, 'circuit_short_name': 'Sakhir', 'location': 'Sakhir',
+     'date_start': '2024-03-02T15:00:00+00:00', 'date_end': '2024-03-02T17:00:00+00:00'},
+    {'session_key': 9002, 'circuit_key': 149, 'circuit_short_name': 'Jeddah', 'location': 'Jeddah',
+     'date_start': '2024-03-09T20:00:00+03:00', 'date_end': '2024-03-09T22:00:00+03:00'},
+    {'session_key': 9003, 'circuit_key': 10, 'location': 'Melbourne', 'date_start': None, 'date_end': None},
+]
+
+
+def test_ingest_season_inserts_then_updates(app, openf1):
+    openf1.routes['/sessions?year=2024'] = SEASON
+    with app.app_context():
+        assert ingest_season(2024) == {'inserted': 2, 'updated': 0}
+
+        # A finished season is cached for good, so the re-run has to bypass the response cache
+        get_cache().clear()
+        openf1.routes['/sessions?year=2024'] = [dict(SEASON[0], location='Bahrain')]
+        assert ingest_season(2024) == {'inserted': 0, 'updated': 1}
+        assert Race.query.count() == 2
+        assert Race.query.filter_by(session_key=9001).one().location == 'Bahrain'
+
+
+def test_sessions_on_returns_utc_sessions_for_the_day(app, openf1):
+    openf1.routes['/sessions?year=2024'] = SEASON
+    with app.app_context():
+        ingest_season(2024)
+        assert sessions_on('2024-03-02') == [SEASON[0]]
+        assert sessions_on('2024-03-09') == [{
+            'session_key': 9002, 'circuit_key': 149, 'circuit_short_name': 'Jeddah', 'location': 'Jeddah',
+            'date_start': '2024-03-09T17:00:00+00:00', 'date_end': '2024-03-09T19:00:00+00:00',
+        }]
+        assert sessions_on('2024-03-16') == []
+
+
+def test_racefinder_searches_the_calendar_before_the_api(app, openf1):
+    openf1.routes.update({
+        '/sessions?year=2024': SEASON,
+        '/drivers': [{'driver_number': 1}],
+        '/intervals': [],
+    })
+    with app.app_context():
+        ingest_season(2024)
+        races = racefinder('2024-03-02')
+    assert [race['session_key'] for race in races] == [9001]
+    assert not any(path.startswith('/sessions?date_start=') for path in openf1.calls)
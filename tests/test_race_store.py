@@ -0,0 +1,43 @@
+from app.services import race_store
+from app.services.race_store import RaceSearchStore
+
+
+RACES = [{'session_key': 9000, 'circuit_details': {'circuit_name': 'Sakhir'}},
+         {'session_key': 9001, 'circuit_details': {'circuit_name': 'Jeddah'}}]
+
+
+def test_handle_loads_the_stored_races():
+    store = RaceSearchStore()
+    handle = store.put('2024-03-02', RACES)
+    assert handle == {'date': '2024-03-02', 'session_keys': [9000, 9001]}
+    assert store.load(handle) == RACES
+    assert store.get('2024-03-02', 9001) == RACES[1]
+    assert store.get('2024-03-03', 9001) is None
+
+
+def test_handle_with_an_evicted_race_loads_nothing():
+    store = RaceSearchStore(max_entries=2)
+    handle = store.put('2024-03-02', RACES)
+    store.put('2024-03-09', [{'session_key': 9002}])
+    assert store.get('2024-03-02', 9000) is None
+    assert store.load(handle) is None
+
+
+def test_expired_races_are_not_returned(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(race_store.time, 'time', lambda: now[0])
+    store = RaceSearchStore(ttl=60)
+    handle = store.put('2024-03-02', RACES)
+    now[0] += 59
+    assert store.load(handle) == RACES
+    now[0] += 1
+    assert store.load(handle) is None
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'races.sqlite3')
+    handle = RaceSearchStore(store_path=path).put('2024-03-02', RACES)
+    other = RaceSearchStore(store_path=path)
+    assert other.load(handle) == RACES
+    other.clear()
+    assert RaceSearchStore(store_path=path).load(handle) is None
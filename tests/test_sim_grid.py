@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from app.services.sim import simEngine, STRATEGIES, TIRE_TYPES
+from app.services.sim_grid import simulate_grid, iter_grid_laps
+
+MONZA = {'driver_number': 1, 'circuit_key': 39}
+GRID = [1, 11, 16, 44, 55, 63, 4, 81]
+
+
+def test_loop_engine_matches_vectorized_engine():
+    loop = simEngine(MONZA, 'Balanced', list(GRID), [], vectorized=False, monte_carlo=False, seed=42)['timing_board']
+    vectorized = simEngine(MONZA, 'Balanced', list(GRID), [], vectorized=True, monte_carlo=False,
+                           seed=42)['timing_board']
+    assert [car['car_id'] for car in loop] == [car['car_id'] for car in vectorized]
+    for loop_car, vectorized_car in zip(loop, vectorized):
+        assert loop_car['pit_stops'] == vectorized_car['pit_stops']
+        assert loop_car['total_time'] == pytest.approx(vectorized_car['total_time'])
+        assert loop_car['fastest_lap'] == pytest.approx(vectorized_car['fastest_lap'])
+
+
+def test_lap_by_lap_grid_ends_where_the_whole_race_grid_does():
+    strategies = [STRATEGIES[i % len(STRATEGIES)] for i in range(len(GRID))]
+    whole = simulate_grid(strategies, 53, TIRE_TYPES, rng=[np.random.default_rng(i) for i in range(len(GRID))])
+    laps = list(iter_grid_laps(strategies, 53, TIRE_TYPES, rng=[np.random.default_rng(i) for i in range(len(GRID))]))
+    assert len(laps) == 53
+    np.testing.assert_allclose(laps[-1]['elapsed'], whole['total_time'])
+    np.testing.assert_allclose(laps[-1]['fastest_lap'], whole['fastest_lap'])
+    np.testing.assert_array_equal(laps[-1]['pit_stops'], whole['pit_stops'])
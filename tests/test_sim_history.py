@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.sim_history import encode_cursor, decode_cursor, history_page, iter_history
+from app.services.sim_results import save_results
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 9, 1, 13, 5, 7, 123456)
+    assert decode_cursor(encode_cursor(timestamp, 42)) == (timestamp, 42)
+    assert decode_cursor(encode_cursor(timestamp.replace(microsecond=0), 1)) == (timestamp.replace(microsecond=0), 1)
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', 'bm8tcGlwZQ', ''])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_result_once_in_order(users, make_record):
+    alice, bob = users
+    start = datetime(2024, 9, 1, 12, 0, 0)
+    # Several results share a timestamp, so paging has to break ties on id
+    save_results([make_record(alice, 100 + i % 3, float(i), start + timedelta(seconds=i // 3)) for i in range(23)])
+    save_results([make_record(bob, 100, 50.0, start)])
+
+    seen = []
+    cursor = None
+    while True:
+        page = history_page(alice, cursor, limit=5)
+        seen.extend(page['results'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+        assert len(page['results']) == 5
+
+    assert len(seen) == 23
+    assert len({result['id'] for result in seen}) == 23
+    keys = [(result['timestamp'], result['id']) for result in seen]
+    assert keys == sorted(keys, reverse=True)
+    assert seen == list(iter_history(alice, batch_size=4))
@@ -0,0 +1,54 @@
+from itertools import combinations, product
+
+import pytest
+
+from app.services.sim_optimizer import optimal_strategy
+from app.services.sim_vectorized import stint_cost
+
+TIRES = {
+    'soft': {'base_lap_time': 90.0, 'degradation_rate': 0.9, 'wear_limit': 4},
+    'medium': {'base_lap_time': 91.0, 'degradation_rate': 0.4, 'wear_limit': 7},
+    'hard': {'base_lap_time': 92.0, 'degradation_rate': 0.1},
+}
+
+
+def _brute_force(laps, pit_stop_time, max_stops, respect_wear_limit, require_two_compounds):
+    best = None
+    for stints in range(1, max_stops + 2):
+        for cuts in combinations(range(1, laps), stints - 1):
+            lengths = [b - a for a, b in zip((0,) + cuts, cuts + (laps,))]
+            for tires in product(TIRES, repeat=stints):
+                if require_two_compounds and len(set(tires)) < 2:
+                    continue
+                if respect_wear_limit and any(
+                        n > TIRES[t].get('wear_limit', laps) for t, n in zip(tires, lengths)):
+                    continue
+                total = sum(stint_cost(TIRES[t]['base_lap_time'], TIRES[t]['degradation_rate'], n)
+                            for t, n in zip(tires, lengths)) + (stints - 1) * pit_stop_time
+                if best is None or total < best:
+                    best = total
+    return best
+
+
+@pytest.mark.parametrize('laps', [1, 6, 11])
+@pytest.mark.parametrize('pit_stop_time', [0.5, 3, 22])
+@pytest.mark.parametrize('respect_wear_limit', [True, False])
+@pytest.mark.parametrize('require_two_compounds', [True, False])
+def test_dp_matches_brute_force(laps, pit_stop_time, respect_wear_limit, require_two_compounds):
+    max_stops = 3
+    expected = _brute_force(laps, pit_stop_time, max_stops, respect_wear_limit, require_two_compounds)
+    result = optimal_strategy(laps, TIRES, pit_stop_time, max_stops=max_stops,
+                              respect_wear_limit=respect_wear_limit, require_two_compounds=require_two_compounds)
+
+    if expected is None:
+        assert result is None
+        return
+    assert result['expected_time'] == pytest.approx(expected)
+
+    # The returned plan is a real strategy that costs what it claims
+    stints = result['stints']
+    assert sum(n for _, n in stints) == laps
+    assert len(result['pit_laps']) == len(stints) - 1 <= max_stops
+    assert result['start_tire'] == stints[0][0]
+    plan_time = sum(stint_cost(TIRES[t]['base_lap_time'], TIRES[t]['degradation_rate'], n) for t, n in stints)
+    assert plan_time + len(result['pit_laps']) * pit_stop_time == pytest.approx(result['expected_time'])
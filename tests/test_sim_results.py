@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import RaceStats, UserStats
+from app.services.sim_results import save_results, rebuild_stats
+
+
+def _totals():
+    users = {row.user_id: (row.simulations, row.accuracy_sum, row.best_accuracy, row.last_simulation_at)
+             for row in UserStats.query.all()}
+    races = {row.race_id: (row.simulations, row.accuracy_sum, row.best_accuracy) for row in RaceStats.query.all()}
+    return users, races
+
+
+def test_saved_totals_match_a_rebuild(users, make_record):
+    alice, bob = users
+    start = datetime(2024, 9, 1, 12, 0, 0)
+    # Batches in and out of timestamp order, several users and races per batch
+    assert save_results([make_record(alice, 1, 80.0, start + timedelta(minutes=5)),
+                         make_record(bob, 1, 90.0, start),
+                         make_record(alice, 2, 70.0, start)]) == 3
+    assert save_results([make_record(alice, 1, 95.0, start + timedelta(minutes=1)),
+                         make_record(bob, 2, 60.0, start + timedelta(minutes=9))]) == 2
+    assert save_results([]) == 0
+
+    users_saved, races_saved = _totals()
+    assert users_saved[alice][:3] == (3, pytest.approx(245.0), 95.0)
+    assert users_saved[alice][3] == start + timedelta(minutes=5)
+    assert users_saved[bob] == (2, pytest.approx(150.0), 90.0, start + timedelta(minutes=9))
+    assert sorted(entry[0] for entry in races_saved.values()) == [2, 3]
+
+    assert rebuild_stats() == {'users': 2, 'races': 2}
+    db.session.expire_all()
+    assert _totals() == (users_saved, races_saved)
@@ -0,0 +1,22 @@
+from app.services.sim import simEngine
+
+MONZA = {'driver_number': 1, 'circuit_key': 39}
+GRID = [1, 11, 16, 44, 55, 63, 4, 81]
+
+
+def _run(seed, vectorized=True):
+    return simEngine(MONZA, 'Balanced', list(GRID), [], vectorized=vectorized, monte_carlo=False, seed=seed)
+
+
+def test_same_seed_gives_the_same_race():
+    first = _run(1234)
+    second = _run(1234)
+    assert first['timing_board'] == second['timing_board']
+    assert first['strategy_accuracy'] == second['strategy_accuracy']
+    assert first['seed'] == second['seed'] == 1234
+    assert _run(1235)['timing_board'] != first['timing_board']
+
+
+def test_unseeded_runs_report_a_seed_that_replays_them():
+    first = _run(None, vectorized=False)
+    assert _run(first['seed'], vectorized=False)['timing_board'] == first['timing_board']
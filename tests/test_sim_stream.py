@@ -0,0 +1,28 @@
+import pytest
+
+from app.services.sim import simEngine, simulate_race_laps, validate_race_request, MAX_GRID_SIZE, MAX_SEED
+
+MONZA = {'driver_number': 1, 'circuit_key': 39}
+GRID = [1, 11, 16, 44, 55, 63, 4, 81]
+
+
+def test_lap_stream_replays_the_simulated_race():
+    board = simEngine(MONZA, 'Balanced', list(GRID), [], monte_carlo=False, seed=99)['timing_board']
+    laps = list(simulate_race_laps(MONZA, 'Balanced', list(GRID), seed=99))
+    assert [lap['lap'] for lap in laps] == list(range(1, laps[0]['total_laps'] + 1))
+    final = laps[-1]
+    assert [car['car_id'] for car in final['order']] == [car['car_id'] for car in board]
+    for streamed, simulated in zip(final['order'], board):
+        assert streamed['total_time'] == pytest.approx(simulated['total_time'])
+
+
+@pytest.mark.parametrize('grid, seed', [
+    (list(range(MAX_GRID_SIZE + 1)), None),
+    ([1, 1], None),
+    ([1, 9999], None),
+    ([1], -1),
+    ([1], MAX_SEED),
+])
+def test_oversized_or_invalid_requests_are_rejected(grid, seed):
+    with pytest.raises(ValueError):
+        validate_race_request(grid, seed)
@@ -0,0 +1,31 @@
+from app.services.catalog import CATALOG
+from app.services.sim_optimizer import optimal_strategy
+from app.services.sim_types import Strategy, tire_codes, tire_compounds
+
+
+def test_tire_compounds_are_coded_in_tire_types_order():
+    compounds = tire_compounds(CATALOG.tire_types)
+    assert [compound.code for compound in compounds] == list(range(len(CATALOG.tire_types)))
+    assert {compound.name: compound.code for compound in compounds} == tire_codes(CATALOG.tire_types)
+    assert {compound.name: compound.to_dict() for compound in compounds} == CATALOG.tire_types
+
+
+def test_catalog_compounds_match_tire_types():
+    assert CATALOG.compounds == tire_compounds(CATALOG.tire_types)
+
+
+def test_strategy_round_trips_through_template_dict():
+    codes = tire_codes(CATALOG.tire_types)
+    names = list(CATALOG.tire_types)
+    for template in CATALOG.strategies:
+        assert Strategy.from_dict(template, codes).to_dict(names) == template
+
+
+def test_optimal_strategy_is_a_strategy_template():
+    tire_types = CATALOG.tire_types
+    best = optimal_strategy(50, tire_types, 20.0, max_stops=2)
+    template = {field: best[field] for field in ('name', 'start_tire', 'pit_laps', 'next_tires')}
+    strategy = Strategy.from_dict(template, tire_codes(tire_types))
+    assert strategy.to_dict(list(tire_types)) == template
+    assert [tire for tire, _ in best['stints']] == [best['start_tire']] + best['next_tires']
+    assert sum(stint_laps for _, stint_laps in best['stints']) == 50
@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from app.services.sim import simulate_race, STRATEGIES, TIRE_TYPES
+from app.services.sim_vectorized import simulate_race_vectorized
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES, ids=lambda strategy: strategy['name'])
+def test_single_car_engines_agree(strategy):
+    loop = simulate_race('', strategy, 53, TIRE_TYPES, rng=np.random.default_rng(7))
+    vectorized = simulate_race_vectorized('', strategy, 53, TIRE_TYPES, rng=np.random.default_rng(7))
+    assert loop == pytest.approx(vectorized)
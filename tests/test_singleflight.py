@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, count):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        release.wait(5)
+        return {'answer': 42}
+
+    threads, results, errors = _run_concurrently(flight, 'key', fn, 5)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1
+    assert not errors
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    stats = flight.stats()
+    assert stats == {'calls': 5, 'executions': 1, 'waits': 4, 'in_flight': 0}
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    failure = ValueError('bad response')
+
+    def fn():
+        release.wait(5)
+        raise failure
+
+    threads, results, errors = _run_concurrently(flight, 'key', fn, 3)
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not results
+    assert errors == [failure] * 3
+
+
+def test_sequential_calls_and_different_keys_each_execute():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('a', lambda: 2) == 2
+    assert flight.do('b', lambda: 3) == 3
+    with pytest.raises(KeyError):
+        flight.do('a', lambda: {}['missing'])
+    assert flight.do('a', lambda: 4) == 4
+    assert flight.stats()['executions'] == 5
+    flight.reset_stats()
+    assert flight.stats() == {'calls': 0, 'executions': 0, 'waits': 0, 'in_flight': 0}
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from app.services import telemetry_store
+from app.services.telemetry_store import SessionSnapshot, TelemetryStore
+
+
+RECORDS = [
+    {'date': '2024-03-02T15:00:10', 'speed': 300},
+    {'date': '2024-03-02T15:00:00', 'speed': 280},
+    {'date': '2024-03-02T15:00:20', 'speed': 310, 'drs': 12},
+    {'date': None, 'speed': 0},
+    {'date': 'not a date', 'speed': 0},
+]
+
+
+class FakeFetch:
+    def __init__(self, data=RECORDS):
+        self.data = data
+        self.calls = []
+
+    def __call__(self, path):
+        self.calls.append(path)
+        if isinstance(self.data, Exception):
+            raise self.data
+        return self.data
+
+
+def test_snapshot_sorts_records_and_skips_undated_ones():
+    snapshot = SessionSnapshot(RECORDS, 'date')
+    assert len(snapshot) == 3
+    assert snapshot.columns['speed'] == [280, 300, 310]
+    assert snapshot.columns['drs'] == [None, None, 12]
+
+
+def test_latest_at_finds_the_last_record_at_or_before_when():
+    snapshot = SessionSnapshot(RECORDS, 'date')
+    assert snapshot.latest_at('2024-03-02T14:59:59') == {}
+    assert snapshot.latest_at('2024-03-02T15:00:00')['speed'] == 280
+    assert snapshot.latest_at('2024-03-02T15:00:15')['speed'] == 300
+    assert snapshot.latest_at('2024-03-02T16:00:00+00:00')['speed'] == 310
+    assert snapshot.latest_at('2024-03-02T15:00:29', max_age=5) == {}
+
+
+def test_final_snapshots_are_downloaded_once():
+    fetch = FakeFetch()
+    store = TelemetryStore(fetch, is_final=lambda path: True, live_ttl=0)
+    for _ in range(3):
+        assert store.latest('car_data', 9000, 1, '2024-03-02T15:00:15')['speed'] == 300
+    assert fetch.calls == ['/car_data?session_key=9000&driver_number=1']
+
+
+def test_live_snapshots_are_downloaded_again_after_live_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(telemetry_store.time, 'monotonic', lambda: now[0])
+    fetch = FakeFetch()
+    store = TelemetryStore(fetch, live_ttl=60)
+    store.snapshot('car_data', 9000, 1)
+    now[0] += 59
+    store.snapshot('car_data', 9000, 1)
+    assert len(fetch.calls) == 1
+    now[0] += 1
+    store.snapshot('car_data', 9000, 1)
+    assert len(fetch.calls) == 2
+
+
+def test_least_recently_used_snapshot_is_evicted():
+    fetch = FakeFetch()
+    store = TelemetryStore(fetch, is_final=lambda path: True, max_snapshots=2)
+    store.snapshot('car_data', 9000, 1)
+    store.snapshot('car_data', 9000, 2)
+    store.snapshot('car_data', 9000, 1)
+    store.snapshot('car_data', 9000, 3)
+    store.snapshot('car_data', 9000, 1)
+    assert len(fetch.calls) == 3
+    store.snapshot('car_data', 9000, 2)
+    assert len(fetch.calls) == 4
+
+
+def test_failed_download_releases_the_load_lock():
+    fetch = FakeFetch(ConnectionError('down'))
+    store = TelemetryStore(fetch)
+    with pytest.raises(ConnectionError):
+        store.snapshot('laps', 9000, 1)
+    assert store._loading == {}
+    fetch.data = [{'date_start': '2024-03-02T15:00:00', 'lap_number': 1}]
+    assert store.latest('laps', 9000, 1, '2024-03-02T15:01:00')['lap_number'] == 1
+
+
+def test_concurrent_lookups_share_one_download():
+    release = threading.Event()
+
+    def fetch(path):
+        fetch.calls += 1
+        release.wait(5)
+        return RECORDS
+    fetch.calls = 0
+
+    store = TelemetryStore(fetch)
+    threads = [threading.Thread(target=store.snapshot, args=('position', 9000, 1)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert fetch.calls == 1